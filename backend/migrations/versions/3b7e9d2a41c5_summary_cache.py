@@ -0,0 +1,39 @@
+"""summary cache
+
+Revision ID: 3b7e9d2a41c5
+Revises: create_chat_tables
+Create Date: 2026-10-18 10:12:41.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e9d2a41c5'
+down_revision: Union[str, None] = 'create_chat_tables'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('file_mappings', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_file_mappings_content_hash'), 'file_mappings', ['content_hash'], unique=False)
+    op.create_table(
+        'summary_cache',
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('summary_cache')
+    op.drop_index(op.f('ix_file_mappings_content_hash'), table_name='file_mappings')
+    op.drop_column('file_mappings', 'content_hash')
@@ -0,0 +1,37 @@
+"""auth tokens expires at
+
+Revision ID: 5f8b3e1d7a64
+Revises: c4d2a9e7f150
+Create Date: 2026-10-18 13:58:06.114902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f8b3e1d7a64'
+down_revision: Union[str, None] = 'c4d2a9e7f150'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('auth_tokens', sa.Column('expires_at', sa.DateTime(), nullable=True))
+    # Expiry of existing tokens is only known inside the JWT; give them a day,
+    # which is longer than any configured session lifetime. The column holds
+    # naive UTC, like datetime.utcnow() in the application.
+    op.execute(
+        "UPDATE auth_tokens SET expires_at = timezone('utc', now()) + interval '1 day'"
+    )
+    op.alter_column('auth_tokens', 'expires_at', nullable=False)
+    op.create_index(op.f('ix_auth_tokens_expires_at'), 'auth_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_auth_tokens_expires_at'), table_name='auth_tokens')
+    op.drop_column('auth_tokens', 'expires_at')
@@ -0,0 +1,30 @@
+"""chat history indexes
+
+Revision ID: 9a6e2c4f1b38
+Revises: 5f8b3e1d7a64
+Create Date: 2026-10-18 14:31:52.640118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a6e2c4f1b38'
+down_revision: Union[str, None] = '5f8b3e1d7a64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_messages_chat_id_created_at_id', 'messages', ['chat_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_chats_file_id_created_at_id', 'chats', ['file_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chats_file_id_created_at_id', table_name='chats')
+    op.drop_index('ix_messages_chat_id_created_at_id', table_name='messages')
@@ -0,0 +1,30 @@
+"""auth tokens token unique
+
+Revision ID: c4d2a9e7f150
+Revises: 8e1f4c6b9a27
+Create Date: 2026-10-18 13:24:41.207315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d2a9e7f150'
+down_revision: Union[str, None] = '8e1f4c6b9a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index(op.f('ix_auth_tokens_token'), table_name='auth_tokens')
+    op.create_index(op.f('ix_auth_tokens_token'), 'auth_tokens', ['token'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_auth_tokens_token'), table_name='auth_tokens')
+    op.create_index(op.f('ix_auth_tokens_token'), 'auth_tokens', ['token'], unique=False)
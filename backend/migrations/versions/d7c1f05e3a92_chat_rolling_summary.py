@@ -0,0 +1,30 @@
+"""chat rolling summary
+
+Revision ID: d7c1f05e3a92
+Revises: 9a6e2c4f1b38
+Create Date: 2026-10-18 15:07:19.884306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7c1f05e3a92'
+down_revision: Union[str, None] = '9a6e2c4f1b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('chats', sa.Column('summary', sa.Text(), nullable=True))
+    op.add_column('chats', sa.Column('summary_until_id', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('chats', 'summary_until_id')
+    op.drop_column('chats', 'summary')
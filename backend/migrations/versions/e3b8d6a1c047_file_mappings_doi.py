@@ -0,0 +1,30 @@
+"""file mappings doi
+
+Revision ID: e3b8d6a1c047
+Revises: d7c1f05e3a92
+Create Date: 2026-10-18 16:12:44.305871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b8d6a1c047'
+down_revision: Union[str, None] = 'd7c1f05e3a92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('file_mappings', sa.Column('doi', sa.String(), nullable=True))
+    op.create_index('ix_file_mappings_user_id_doi', 'file_mappings', ['user_id', 'doi'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_file_mappings_user_id_doi', table_name='file_mappings')
+    op.drop_column('file_mappings', 'doi')
@@ -0,0 +1,54 @@
+"""
+Compares the landing-page extractors on the saved sample pages.
+
+    python -m scripts.bench_landing_page [--number N]
+
+Run from the backend directory.
+"""
+
+from pathlib import Path
+import argparse
+import timeit
+
+from src.gears import landing_pages
+
+
+SAMPLES = Path(__file__).parent / "samples" / "landing_pages"
+EXTRACTORS = {
+    "soup": landing_pages.soup,
+    "targeted": landing_pages.targeted,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    print(
+        "{:<16} {:>8} {:>12} {:>12} {:>8}  {}".format(
+            "sample", "bytes", "soup ms", "targeted ms", "speedup", "found"
+        )
+    )
+    for path in sorted(SAMPLES.glob("*.html")):
+        html = path.read_text(encoding="utf-8")
+        timings = {
+            name: timeit.timeit(lambda: extractor(html), number=args.number)
+            / args.number
+            * 1000
+            for name, extractor in EXTRACTORS.items()
+        }
+        print(
+            "{:<16} {:>8} {:>12.3f} {:>12.3f} {:>7.1f}x  {}".format(
+                path.name,
+                len(html),
+                timings["soup"],
+                timings["targeted"],
+                timings["soup"] / timings["targeted"],
+                landing_pages.targeted(html),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,130 @@
-from typing import Tuple
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Tuple
+import asyncio
 
 import aiohttp
+from aiohttp_retry import JitterRetry, RetryClient
 from fastapi import HTTPException
 
+from src.config.config import SciHubSettings
+from src.gears import streams
+
+
+PAGE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+}
+
+# Mirrors serve PDFs with either type.
+PDF_CONTENT_TYPES = {"application/pdf", "application/octet-stream"}
+
+
+class ErrNotPDF(Exception):
+    pass
+
 
 class SciHubApi:
-    __url = "https://sci-hub.ru"
+    """
+    Sci-Hub client sharing one pooled, keep-alive session across requests.
+    Connection errors, timeouts and 429/5xx responses are retried with
+    jittered exponential backoff. `start` and `close` follow the app lifespan.
+    """
+
+    def __init__(self, config: SciHubSettings):
+        self.__config = config
+        self.__client: RetryClient | None = None
+
+    async def start(self) -> None:
+        connector = aiohttp.TCPConnector(
+            limit=self.__config.max_connections,
+            limit_per_host=self.__config.max_connections_per_host,
+            keepalive_timeout=self.__config.keepalive_timeout.total_seconds(),
+            ttl_dns_cache=int(self.__config.dns_cache_ttl.total_seconds()),
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                total=self.__config.total_timeout.total_seconds(),
+                connect=self.__config.connect_timeout.total_seconds(),
+                sock_read=self.__config.read_timeout.total_seconds(),
+            ),
+        )
+        self.__client = RetryClient(
+            client_session=session,
+            retry_options=JitterRetry(
+                attempts=self.__config.retry_attempts,
+                start_timeout=self.__config.retry_start_timeout.total_seconds(),
+                max_timeout=self.__config.retry_max_timeout.total_seconds(),
+                statuses={429},
+                exceptions={aiohttp.ClientConnectionError, asyncio.TimeoutError},
+            ),
+        )
+
+    async def close(self) -> None:
+        if self.__client is not None:
+            await self.__client.close()
+            self.__client = None
 
-    @staticmethod
     async def request(
-        url: str, method: str, data: dict | None = None, headers: dict = {}
+        self, url: str, method: str, data: dict | None = None, headers: dict = {}
     ) -> Tuple[aiohttp.ClientResponse | None, str]:
-        try:
+        if self.__client is None:
+            raise HTTPException(status_code=503, detail="Sci-Hub client is not started")
 
-            conn = aiohttp.TCPConnector(limit_per_host=10, keepalive_timeout=60)
-            async with aiohttp.ClientSession(connector=conn) as session:
-                async with session.request(
-                    method, url, ssl=True, data=data, headers=headers
-                ) as response:
-                    html_content = await response.text()
-                    return response, html_content
-        except aiohttp.ClientError as e:
+        try:
+            async with self.__client.request(
+                method, url, ssl=True, data=data, headers=headers
+            ) as response:
+                html_content = await response.text()
+                return response, html_content
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             raise HTTPException(status_code=500, detail=f"Request failed: {str(e)}")
 
-    @staticmethod
-    async def get_page(doi: str):
-        url = f"{SciHubApi.__url}/{doi}"
-        print("fetching this ", url)
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-        }
-        response, html_content = await SciHubApi.request(url, "GET", headers=headers)
-
-        return response, html_content
-
-    @staticmethod
-    async def get_pdf(pdf_url: str):
-        return await SciHubApi.request(pdf_url, "GET")
+    def page_url(self, doi: str) -> str:
+        return f"{self.__config.url}/{doi}"
+
+    async def get_page(self, doi: str):
+        return await self.request(self.page_url(doi), "GET", headers=PAGE_HEADERS)
+
+    @asynccontextmanager
+    async def open_pdf(
+        self, pdf_url: str, max_size: int | None = None
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        Opens a PDF download without reading its body, so it can be streamed
+        from `response.content`. Responses that are not a PDF by status or
+        content type raise ErrNotPDF; a declared length above `max_size`
+        raises streams.ErrTooLarge.
+        """
+        if self.__client is None:
+            raise HTTPException(status_code=503, detail="Sci-Hub client is not started")
+
+        try:
+            async with self.__client.get(pdf_url, ssl=True) as response:
+                if response.status != 200:
+                    raise ErrNotPDF(
+                        "scihub: open_pdf: unexpected status {}: {}".format(
+                            response.status, pdf_url
+                        )
+                    )
+                if response.content_type not in PDF_CONTENT_TYPES:
+                    raise ErrNotPDF(
+                        "scihub: open_pdf: unexpected content type {}: {}".format(
+                            response.content_type, pdf_url
+                        )
+                    )
+                if (
+                    max_size is not None
+                    and response.content_length is not None
+                    and response.content_length > max_size
+                ):
+                    raise streams.ErrTooLarge(
+                        "scihub: open_pdf: {} bytes is more than {}".format(
+                            response.content_length, max_size
+                        )
+                    )
+
+                yield response
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise HTTPException(status_code=500, detail=f"Request failed: {str(e)}")
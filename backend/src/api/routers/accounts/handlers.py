@@ -67,6 +67,12 @@ async def register(
             {"message": "user with email '{}' already exists".format(user.email)},
             status_code=status.HTTP_409_CONFLICT,
         )
+    except user_accts.ErrBusy:
+        return JSONResponse(
+            {"message": "too many requests, try again later"},
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={"Retry-After": "1"},
+        )
     except user_accts.ErrInternal as e:
         print(e)
         return JSONResponse(
@@ -108,6 +114,12 @@ async def login(
             status_code=status.HTTP_401_UNAUTHORIZED,
             content={"message": "invalid login or password"},
         )
+    except user_accts.ErrBusy:
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"message": "too many requests, try again later"},
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         logger.error(str(e))
         return JSONResponse(
@@ -1,11 +1,30 @@
 from typing import Annotated
-import jwt
 
 from fastapi import Depends, HTTPException, Header, status
 from src.services.user_accts import UserAcctService
+from src.services import user_accts
 from src.services.auth_mailing import MailService as AuthMailService
 from src.services.documents import DocumentService
-from src.init import user_acct_service, auth_mail_service, document_service, cfg
+from src.services.jobs import JobService
+from src.services.doi_imports import DOIImportService
+from src.gears.db import DB
+from src.api.clients.scihub import SciHubApi
+from src.gears.lru import LRUCache
+from src.services.answer_cache import AnswerCache
+from src.storage.cache.file_storage import CachedArticleStorage
+from src.init import (
+    cfg,
+    user_acct_service,
+    auth_mail_service,
+    document_service,
+    job_service,
+    article_storage,
+    text_cache,
+    answer_cache,
+    db,
+    scihub_api,
+    doi_import_service,
+)
 
 
 def get_user_service() -> UserAcctService:
@@ -20,6 +39,34 @@ def get_document_service() -> DocumentService:
     return document_service
 
 
+def get_job_service() -> JobService:
+    return job_service
+
+
+def get_article_storage() -> CachedArticleStorage:
+    return article_storage
+
+
+def get_text_cache() -> LRUCache:
+    return text_cache
+
+
+def get_answer_cache() -> AnswerCache:
+    return answer_cache
+
+
+def get_db() -> DB:
+    return db
+
+
+def get_scihub_api() -> SciHubApi:
+    return scihub_api
+
+
+def get_doi_import_service() -> DOIImportService:
+    return doi_import_service
+
+
 async def get_current_user(
     authorization: Annotated[str | None, Header()] = None,
     user_service: Annotated[UserAcctService, Depends(get_user_service)] = None,
@@ -38,29 +85,14 @@ async def get_current_user(
     token = authorization.removeprefix("Bearer ")
 
     try:
-        # Verify token exists in database
-        is_valid = await user_service.verify(token=token)
-        if not is_valid:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token expired",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
-        # Decode JWT token
-        payload = jwt.decode(token, cfg.auth.secret, algorithms=["HS256"])
-        return {
-            "id": payload["user_id"],
-            "username": payload["username"]
-        }
-
-    except jwt.ExpiredSignatureError:
+        result = await user_service.authenticate(token=token)
+    except user_accts.ErrSessionExpired:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token expired",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    except jwt.JWTError:
+    except (user_accts.ErrInvalidCredentials, user_accts.ErrNotFound):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -72,3 +104,17 @@ async def get_current_user(
             detail=str(e),
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    return {"id": result.user_id, "username": result.username}
+
+
+async def get_admin_user(
+    current_user: Annotated[dict, Depends(get_current_user)],
+) -> dict:
+    """The current user, if listed in `auth.admin_usernames`; 403 otherwise."""
+    if current_user["username"] not in cfg.auth.admin_usernames:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed",
+        )
+    return current_user
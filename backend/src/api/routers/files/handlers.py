@@ -1,25 +1,60 @@
-from typing import Annotated
+from datetime import timezone
+from email.utils import format_datetime
+from typing import Annotated, AsyncIterator
 from pathlib import Path
+import json
+
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Depends,
+    File,
+    Header,
+    Query,
+    UploadFile,
+    status,
+    Response,
+)
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from bs4 import BeautifulSoup
-from fastapi import APIRouter, HTTPException, Depends, File, UploadFile, status, Response
-from fastapi.responses import JSONResponse
-
-from src.api.clients.scihub import SciHubApi
-from src.services.documents import DocumentService, UploadBody
+from src.services.documents import (
+    DocumentService,
+    UploadStreamBody,
+    ChatDelta,
+    ChatResult,
+)
+from src.services import documents
+from src.gears import ranges
+from src.services.jobs import JobService
+from src.services.doi_imports import DOIImportService
+from src.services import document_jobs, doi_imports, jobs
 from src.init import logger as rootLogger
 
-from ..dependencies import get_document_service, get_current_user
+from ..dependencies import (
+    get_document_service,
+    get_job_service,
+    get_current_user,
+    get_doi_import_service,
+)
 from .schemas import (
     FileListResponse,
     ProcessDOIRequest,
-    ProcessResponse,
+    ProcessDOIBatchRequest,
+    ProcessDOIBatchResponse,
+    DOIImportItem,
     ChatRequest,
     ChatResponse,
-    SummarizeResponse,
     SummaryResponse,
     IngestedResponse,
-    IngestResponse,
+    JobAcceptedResponse,
+    UploadAcceptedResponse,
+    JobStatusResponse,
+    MessagesResponse,
+    MessageItem,
+    ChatsResponse,
+    ChatItem,
+    MultiChatRequest,
+    MultiChatResponse,
 )
 
 
@@ -67,27 +102,85 @@ async def get_file(
     file_id: int,
     current_user: Annotated[dict, Depends(get_current_user)],
     document_service: Annotated[DocumentService, Depends(get_document_service)],
+    range_header: Annotated[str | None, Header(alias="Range")] = None,
+    if_range: Annotated[str | None, Header()] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+    if_modified_since: Annotated[str | None, Header()] = None,
 ):
-    """Download a specific file."""
+    """Download a specific file. Supports single byte ranges and revalidation."""
     logger = rootLogger.getChild("files.get")
     try:
-        result = await document_service.download(user_id=current_user["id"], id=file_id)
-        return Response(
-            content=result.contents,
-            media_type="application/pdf"
-        )
+        info = await document_service.file_info(user_id=current_user["id"], id=file_id)
+    except documents.ErrNotFound:
+        raise HTTPException(status_code=404, detail="File not found")
     except Exception as e:
         logger.error(f"Failed to get file: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    etag = '"{}"'.format(info.etag)
+    last_modified = info.last_modified
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": "private, no-cache",
+    }
+
+    if ranges.not_modified(etag, last_modified, if_none_match, if_modified_since):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    byte_range = None
+    if range_header is not None and ranges.if_range_matches(
+        if_range, etag, last_modified
+    ):
+        try:
+            byte_range = ranges.parse_range(range_header, info.size)
+        except ranges.ErrUnsatisfiable:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**headers, "Content-Range": "bytes */{}".format(info.size)},
+            )
 
-@router.post("/upload", response_model=ProcessResponse)
+    if byte_range is None:
+        return StreamingResponse(
+            document_service.stream(user_id=current_user["id"], id=file_id),
+            media_type="application/pdf",
+            headers={**headers, "Content-Length": str(info.size)},
+        )
+
+    start, end = byte_range
+    return StreamingResponse(
+        document_service.stream(
+            user_id=current_user["id"],
+            id=file_id,
+            offset=start,
+            length=end - start + 1,
+        ),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type="application/pdf",
+        headers={
+            **headers,
+            "Content-Length": str(end - start + 1),
+            "Content-Range": "bytes {}-{}/{}".format(start, end, info.size),
+        },
+    )
+
+
+@router.post(
+    "/upload",
+    response_model=UploadAcceptedResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def upload_file(
     file: UploadFile,
     current_user: Annotated[dict, Depends(get_current_user)],
     document_service: Annotated[DocumentService, Depends(get_document_service)],
+    job_service: Annotated[JobService, Depends(get_job_service)],
 ):
-    """Upload a new file."""
+    """Upload a new file and queue its ingestion."""
     logger = rootLogger.getChild("files.upload")
     try:
         if not file:
@@ -96,107 +189,148 @@ async def upload_file(
         if file.content_type != "application/pdf":
             raise HTTPException(status_code=400, detail="Only PDF files are supported")
 
-        contents = await file.read()
-        result = await document_service.upload(
-            UploadBody(
+        result = await document_service.upload_stream(
+            UploadStreamBody(
                 user_id=current_user["id"],
                 filename=file.filename,
-                contents=contents,
+                read=file.read,
                 content_type=file.content_type,
             )
         )
 
-        # Ingest the file
-        ingest_result = await document_service.save_ingest(
+        job = await job_service.enqueue(
             user_id=current_user["id"],
-            id=result.id
+            kind=document_jobs.INGEST,
+            payload={"file_id": result.id},
         )
 
-        return ProcessResponse(
-            message="File uploaded and processed successfully",
+        return UploadAcceptedResponse(
+            message="File uploaded, ingestion queued",
             file_id=result.id,
-            ingested_id=ingest_result.id
+            job_id=job.id,
+            status=job.status,
         )
+    except HTTPException:
+        raise
+    except documents.ErrTooLarge:
+        raise HTTPException(status_code=413, detail="File is too large")
     except Exception as e:
         logger.error(f"Failed to upload file: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/process-doi", response_model=ProcessResponse)
+@router.post(
+    "/process-doi",
+    response_model=UploadAcceptedResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def process_doi(
     body: ProcessDOIRequest,
     current_user: Annotated[dict, Depends(get_current_user)],
-    document_service: Annotated[DocumentService, Depends(get_document_service)],
+    job_service: Annotated[JobService, Depends(get_job_service)],
+    doi_import_service: Annotated[DOIImportService, Depends(get_doi_import_service)],
 ):
-    """Process a DOI link and download the PDF."""
+    """Download the PDF of a DOI and queue its ingestion."""
     logger = rootLogger.getChild("files.process-doi")
     try:
         if not body.doi:
             raise HTTPException(status_code=400, detail="No DOI provided")
 
-        _, html_content = await SciHubApi.get_page(body.doi)
-        if not html_content:
-            raise HTTPException(status_code=500, detail="Empty response from Sci-Hub")
-
-        soup = BeautifulSoup(html_content, "html.parser")
-        embed_tag = soup.find("embed")
-        if not embed_tag or "src" not in embed_tag.attrs:
-            raise HTTPException(status_code=404, detail="PDF not found on Sci-Hub")
-
-        pdf_url = embed_tag["src"]
-        if pdf_url.startswith("//"):
-            pdf_url = "https:" + pdf_url
-
-        pdf_filename = pdf_url.split("/")[-1].split("#")[0]
-        response, pdf_content = await SciHubApi.get_pdf(pdf_url)
-
-        if not response or not pdf_content:
-            raise HTTPException(status_code=500, detail="Failed to download PDF")
-
-        # Upload to document service
-        result = await document_service.upload(
-            UploadBody(
-                user_id=current_user["id"],
-                filename=pdf_filename,
-                contents=pdf_content.encode(),
-                content_type="application/pdf",
-            )
+        result = await doi_import_service.download(
+            user_id=current_user["id"], doi=body.doi
         )
 
-        # Ingest the file
-        ingest_result = await document_service.save_ingest(
+        job = await job_service.enqueue(
             user_id=current_user["id"],
-            id=result.id
+            kind=document_jobs.INGEST,
+            payload={"file_id": result.id},
         )
-        print(ingest_result)
 
-        return ProcessResponse(
-            message="PDF downloaded and processed successfully",
+        return UploadAcceptedResponse(
+            message="PDF downloaded, ingestion queued",
             file_id=result.id,
-            ingested_id=ingest_result.id
+            job_id=job.id,
+            status=job.status,
         )
+    except HTTPException:
+        raise
+    except doi_imports.ErrNotFound:
+        raise HTTPException(status_code=404, detail="PDF not found on Sci-Hub")
+    except doi_imports.ErrNotPDF as e:
+        logger.error(f"Sci-Hub did not return a PDF: {str(e)}")
+        raise HTTPException(status_code=502, detail="Sci-Hub did not return a PDF")
+    except doi_imports.ErrTooLarge:
+        raise HTTPException(status_code=413, detail="File is too large")
     except Exception as e:
         logger.error(f"Failed to process DOI: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/summarize/{file_id}", response_model=SummarizeResponse)
+@router.post(
+    "/process-doi/batch",
+    response_model=ProcessDOIBatchResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def process_doi_batch(
+    body: ProcessDOIBatchRequest,
+    current_user: Annotated[dict, Depends(get_current_user)],
+    doi_import_service: Annotated[DOIImportService, Depends(get_doi_import_service)],
+):
+    """Queue download and ingestion of many DOIs, one job per DOI."""
+    logger = rootLogger.getChild("files.process-doi-batch")
+    try:
+        if not body.dois:
+            raise HTTPException(status_code=400, detail="No DOIs provided")
+
+        results = await doi_import_service.import_many(
+            user_id=current_user["id"], dois=body.dois
+        )
+        return ProcessDOIBatchResponse(
+            results=[
+                DOIImportItem(
+                    doi=item.doi,
+                    status=item.status,
+                    file_id=item.file_id,
+                    job_id=item.job_id,
+                    error=item.error,
+                )
+                for item in results
+            ]
+        )
+    except HTTPException:
+        raise
+    except doi_imports.ErrTooManyDOIs as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to import DOIs: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/summarize/{file_id}",
+    response_model=JobAcceptedResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def summarize_file(
     file_id: int,
     current_user: Annotated[dict, Depends(get_current_user)],
-    document_service: Annotated[DocumentService, Depends(get_document_service)],
+    job_service: Annotated[JobService, Depends(get_job_service)],
 ):
-    """Generate a summary for a specific file."""
+    """Queue summary generation for a specific file."""
     logger = rootLogger.getChild("files.summarize")
     try:
-        result = await document_service.summarize(id=file_id)
-        return SummarizeResponse(
-            message="Summarization completed successfully",
-            summary=result.summary,
-            summary_id=result.summary_id
+        job = await job_service.enqueue(
+            user_id=current_user["id"],
+            kind=document_jobs.SUMMARIZE,
+            payload={"file_id": file_id},
+        )
+        return JobAcceptedResponse(
+            message="Summarization queued",
+            job_id=job.id,
+            status=job.status,
         )
     except Exception as e:
-        logger.error(f"Failed to summarize file: {str(e)}")
+        logger.error(f"Failed to queue summarization: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -229,6 +363,7 @@ async def chat_with_document(
     logger = rootLogger.getChild("files.chat")
     try:
         result = await document_service.chat(
+            user_id=current_user["id"],
             id=request.file_id,
             prompt=request.prompt,
             chat_id=request.chat_id
@@ -239,28 +374,227 @@ async def chat_with_document(
             chat_id=result.chat_id,
             message_id=result.message_id
         )
+    except documents.ErrNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to chat with document: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/ingest/{file_id}", response_model=IngestResponse)
-async def ingest_file(
+@router.post("/chat-with-docs", response_model=MultiChatResponse)
+async def chat_with_documents(
+    request: MultiChatRequest,
+    current_user: Annotated[dict, Depends(get_current_user)],
+    document_service: Annotated[DocumentService, Depends(get_document_service)],
+):
+    """Ask one question across several ingested files (the latest ones by default)."""
+    logger = rootLogger.getChild("files.chat-many")
+    if request.file_ids is not None and not request.file_ids:
+        raise HTTPException(status_code=400, detail="Provide at least one file id")
+
+    try:
+        result = await document_service.chat_many(
+            user_id=current_user["id"],
+            ids=request.file_ids,
+            prompt=request.prompt,
+        )
+    except documents.ErrNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except documents.ErrTooManyDocuments as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to chat with documents: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return MultiChatResponse(response=result.response, sources=result.sources)
+
+
+@router.post("/chat-with-doc/stream")
+async def chat_with_document_stream(
+    request: ChatRequest,
+    current_user: Annotated[dict, Depends(get_current_user)],
+    document_service: Annotated[DocumentService, Depends(get_document_service)],
+):
+    """Chat with a specific document, streaming the answer as Server-Sent Events."""
+    logger = rootLogger.getChild("files.chat-stream")
+    events = document_service.chat_stream(
+        user_id=current_user["id"],
+        id=request.file_id,
+        prompt=request.prompt,
+        chat_id=request.chat_id,
+    )
+
+    try:
+        # Surface lookup and connection errors as a regular HTTP error
+        # before the event stream starts.
+        first = await anext(events)
+    except documents.ErrNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to chat with document: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return StreamingResponse(
+        _chat_events(first, events, logger),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _chat_events(
+    first: ChatDelta | ChatResult,
+    events: AsyncIterator[ChatDelta | ChatResult],
+    logger,
+) -> AsyncIterator[str]:
+    try:
+        yield _chat_event(first)
+        async for event in events:
+            yield _chat_event(event)
+    except Exception as e:
+        logger.error(f"Failed to stream chat with document: {str(e)}")
+        yield _sse("error", {"detail": str(e)})
+
+
+def _chat_event(event: ChatDelta | ChatResult) -> str:
+    if isinstance(event, ChatDelta):
+        return _sse("token", {"content": event.content})
+
+    return _sse(
+        "done",
+        {
+            "source": event.source,
+            "chat_id": str(event.chat_id),
+            "message_id": event.message_id,
+        },
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    return "event: {}\ndata: {}\n\n".format(event, json.dumps(data))
+
+
+@router.get("/chats/{chat_id}/messages", response_model=MessagesResponse)
+async def list_chat_messages(
+    chat_id: int,
+    current_user: Annotated[dict, Depends(get_current_user)],
+    document_service: Annotated[DocumentService, Depends(get_document_service)],
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    cursor: str | None = None,
+):
+    """Latest messages of a chat, oldest first; pass next_cursor to page back."""
+    logger = rootLogger.getChild("files.chat-messages")
+    try:
+        page = await document_service.list_messages(
+            user_id=current_user["id"], chat_id=chat_id, limit=limit, cursor=cursor
+        )
+    except documents.ErrInvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except documents.ErrNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to list chat messages: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return MessagesResponse(
+        messages=[
+            MessageItem(
+                id=message.id,
+                role=message.role,
+                content=message.content,
+                created_at=message.created_at,
+            )
+            for message in page.messages
+        ],
+        next_cursor=page.next_cursor,
+    )
+
+
+@router.get("/ingested/{file_id}/chats", response_model=ChatsResponse)
+async def list_file_chats(
     file_id: int,
     current_user: Annotated[dict, Depends(get_current_user)],
     document_service: Annotated[DocumentService, Depends(get_document_service)],
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    cursor: str | None = None,
 ):
-    """Ingest a specific file."""
+    """Chats about an ingested file, newest first."""
+    logger = rootLogger.getChild("files.chats")
+    try:
+        page = await document_service.list_chats(
+            user_id=current_user["id"], id=file_id, limit=limit, cursor=cursor
+        )
+    except documents.ErrInvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except documents.ErrNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to list chats: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return ChatsResponse(
+        chats=[
+            ChatItem(
+                id=chat.id,
+                title=chat.title,
+                created_at=chat.created_at,
+                updated_at=chat.updated_at,
+            )
+            for chat in page.chats
+        ],
+        next_cursor=page.next_cursor,
+    )
+
+
+@router.post(
+    "/ingest/{file_id}",
+    response_model=JobAcceptedResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def ingest_file(
+    file_id: int,
+    current_user: Annotated[dict, Depends(get_current_user)],
+    job_service: Annotated[JobService, Depends(get_job_service)],
+):
+    """Queue ingestion of a specific file."""
     logger = rootLogger.getChild("files.ingest")
     try:
-        ingest_result = await document_service.save_ingest(
+        job = await job_service.enqueue(
             user_id=current_user["id"],
-            id=file_id
+            kind=document_jobs.INGEST,
+            payload={"file_id": file_id},
+        )
+        return JobAcceptedResponse(
+            message="Ingestion queued",
+            job_id=job.id,
+            status=job.status,
         )
-        return IngestResponse(
-            message="File ingested successfully",
-            ingested_id=ingest_result.id
+    except Exception as e:
+        logger.error(f"Failed to queue ingestion: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(
+    job_id: int,
+    current_user: Annotated[dict, Depends(get_current_user)],
+    job_service: Annotated[JobService, Depends(get_job_service)],
+):
+    """Get status and progress of a queued job."""
+    logger = rootLogger.getChild("files.jobs")
+    try:
+        job = await job_service.get(user_id=current_user["id"], id=job_id)
+        return JobStatusResponse(
+            job_id=job.id,
+            kind=job.kind,
+            status=job.status,
+            attempts=job.attempts,
+            progress_done=job.progress_done,
+            progress_total=job.progress_total,
+            result=job.result,
+            error=job.error,
         )
+    except jobs.ErrNotFound:
+        raise HTTPException(status_code=404, detail="Job not found")
     except Exception as e:
-        logger.error(f"Failed to ingest file: {str(e)}")
+        logger.error(f"Failed to get job: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 from typing import List, Optional
 
@@ -25,10 +27,20 @@ class ProcessDOIRequest(BaseModel):
     doi: str
 
 
-class ProcessResponse(BaseModel):
-    message: str
-    file_id: int
-    ingested_id: int
+class ProcessDOIBatchRequest(BaseModel):
+    dois: List[str]
+
+
+class DOIImportItem(BaseModel):
+    doi: str
+    status: str
+    file_id: Optional[int] = None
+    job_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class ProcessDOIBatchResponse(BaseModel):
+    results: List[DOIImportItem]
 
 
 class IngestResponse(BaseModel):
@@ -36,12 +48,47 @@ class IngestResponse(BaseModel):
     ingested_id: int
 
 
+class JobAcceptedResponse(BaseModel):
+    message: str
+    job_id: int
+    status: str
+
+
+class UploadAcceptedResponse(BaseModel):
+    message: str
+    file_id: int
+    job_id: int
+    status: str
+
+
+class JobStatusResponse(BaseModel):
+    job_id: int
+    kind: str
+    status: str
+    attempts: int
+    progress_done: int
+    progress_total: int
+    result: Optional[dict] = None
+    error: Optional[str] = None
+
+
 class ChatRequest(BaseModel):
     file_id: int
     prompt: str
     chat_id: Optional[str] = None
 
 
+class MultiChatRequest(BaseModel):
+    prompt: str
+    # Ingested file ids; omit to chat with the latest chat.max_documents files.
+    file_ids: Optional[List[int]] = None
+
+
+class MultiChatResponse(BaseModel):
+    response: str
+    sources: List[str]
+
+
 class ChatResponse(BaseModel):
     response: str
     source: str
@@ -49,6 +96,30 @@ class ChatResponse(BaseModel):
     message_id: int
 
 
+class MessageItem(BaseModel):
+    id: int
+    role: str
+    content: str
+    created_at: datetime
+
+
+class MessagesResponse(BaseModel):
+    messages: List[MessageItem]
+    next_cursor: Optional[str] = None
+
+
+class ChatItem(BaseModel):
+    id: int
+    title: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class ChatsResponse(BaseModel):
+    chats: List[ChatItem]
+    next_cursor: Optional[str] = None
+
+
 class SummarizeResponse(BaseModel):
     message: str
     summary: str
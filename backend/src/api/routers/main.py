@@ -6,7 +6,7 @@ from fastapi.responses import FileResponse
 
 from src.api.clients.scihub import SciHubApi
 from src.consts import DOWNLOAD_FOLDER
-from src.init import pgpt_client, summary_store
+from src.init import pgpt_client
 from src.services.summarization import (
     background_summarize,
     ingest_file_and_store,
@@ -18,11 +18,13 @@ from src.schemas.chat_request import ChatRequest
 
 from src.api.routers.accounts.handlers import router as accounts_router
 from src.api.routers.files.handlers import router as files_router
+from src.api.routers.metrics.handlers import router as metrics_router
 
 router = APIRouter()
 
 router.include_router(router=accounts_router, prefix="/accounts")
 router.include_router(router=files_router, prefix="/files")
+router.include_router(router=metrics_router, prefix="/metrics")
 
 """
 @router.get("/files")
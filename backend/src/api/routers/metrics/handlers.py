@@ -0,0 +1,56 @@
+from dataclasses import asdict
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from src.gears.db import DB
+from src.gears.lru import LRUCache
+from src.services.answer_cache import AnswerCache
+from src.storage.cache.file_storage import CachedArticleStorage
+
+from ..dependencies import (
+    get_article_storage,
+    get_text_cache,
+    get_answer_cache,
+    get_db,
+    get_admin_user,
+)
+from .schemas import (
+    CachesResponse,
+    CacheStatsResponse,
+    AnswerCacheStatsResponse,
+    PoolStatsResponse,
+)
+
+
+router = APIRouter()
+
+
+@router.get("/cache", response_model=CachesResponse)
+async def cache_stats(
+    admin_user: Annotated[dict, Depends(get_admin_user)],
+    article_storage: Annotated[CachedArticleStorage, Depends(get_article_storage)],
+    text_cache: Annotated[LRUCache, Depends(get_text_cache)],
+    answer_cache: Annotated[AnswerCache, Depends(get_answer_cache)],
+):
+    """Report size, hit and eviction counters of the in-process caches. Admins only."""
+    return CachesResponse(
+        objects=CacheStatsResponse(**asdict(article_storage.stats())),
+        text=CacheStatsResponse(**asdict(text_cache.stats())),
+        answers=AnswerCacheStatsResponse(**asdict(answer_cache.stats())),
+    )
+
+
+@router.get("/db", response_model=PoolStatsResponse)
+async def db_pool_stats(
+    admin_user: Annotated[dict, Depends(get_admin_user)],
+    db: Annotated[DB, Depends(get_db)],
+):
+    """Report connection pool usage, checkout waits and connect times. Admins only."""
+    stats = db.pool_stats()
+    return PoolStatsResponse(
+        **asdict(stats),
+        wait_seconds_avg=(
+            stats.wait_seconds_total / stats.checkouts if stats.checkouts else 0.0
+        ),
+    )
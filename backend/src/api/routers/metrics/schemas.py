@@ -0,0 +1,45 @@
+from pydantic import BaseModel
+
+
+class CacheStatsResponse(BaseModel):
+    entries: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+
+class AnswerCacheStatsResponse(BaseModel):
+    entries: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    similar_hits: int
+    misses: int
+    hit_rate: float
+    saved_seconds: float
+
+
+class CachesResponse(BaseModel):
+    objects: CacheStatsResponse
+    text: CacheStatsResponse
+    answers: AnswerCacheStatsResponse
+
+
+class PoolStatsResponse(BaseModel):
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    wait_seconds_avg: float
+    connects: int
+    errors: int
+    connect_seconds_total: float
+    connect_seconds_max: float
@@ -1,5 +1,5 @@
 from datetime import timedelta
-from typing import Literal
+from typing import List, Literal
 from pathlib import Path
 import os
 
@@ -16,6 +16,16 @@ class AppSettings(BaseSettings):
     pgpt: "PGPTSettings"
     auth_mailer: "AuthMailerSettings"
     minio: "MinioSettings"
+    summarizer: "SummarizerSettings"
+    jobs: "JobsSettings"
+    pdf: "PDFSettings"
+    chunker: "ChunkerSettings"
+    uploads: "UploadSettings"
+    cache: "CacheSettings"
+    passwords: "PasswordSettings"
+    chat: "ChatSettings"
+    scihub: "SciHubSettings"
+    doi_imports: "DOIImportSettings"
 
 
 def load(filepath: str) -> "AppSettings":
@@ -39,10 +49,23 @@ class HTTPServerSettings(BaseSettings):
 class AuthSettings(BaseSettings):
     secret: str
     expiry: timedelta
+    token_cache_max_bytes: int = 4 * 1024 * 1024
+    token_cache_ttl: timedelta = timedelta(minutes=1)
+    reap_interval: timedelta = timedelta(minutes=10)
+    reap_batch_size: int = 1000
+    # Users allowed to read operational endpoints such as /metrics.
+    admin_usernames: List[str] = []
 
 
 class PostgresSettings(BaseSettings):
     dsn: str
+    pool_size: int = 5
+    max_overflow: int = 10
+    # How long a request waits for a free connection before failing.
+    pool_timeout: timedelta = timedelta(seconds=30)
+    pool_recycle: timedelta = timedelta(minutes=30)
+    pool_pre_ping: bool = True
+    statement_timeout: timedelta = timedelta(seconds=30)
 
 
 class PGPTSettings(BaseSettings):
@@ -65,3 +88,99 @@ class MinioSettings(BaseSettings):
     access_key: str
     secret_key: str
     secure: bool
+
+
+class SummarizerSettings(BaseSettings):
+    # Completions in flight per process, over all documents being summarized.
+    max_concurrency: int = 4
+    reduce_fan_in: int = 4
+
+
+class JobsSettings(BaseSettings):
+    workers: int = 2
+    max_attempts: int = 3
+    poll_interval: timedelta = timedelta(seconds=2)
+    # A job is claimed again when its worker has not renewed it for `lease`;
+    # running jobs renew every `heartbeat_interval`.
+    lease: timedelta = timedelta(minutes=2)
+    heartbeat_interval: timedelta = timedelta(seconds=30)
+    retry_backoff: timedelta = timedelta(seconds=15)
+
+
+class PDFSettings(BaseSettings):
+    executor: Literal["process", "thread"] = "process"
+    max_workers: int = 2
+    pages_per_task: int = 16
+    prefetch_tasks: int = 4
+
+
+class ChunkerSettings(BaseSettings):
+    max_tokens: int = 1024
+    overlap_tokens: int = 64
+    chars_per_token: float = 4.0
+
+
+class UploadSettings(BaseSettings):
+    max_size: int = 200 * 1024 * 1024
+    # S3 multipart parts must be at least 5 MiB.
+    part_size: int = 8 * 1024 * 1024
+
+
+class CacheSettings(BaseSettings):
+    objects_max_bytes: int = 256 * 1024 * 1024
+    objects_ttl: timedelta = timedelta(minutes=10)
+    # Larger objects are streamed from storage without being cached.
+    object_max_size: int = 32 * 1024 * 1024
+    text_max_bytes: int = 64 * 1024 * 1024
+    text_ttl: timedelta = timedelta(minutes=30)
+    answers_max_bytes: int = 16 * 1024 * 1024
+    answers_ttl: timedelta = timedelta(hours=6)
+    answers_per_document: int = 64
+    # Word-bigram cosine similarity for two questions to share an answer;
+    # 1.0 only reuses answers to questions equal after normalization.
+    answers_similarity: float = 1.0
+
+
+class PasswordSettings(BaseSettings):
+    workers: int = 2
+    # Calls waiting for a free worker before new ones are rejected.
+    max_queued: int = 32
+    bcrypt_rounds: int = 12
+
+
+class ChatSettings(BaseSettings):
+    # Estimated tokens of history (summary, earlier messages and the new
+    # prompt) sent with a chat turn.
+    history_max_tokens: int = 2048
+    history_max_messages: int = 50
+    rolling_summary: bool = True
+    chars_per_token: float = 4.0
+    # Documents a single multi-document chat may retrieve from.
+    max_documents: int = 20
+
+
+class SciHubSettings(BaseSettings):
+    url: str = "https://sci-hub.ru"
+    max_connections: int = 100
+    max_connections_per_host: int = 10
+    keepalive_timeout: timedelta = timedelta(seconds=60)
+    dns_cache_ttl: timedelta = timedelta(minutes=5)
+    connect_timeout: timedelta = timedelta(seconds=10)
+    read_timeout: timedelta = timedelta(seconds=30)
+    total_timeout: timedelta = timedelta(minutes=2)
+    retry_attempts: int = 3
+    retry_start_timeout: timedelta = timedelta(milliseconds=500)
+    retry_max_timeout: timedelta = timedelta(seconds=10)
+
+
+class DOIImportSettings(BaseSettings):
+    # DOIs per batch import; each new one becomes an IMPORT job.
+    max_batch: int = 100
+    # IMPORT jobs resolving and downloading papers at the same time, on top
+    # of the job queue's own `workers` limit.
+    max_concurrency: int = 4
+    # How long a DOI's PDF location, and the stored copy reused by later
+    # imports, is trusted; DOIs without a PDF are retried after
+    # `not_found_ttl`.
+    resolution_ttl: timedelta = timedelta(days=30)
+    not_found_ttl: timedelta = timedelta(hours=12)
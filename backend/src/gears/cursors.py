@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Tuple
+import base64
+
+
+class ErrInvalidCursor(Exception):
+    pass
+
+
+def encode(created_at: datetime, id: int) -> str:
+    """Opaque keyset cursor pointing at the row with (created_at, id)."""
+    raw = "{}|{}".format(created_at.isoformat(), id)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(id)
+    except Exception:
+        raise ErrInvalidCursor("cursors: decode: invalid cursor: {}".format(cursor))
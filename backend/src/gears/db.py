@@ -1,16 +1,171 @@
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import timedelta
+import time
+
 from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
     AsyncEngine,
     AsyncSession,
 )
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+@dataclass
+class PoolStats:
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    # Checkouts that gave up waiting for a free connection.
+    timeouts: int
+    # Time checkouts spent waiting for a connection to be returned to the
+    # pool, without the time spent opening new ones.
+    wait_seconds_total: float
+    wait_seconds_max: float
+    # New connections opened by checkouts, and the ones that failed to open
+    # (refused, authentication). Pre-ping runs after the checkout and
+    # reconnects on its own, so neither is counted here.
+    connects: int
+    errors: int
+    connect_seconds_total: float
+    connect_seconds_max: float
+
+
+class _Checkout:
+    def __init__(self):
+        self.connect_seconds = 0.0
+
+
+# The checkout in progress in the current task, which also runs the
+# greenlet that the pool is called from.
+_checkout: ContextVar[_Checkout | None] = ContextVar("checkout", default=None)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long checkouts wait for a free connection
+    and, separately, how long opening new connections takes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.connects = 0
+        self.errors = 0
+        self.connect_seconds_total = 0.0
+        self.connect_seconds_max = 0.0
+
+    def recreate(self):
+        # Keep the counters when the engine recreates the pool (dispose).
+        pool = super().recreate()
+        for name in (
+            "checkouts",
+            "timeouts",
+            "wait_seconds_total",
+            "wait_seconds_max",
+            "connects",
+            "errors",
+            "connect_seconds_total",
+            "connect_seconds_max",
+        ):
+            setattr(pool, name, getattr(self, name))
+        return pool
+
+    def _do_get(self):
+        # QueuePool retries by calling _do_get again; count the outer call.
+        if _checkout.get() is not None:
+            return super()._do_get()
+
+        checkout = _Checkout()
+        token = _checkout.set(checkout)
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            _checkout.reset(token)
+            waited = time.perf_counter() - started - checkout.connect_seconds
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def _create_connection(self):
+        started = time.perf_counter()
+        try:
+            return super()._create_connection()
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.connects += 1
+            self.connect_seconds_total += elapsed
+            self.connect_seconds_max = max(self.connect_seconds_max, elapsed)
+            checkout = _checkout.get()
+            if checkout is not None:
+                checkout.connect_seconds += elapsed
 
 
 class DB:
-    def __init__(self, dsn: str, echo: bool) -> None:
-        self.engine: AsyncEngine = create_async_engine(dsn, echo=echo)
+    def __init__(
+        self,
+        dsn: str,
+        echo: bool,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: timedelta = timedelta(seconds=30),
+        pool_recycle: timedelta = timedelta(minutes=30),
+        pool_pre_ping: bool = True,
+        statement_timeout: timedelta | None = None,
+    ) -> None:
+        connect_args = {}
+        if statement_timeout is not None:
+            connect_args["server_settings"] = {
+                "statement_timeout": str(int(statement_timeout.total_seconds() * 1000))
+            }
+
+        self.engine: AsyncEngine = create_async_engine(
+            dsn,
+            echo=echo,
+            poolclass=InstrumentedPool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout.total_seconds(),
+            pool_recycle=int(pool_recycle.total_seconds()),
+            pool_pre_ping=pool_pre_ping,
+            connect_args=connect_args,
+        )
+        self.__max_overflow = max_overflow
         self.session_maker: async_sessionmaker[AsyncSession] = async_sessionmaker(
             self.engine,
             expire_on_commit=False,
             class_=AsyncSession,
         )
+
+    def pool_stats(self) -> PoolStats:
+        pool: InstrumentedPool = self.engine.sync_engine.pool
+        return PoolStats(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=self.__max_overflow,
+            checkouts=pool.checkouts,
+            timeouts=pool.timeouts,
+            wait_seconds_total=pool.wait_seconds_total,
+            wait_seconds_max=pool.wait_seconds_max,
+            connects=pool.connects,
+            errors=pool.errors,
+            connect_seconds_total=pool.connect_seconds_total,
+            connect_seconds_max=pool.connect_seconds_max,
+        )
@@ -0,0 +1,97 @@
+from html.parser import HTMLParser
+from typing import Callable, Sequence
+from urllib.parse import parse_qs, urlsplit
+import re
+
+from bs4 import BeautifulSoup
+
+
+# Returns the PDF link found on a landing page, as written in the page.
+Extractor = Callable[[str], str | None]
+
+_ONCLICK_LOCATION = re.compile(r"location\.href\s*=\s*['\"]([^'\"]+)['\"]")
+
+
+def _is_pdf_url(url: str) -> bool:
+    """Whether `url` names a .pdf file or asks for a download."""
+    parsed = urlsplit(url)
+    if parsed.path.lower().endswith(".pdf"):
+        return True
+    return "download" in parse_qs(parsed.query, keep_blank_values=True)
+
+
+class _Found(Exception):
+    pass
+
+
+class _TargetedParser(HTMLParser):
+    """
+    Scans tags for the PDF link without building a tree. Parsing stops at
+    the first <embed src>, the layout most mirrors use; on other layouts the
+    first <iframe src> and then the first download button (an onclick
+    redirect or a link to a .pdf file or with a `download` parameter) are
+    kept as fallbacks; redirects elsewhere, such as to a captcha, are not.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.embed: str | None = None
+        self.iframe: str | None = None
+        self.button: str | None = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "embed":
+            src = dict(attrs).get("src")
+            if src:
+                self.embed = src
+                raise _Found()
+        elif tag == "iframe":
+            if self.iframe is None:
+                self.iframe = dict(attrs).get("src") or None
+        elif tag in ("button", "a", "div"):
+            if self.button is None:
+                self.button = self.__button_url(tag, dict(attrs))
+
+    def __button_url(self, tag: str, attrs: dict) -> str | None:
+        onclick = attrs.get("onclick")
+        if onclick:
+            match = _ONCLICK_LOCATION.search(onclick)
+            if match and _is_pdf_url(match.group(1)):
+                return match.group(1)
+        href = attrs.get("href")
+        if tag == "a" and href and _is_pdf_url(href):
+            return href
+        return None
+
+
+def targeted(html: str) -> str | None:
+    """PDF link found with a single stop-early pass over the page's tags."""
+    parser = _TargetedParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except _Found:
+        pass
+    return parser.embed or parser.iframe or parser.button
+
+
+def soup(html: str) -> str | None:
+    """PDF link of the first <embed src>, found on a full BeautifulSoup tree."""
+    embed_tag = BeautifulSoup(html, "html.parser").find("embed")
+    if not embed_tag or not embed_tag.get("src"):
+        return None
+    return embed_tag["src"]
+
+
+# Tried in order until one finds a link.
+EXTRACTORS: Sequence[Extractor] = (targeted,)
+
+
+def extract_pdf_url(
+    html: str, extractors: Sequence[Extractor] = EXTRACTORS
+) -> str | None:
+    for extractor in extractors:
+        url = extractor(html)
+        if url:
+            return url
+    return None
@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Generic, Hashable, Optional, TypeVar
+import time
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    entries: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    size: int
+    expires_at: float
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Least-recently-used cache bounded by the total size of its values
+    (as reported by callers) rather than by entry count. Entries expire
+    after `ttl` unless a shorter ttl is given on `put`.
+    """
+
+    def __init__(self, max_bytes: int, ttl: timedelta):
+        self.__max_bytes = max_bytes
+        self.__ttl = ttl.total_seconds()
+        self.__entries: OrderedDict[K, _Entry[V]] = OrderedDict()
+        self.__bytes = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__expirations = 0
+
+    def get(self, key: K) -> Optional[V]:
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.__misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self.__remove(key)
+            self.__expirations += 1
+            self.__misses += 1
+            return None
+
+        self.__entries.move_to_end(key)
+        self.__hits += 1
+        return entry.value
+
+    def put(self, key: K, value: V, size: int, ttl: timedelta | None = None) -> None:
+        if key in self.__entries:
+            self.__remove(key)
+        if size > self.__max_bytes:
+            return
+
+        seconds = self.__ttl if ttl is None else min(self.__ttl, ttl.total_seconds())
+        if seconds <= 0:
+            return
+
+        self.__entries[key] = _Entry(
+            value=value, size=size, expires_at=time.monotonic() + seconds
+        )
+        self.__bytes += size
+
+        while self.__bytes > self.__max_bytes:
+            oldest = next(iter(self.__entries))
+            self.__remove(oldest)
+            self.__evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        if key in self.__entries:
+            self.__remove(key)
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            entries=len(self.__entries),
+            bytes=self.__bytes,
+            max_bytes=self.__max_bytes,
+            hits=self.__hits,
+            misses=self.__misses,
+            evictions=self.__evictions,
+            expirations=self.__expirations,
+        )
+
+    def __remove(self, key: K) -> None:
+        entry = self.__entries.pop(key)
+        self.__bytes -= entry.size
@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+
+import bcrypt
+
+
+class ErrBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated thread pool (bcrypt releases the GIL) so
+    hashing never blocks the event loop. At most `max_queued` calls may wait
+    for a free worker; beyond that calls fail fast with ErrBusy instead of
+    piling up.
+    """
+
+    def __init__(self, workers: int, max_queued: int, rounds: int):
+        self.__executor = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="bcrypt"
+        )
+        self.__max_pending = max(1, workers) + max(0, max_queued)
+        self.__pending = 0
+        self.__rounds = rounds
+
+    async def hash(self, password: str) -> str:
+        """Returns the bcrypt hash as hex, the way user accounts store it."""
+        hashed = await self.__run(
+            bcrypt.hashpw, password.encode(), bcrypt.gensalt(rounds=self.__rounds)
+        )
+        return hashed.hex()
+
+    async def check(self, password: str, hashed_hex: str) -> bool:
+        return await self.__run(
+            bcrypt.checkpw, password.encode(), bytes.fromhex(hashed_hex)
+        )
+
+    def shutdown(self) -> None:
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __run(self, fn, *args):
+        if self.__pending >= self.__max_pending:
+            raise ErrBusy("password-hasher: too many pending operations")
+
+        self.__pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.__executor, fn, *args)
+        finally:
+            self.__pending -= 1
@@ -1,11 +1,135 @@
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Literal
+import asyncio
+import os
+import tempfile
+
 import fitz
 
 
+# Every PDF file starts with these bytes.
+SIGNATURE = b"%PDF-"
+
+
+@dataclass
+class Page:
+    number: int
+    text: str
+
+
 def extract_text(pdf_contents: bytes) -> str:
-    doc = fitz.open(stream=pdf_contents, filetype="pdf")
+    with fitz.open(stream=pdf_contents, filetype="pdf") as doc:
+        return "".join(page.get_text() for page in doc)
+
+
+def open_document(source: bytes | str) -> fitz.Document:
+    """Opens a PDF from its contents or from the path of a file holding them."""
+    if isinstance(source, str):
+        return fitz.open(source, filetype="pdf")
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def page_count(source: bytes | str) -> int:
+    with open_document(source) as doc:
+        return doc.page_count
+
+
+def extract_pages(source: bytes | str, start: int, stop: int) -> List[str]:
+    """Returns the text of pages [start, stop). Runs inside executor workers."""
+    with open_document(source) as doc:
+        return [doc[number].get_text() for number in range(start, stop)]
+
+
+def spill(pdf_contents: bytes) -> str:
+    """Writes `pdf_contents` to a temporary file and returns its path."""
+    with tempfile.NamedTemporaryFile(
+        prefix="pdf-extract-", suffix=".pdf", delete=False
+    ) as file:
+        file.write(pdf_contents)
+        return file.name
+
+
+def new_executor(kind: Literal["process", "thread"], max_workers: int) -> Executor:
+    if kind == "thread":
+        return ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="pdf-extract"
+        )
+    return ProcessPoolExecutor(max_workers=max_workers)
+
+
+class TextExtractor:
+    """
+    Extracts PDF text on an executor so the event loop is never blocked.
+    Documents are split into ranges of `pages_per_task` pages; at most
+    `prefetch_tasks` ranges are extracted ahead of the consumer.
+
+    Process workers get the path of a temporary copy of the document
+    rather than its contents, which would otherwise be pickled and copied
+    to a worker once per range.
+    """
+
+    def __init__(self, executor: Executor, pages_per_task: int, prefetch_tasks: int):
+        self.__executor = executor
+        self.__pages_per_task = max(1, pages_per_task)
+        self.__prefetch_tasks = max(1, prefetch_tasks)
+
+    async def iter_pages(self, pdf_contents: bytes) -> AsyncIterator[Page]:
+        if not isinstance(self.__executor, ProcessPoolExecutor):
+            async for page in self.__iter_pages(pdf_contents):
+                yield page
+            return
+
+        path = await asyncio.to_thread(spill, pdf_contents)
+        try:
+            async for page in self.__iter_pages(path):
+                yield page
+        finally:
+            try:
+                os.unlink(path)
+            except OSError:
+                # A cancelled range may still hold the file open (Windows).
+                pass
+
+    async def extract_text(self, pdf_contents: bytes) -> str:
+        return "".join([page.text async for page in self.iter_pages(pdf_contents)])
+
+    def shutdown(self) -> None:
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __iter_pages(self, source: bytes | str) -> AsyncIterator[Page]:
+        loop = asyncio.get_running_loop()
+        count = await loop.run_in_executor(self.__executor, page_count, source)
+
+        starts = iter(range(0, count, self.__pages_per_task))
+        pending: deque[tuple[int, asyncio.Future]] = deque()
+
+        def submit() -> None:
+            start = next(starts, None)
+            if start is None:
+                return
+            stop = min(start + self.__pages_per_task, count)
+            pending.append(
+                (
+                    start,
+                    loop.run_in_executor(
+                        self.__executor, extract_pages, source, start, stop
+                    ),
+                )
+            )
+
+        for _ in range(self.__prefetch_tasks):
+            submit()
 
-    text = ""
-    for page in doc:
-        text += page.get_text()
+        try:
+            while pending:
+                start, future = pending.popleft()
+                texts = await future
+                submit()
 
-    return text
+                for offset, text in enumerate(texts):
+                    yield Page(number=start + offset + 1, text=text)
+        finally:
+            for _, future in pending:
+                future.cancel()
@@ -0,0 +1,95 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Tuple
+import re
+
+
+_BYTES_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class ErrUnsatisfiable(Exception):
+    pass
+
+
+def parse_range(header: str, size: int) -> Tuple[int, int] | None:
+    """
+    Parses a single-range HTTP `Range` header into an inclusive (start, end)
+    pair. Returns None when the header should be ignored (unsupported or
+    multiple ranges), in which case the whole resource is served.
+    """
+    match = _BYTES_RANGE.match(header.strip())
+    if match is None:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes.
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ErrUnsatisfiable("ranges: parse_range: empty suffix range")
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        raise ErrUnsatisfiable(
+            "ranges: parse_range: range {} not satisfiable for size {}".format(
+                header, size
+            )
+        )
+    return start, min(end, size - 1)
+
+
+def not_modified(
+    etag: str,
+    last_modified: datetime,
+    if_none_match: str | None,
+    if_modified_since: str | None,
+) -> bool:
+    """
+    Whether a conditional GET can be answered with 304. If-None-Match (weak
+    comparison) takes precedence over If-Modified-Since.
+    """
+    if if_none_match is not None:
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+
+    if if_modified_since is not None:
+        since = _parse_date(if_modified_since)
+        if since is None:
+            return False
+        return last_modified.replace(microsecond=0) <= since
+
+    return False
+
+
+def if_range_matches(if_range: str | None, etag: str, last_modified: datetime) -> bool:
+    """
+    Whether the Range header may be honoured: there is no If-Range, or it
+    names the current representation by strong ETag or by its exact
+    Last-Modified date.
+    """
+    if if_range is None:
+        return True
+
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        # Weak validators never match.
+        return if_range == etag
+
+    since = _parse_date(if_range)
+    return since is not None and last_modified.replace(microsecond=0) == since
+
+
+def _parse_date(value: str) -> datetime | None:
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        # "-0000" dates carry no zone; HTTP dates are always GMT.
+        date = date.replace(tzinfo=timezone.utc)
+    return date
@@ -0,0 +1,89 @@
+from typing import Awaitable, Callable, Protocol
+import hashlib
+
+
+Read = Callable[[int], Awaitable[bytes]]
+
+
+class AsyncReader(Protocol):
+    async def read(self, size: int = -1) -> bytes: ...
+
+
+class ErrTooLarge(Exception):
+    pass
+
+
+class ErrBadSignature(Exception):
+    pass
+
+
+class HashingReader:
+    """
+    Async reader that passes data through from `read` while counting bytes
+    and hashing them with SHA-256. Reading more than `max_size` bytes raises
+    ErrTooLarge.
+    """
+
+    def __init__(self, read: Read, max_size: int | None = None):
+        self.__read = read
+        self.__max_size = max_size
+        self.__size = 0
+        self.__hash = hashlib.sha256()
+
+    async def read(self, size: int = -1) -> bytes:
+        data = await self.__read(size)
+        self.__size += len(data)
+        if self.__max_size is not None and self.__size > self.__max_size:
+            raise ErrTooLarge(
+                "streams: read: more than {} bytes".format(self.__max_size)
+            )
+
+        self.__hash.update(data)
+        return data
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    def hexdigest(self) -> str:
+        return self.__hash.hexdigest()
+
+
+class SignatureReader:
+    """
+    Async reader that passes data through from `read` after checking that
+    the stream starts with `signature` (e.g. a file format's magic bytes).
+    A mismatch raises ErrBadSignature before any data is returned.
+    """
+
+    def __init__(self, read: Read, signature: bytes):
+        self.__read = read
+        self.__signature = signature
+        self.__head: bytes | None = None
+
+    async def read(self, size: int = -1) -> bytes:
+        if self.__head is None:
+            self.__head = await self.__read_head(size)
+
+        if self.__head:
+            if size < 0:
+                data, self.__head = self.__head + await self.__read(-1), b""
+                return data
+            data, self.__head = self.__head[:size], self.__head[size:]
+            return data
+
+        return await self.__read(size)
+
+    async def __read_head(self, size: int) -> bytes:
+        head = b""
+        while len(head) < len(self.__signature):
+            data = await self.__read(max(size, len(self.__signature) - len(head)))
+            if not data:
+                break
+            head += data
+
+        if not head.startswith(self.__signature):
+            raise ErrBadSignature(
+                "streams: read: stream does not start with {!r}".format(self.__signature)
+            )
+        return head
@@ -1,3 +1,175 @@
-def split_text_into_chunks(text: str, chunk_size: int = 2048) -> list:
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Tuple
+import math
+import re
+
+
+# Bump whenever the chunking algorithm changes so cached summaries are not reused.
+CHUNKER_VERSION = "2"
+
+# Cut points in order of preference: paragraph break, end of a sentence
+# that ends a line, end of a sentence, line break, any whitespace.
+_BOUNDARIES = [
+    re.compile(r"\n\s*\n"),
+    re.compile(r"[.!?][\"')\]]?[ \t]*\n"),
+    re.compile(r"[.!?][\"')\]]?\s"),
+    re.compile(r"\n"),
+    re.compile(r"\s"),
+]
+_WHITESPACE = _BOUNDARIES[-1]
+
+
+@dataclass
+class Chunk:
+    text: str
+    start_page: int
+    end_page: int
+    start_offset: int
+    end_offset: int
+
+
+def estimate_tokens(text: str, chars_per_token: float = 4.0) -> int:
+    """Cheap, tokenizer-free estimate of how many tokens a text costs."""
+    return math.ceil(len(text) / chars_per_token)
+
+
+class TextChunker:
+    """
+    Packs text into chunks of at most `max_tokens` (estimated), cutting at
+    the most natural boundary available in the second half of the budget.
+    Consecutive chunks share roughly `overlap_tokens` of text.
+
+    Text can be fed page by page; full chunks are returned as soon as they
+    are available. Offsets refer to the concatenation of all fed text.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 1024,
+        overlap_tokens: int = 64,
+        chars_per_token: float = 4.0,
+    ):
+        self.__max_chars = max(1, int(max_tokens * chars_per_token))
+        self.__min_chars = self.__max_chars // 2
+        self.__overlap_chars = min(
+            int(overlap_tokens * chars_per_token), self.__min_chars
+        )
+        self.__fingerprint = "{}:{}:{}:{}".format(
+            CHUNKER_VERSION, max_tokens, overlap_tokens, chars_per_token
+        )
+
+        self.__buffer = ""
+        # Document offset of the first buffered character.
+        self.__offset = 0
+        # Buffer index where the next chunk starts; the text before it is
+        # dropped once per fed page rather than once per chunk.
+        self.__start = 0
+        # Document offset where the last emitted chunk ended.
+        self.__emitted = 0
+        self.__page_starts: List[int] = []
+        self.__page_numbers: List[int] = []
+
+    @property
+    def fingerprint(self) -> str:
+        """Identifies the chunking parameters, for cache keys."""
+        return self.__fingerprint
+
+    def feed(self, text: str, page_number: int = 1) -> List[Chunk]:
+        self.__page_starts.append(self.__offset + len(self.__buffer))
+        self.__page_numbers.append(page_number)
+        self.__buffer = self.__buffer[self.__start :] + text
+        self.__offset += self.__start
+        self.__start = 0
+
+        chunks = []
+        while len(self.__buffer) - self.__start > self.__max_chars:
+            chunks.append(self.__cut(self.__boundary()))
+        return chunks
+
+    def flush(self) -> List[Chunk]:
+        if self.__offset + len(self.__buffer) <= self.__emitted:
+            return []
+        if not self.__buffer[self.__start :].strip():
+            return []
+        return [self.__cut(len(self.__buffer))]
+
+    def __boundary(self) -> int:
+        """Buffer index to end the next chunk at."""
+        low = self.__start + self.__min_chars
+        end = self.__start + self.__max_chars
+        for pattern in _BOUNDARIES:
+            cut = -1
+            for match in pattern.finditer(self.__buffer, low, end + 1):
+                if match.end() <= end:
+                    cut = match.end()
+            if cut > low:
+                return cut
+        return end
+
+    def __cut(self, end: int) -> Chunk:
+        start = self.__start
+        start_offset = self.__offset + start
+        end_offset = self.__offset + end
+        chunk = Chunk(
+            text=self.__buffer[start:end],
+            start_page=self.__page_at(start_offset),
+            end_page=self.__page_at(end_offset - 1),
+            start_offset=start_offset,
+            end_offset=end_offset,
+        )
+        self.__emitted = end_offset
+
+        next_start = max(end - self.__overlap_chars, start + 1)
+        if next_start < end:
+            # Do not start the overlap in the middle of a word.
+            space = _WHITESPACE.search(self.__buffer, next_start, end)
+            next_start = space.end() if space is not None else end
+        self.__start = next_start
+        self.__forget_pages()
+
+        return chunk
+
+    def __page_at(self, offset: int) -> int:
+        index = max(bisect_right(self.__page_starts, offset) - 1, 0)
+        return self.__page_numbers[index]
+
+    def __forget_pages(self) -> None:
+        start_offset = self.__offset + self.__start
+        keep = max(bisect_right(self.__page_starts, start_offset) - 1, 0)
+        del self.__page_starts[:keep]
+        del self.__page_numbers[:keep]
+
+
+def split_text_into_chunks(
+    text: str,
+    max_tokens: int = 1024,
+    overlap_tokens: int = 64,
+    chars_per_token: float = 4.0,
+) -> List[Chunk]:
     """Split text into manageable chunks."""
-    return [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+    return list(
+        split_pages_into_chunks(
+            [(1, text)],
+            max_tokens=max_tokens,
+            overlap_tokens=overlap_tokens,
+            chars_per_token=chars_per_token,
+        )
+    )
+
+
+def split_pages_into_chunks(
+    pages: Iterable[Tuple[int, str]],
+    max_tokens: int = 1024,
+    overlap_tokens: int = 64,
+    chars_per_token: float = 4.0,
+) -> Iterator[Chunk]:
+    """Split a stream of (page number, text) pairs into chunks without joining them first."""
+    chunker = TextChunker(
+        max_tokens=max_tokens,
+        overlap_tokens=overlap_tokens,
+        chars_per_token=chars_per_token,
+    )
+    for number, text in pages:
+        yield from chunker.feed(text, page_number=number)
+    yield from chunker.flush()
@@ -5,18 +5,34 @@ from pgpt_python.client import PrivateGPTApi
 from miniopy_async import Minio
 
 from src.gears.db import DB
+from src.api.clients.scihub import SciHubApi
+from src.gears import pdf
+from src.gears.lru import LRUCache
+from src.gears.passwords import PasswordHasher
 from src.gears.logging.logging import setup_logger
 from src.config import config
 from src.storage.postgres.user_acct_storage import UserAcctStorage
 from src.storage.postgres.auth_token_storage import AuthTokenStorage
 from src.storage.postgres.file_mapping_storage import MappingStorage
 from src.storage.minio.file_storage import ArticleStorage
+from src.storage.cache.file_storage import CachedArticleStorage
 from src.storage.postgres.chat_storage import ChatStorage
 from src.storage.postgres.message_storage import MessageStorage
 from src.storage.postgres.summary_storage import SummaryStorage
+from src.storage.postgres.summary_cache_storage import SummaryCacheStorage
+from src.storage.postgres.job_storage import JobStorage
+from src.storage.postgres.doi_resolution_storage import DOIResolutionStorage
 from src.services.user_accts import UserAcctService
+from src.services.auth_token_reaper import AuthTokenReaper
 from src.services.auth_mailing import MailService as AuthMailService
 from src.services.documents import DocumentService
+from src.services.summarizer import MapReduceSummarizer
+from src.services.chat_history import ChatHistory
+from src.services.answer_cache import AnswerCache
+from src.services.jobs import JobService
+from src.services.doi_imports import DOIImportService
+from src.services import doi_imports
+from src.services import document_jobs
 
 config_path = os.getenv("RAI_CFG")
 if config_path is None:
@@ -28,7 +44,16 @@ pgpt_client = PrivateGPTApi(base_url=cfg.pgpt.url)
 
 logger = logging.getLogger("rai")
 
-db = DB(dsn=cfg.postgres.dsn, echo=False)
+db = DB(
+    dsn=cfg.postgres.dsn,
+    echo=False,
+    pool_size=cfg.postgres.pool_size,
+    max_overflow=cfg.postgres.max_overflow,
+    pool_timeout=cfg.postgres.pool_timeout,
+    pool_recycle=cfg.postgres.pool_recycle,
+    pool_pre_ping=cfg.postgres.pool_pre_ping,
+    statement_timeout=cfg.postgres.statement_timeout,
+)
 minio = Minio(
     endpoint=cfg.minio.dsn,
     access_key=cfg.minio.access_key,
@@ -40,15 +65,52 @@ minio = Minio(
 token_storage = AuthTokenStorage(db=db)
 user_storage = UserAcctStorage(db=db)
 mapping_storage = MappingStorage(db=db)
-article_storage = ArticleStorage(minio)
+article_storage = CachedArticleStorage(
+    storage=ArticleStorage(minio, part_size=cfg.uploads.part_size),
+    cache=LRUCache(max_bytes=cfg.cache.objects_max_bytes, ttl=cfg.cache.objects_ttl),
+    max_object_size=cfg.cache.object_max_size,
+)
 chat_storage = ChatStorage(db=db)
 message_storage = MessageStorage(db=db)
 summary_storage = SummaryStorage(db=db)
+summary_cache_storage = SummaryCacheStorage(db=db)
+job_storage = JobStorage(db=db)
+doi_resolution_storage = DOIResolutionStorage(db=db)
+
+text_cache = LRUCache(max_bytes=cfg.cache.text_max_bytes, ttl=cfg.cache.text_ttl)
+text_extractor = pdf.TextExtractor(
+    executor=pdf.new_executor(kind=cfg.pdf.executor, max_workers=cfg.pdf.max_workers),
+    pages_per_task=cfg.pdf.pages_per_task,
+    prefetch_tasks=cfg.pdf.prefetch_tasks,
+)
+
+password_hasher = PasswordHasher(
+    workers=cfg.passwords.workers,
+    max_queued=cfg.passwords.max_queued,
+    rounds=cfg.passwords.bcrypt_rounds,
+)
 
 user_acct_service = UserAcctService(
     user_storage=user_storage,
     token_storage=token_storage,
     config=cfg.auth,
+    token_cache=LRUCache(
+        max_bytes=cfg.auth.token_cache_max_bytes, ttl=cfg.auth.token_cache_ttl
+    ),
+    password_hasher=password_hasher,
+)
+auth_token_reaper = AuthTokenReaper(token_storage=token_storage, config=cfg.auth)
+answer_cache = AnswerCache(
+    max_bytes=cfg.cache.answers_max_bytes,
+    ttl=cfg.cache.answers_ttl,
+    max_answers=cfg.cache.answers_per_document,
+    similarity_threshold=cfg.cache.answers_similarity,
+)
+chat_history = ChatHistory(
+    chat_storage=chat_storage,
+    message_storage=message_storage,
+    gpt_api=pgpt_client,
+    config=cfg.chat,
 )
 document_service = DocumentService(
     mapping_storage=mapping_storage,
@@ -57,8 +119,31 @@ document_service = DocumentService(
     chat_storage=chat_storage,
     message_storage=message_storage,
     summary_storage=summary_storage,
+    summary_cache_storage=summary_cache_storage,
+    summarizer=MapReduceSummarizer(gpt_api=pgpt_client, config=cfg.summarizer),
+    text_extractor=text_extractor,
+    chunker_config=cfg.chunker,
+    upload_config=cfg.uploads,
+    text_cache=text_cache,
+    chat_history=chat_history,
+    answer_cache=answer_cache,
+    chat_config=cfg.chat,
 )
 
+job_service = JobService(job_storage=job_storage, config=cfg.jobs)
+document_job_handlers = document_jobs.DocumentJobs(document_service=document_service)
+job_service.register(document_jobs.SUMMARIZE, document_job_handlers.summarize)
+job_service.register(document_jobs.INGEST, document_job_handlers.ingest)
+
 auth_mail_service = AuthMailService(config=cfg.auth_mailer)
 
-summary_store = {}
+scihub_api = SciHubApi(config=cfg.scihub)
+doi_import_service = DOIImportService(
+    scihub_api=scihub_api,
+    document_service=document_service,
+    mapping_storage=mapping_storage,
+    resolution_storage=doi_resolution_storage,
+    job_service=job_service,
+    config=cfg.doi_imports,
+)
+job_service.register(doi_imports.IMPORT, doi_import_service.run_import)
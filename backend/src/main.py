@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 import sqlite3
 
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,7 +7,17 @@ import uvicorn
 
 from src.consts import DB_PATH
 from src.api.routers.main import router
-from src.init import logger, cfg
+from src.init import (
+    logger,
+    cfg,
+    job_service,
+    auth_token_reaper,
+    chat_history,
+    document_service,
+    text_extractor,
+    password_hasher,
+    scihub_api,
+)
 
 
 def init_db():
@@ -28,7 +39,22 @@ def init_db():
 init_db()
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await scihub_api.start()
+    await job_service.start()
+    await auth_token_reaper.start()
+    yield
+    await auth_token_reaper.stop()
+    await job_service.stop()
+    await document_service.stop()
+    await chat_history.stop()
+    text_extractor.shutdown()
+    password_hasher.shutdown()
+    await scihub_api.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
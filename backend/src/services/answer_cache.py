@@ -0,0 +1,183 @@
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+import math
+import re
+
+from src.gears.lru import LRUCache
+
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+# Words that flip a question's meaning; "t" is what is left of "n't".
+_NEGATIONS = frozenset(
+    ("no", "not", "never", "none", "nor", "neither", "nothing", "without", "cannot", "t")
+)
+
+
+@dataclass
+class CachedAnswer:
+    response: str
+    source: str
+    # How long generating the answer took, to report time saved by hits.
+    generation_seconds: float
+
+
+@dataclass
+class AnswerCacheStats:
+    entries: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    similar_hits: int
+    misses: int
+    hit_rate: float
+    saved_seconds: float
+
+
+@dataclass
+class _Answer:
+    answer: CachedAnswer
+    features: Counter
+    size: int
+
+
+@dataclass
+class _DocumentAnswers:
+    document_id: str
+    answers: "OrderedDict[str, _Answer]"
+    size: int
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Case, punctuation and spacing insensitive form of a question."""
+    prompt = _PUNCTUATION.sub(" ", prompt.lower())
+    return _WHITESPACE.sub(" ", prompt).strip()
+
+
+def features(key: str) -> Counter:
+    """
+    Word bigrams of a normalized question, with its first and last word
+    marked, so that reordered words change the vector. Negation words are
+    also kept as unigrams, for `similarity` to compare.
+    """
+    words = ["^"] + key.split() + ["$"]
+    bigrams = Counter(zip(words, words[1:]))
+    bigrams.update(word for word in words if word in _NEGATIONS)
+    return bigrams
+
+
+def similarity(a: Counter, b: Counter) -> float:
+    """
+    Cosine similarity of two `features` vectors; 0 when only one of the
+    questions is negated, or they use different negations.
+    """
+    if _negations(a) != _negations(b):
+        return 0.0
+    dot = sum(count * b[word] for word, count in a.items())
+    if dot == 0:
+        return 0.0
+    norm_a = math.sqrt(sum(count * count for count in a.values()))
+    norm_b = math.sqrt(sum(count * count for count in b.values()))
+    return dot / (norm_a * norm_b)
+
+
+def _negations(vector: Counter) -> Counter:
+    return Counter({word: vector[word] for word in _NEGATIONS if vector[word]})
+
+
+class AnswerCache:
+    """
+    Answers to opening questions about a document, grouped per ingested
+    file and valid only for the document_id they were generated from.
+    Questions match after normalization or, when `similarity_threshold` is
+    below 1, when the cosine similarity of their word bigrams reaches it. At most
+    `max_answers` answers are kept per document, least recently used first
+    out.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl: timedelta,
+        max_answers: int,
+        similarity_threshold: float,
+    ):
+        self.__cache: LRUCache[int, _DocumentAnswers] = LRUCache(
+            max_bytes=max_bytes, ttl=ttl
+        )
+        self.__max_answers = max(1, max_answers)
+        self.__threshold = similarity_threshold
+        self.__hits = 0
+        self.__similar_hits = 0
+        self.__misses = 0
+        self.__saved_seconds = 0.0
+
+    def get(self, file_id: int, document_id: str, prompt: str) -> CachedAnswer | None:
+        entry = self.__cache.get(file_id)
+        if entry is None or entry.document_id != document_id:
+            self.__misses += 1
+            return None
+
+        key = normalize_prompt(prompt)
+        if key not in entry.answers and self.__threshold < 1:
+            key = self.__most_similar(entry, features(key))
+            if key is not None:
+                self.__similar_hits += 1
+
+        if key not in entry.answers:
+            self.__misses += 1
+            return None
+
+        # Answers asked again are the last to be evicted.
+        entry.answers.move_to_end(key)
+        found = entry.answers[key]
+        self.__hits += 1
+        self.__saved_seconds += found.answer.generation_seconds
+        return found.answer
+
+    def put(self, file_id: int, document_id: str, prompt: str, answer: CachedAnswer) -> None:
+        entry = self.__cache.get(file_id)
+        if entry is None or entry.document_id != document_id:
+            entry = _DocumentAnswers(
+                document_id=document_id, answers=OrderedDict(), size=len(document_id)
+            )
+
+        key = normalize_prompt(prompt)
+        if key in entry.answers:
+            entry.size -= entry.answers.pop(key).size
+        size = len(key) + len(answer.response) + len(answer.source)
+        entry.answers[key] = _Answer(answer=answer, features=features(key), size=size)
+        entry.size += size
+
+        while len(entry.answers) > self.__max_answers:
+            _, oldest = entry.answers.popitem(last=False)
+            entry.size -= oldest.size
+
+        self.__cache.put(file_id, entry, size=entry.size)
+
+    def invalidate(self, file_id: int) -> None:
+        self.__cache.invalidate(file_id)
+
+    def stats(self) -> AnswerCacheStats:
+        cache = self.__cache.stats()
+        lookups = self.__hits + self.__misses
+        return AnswerCacheStats(
+            entries=cache.entries,
+            bytes=cache.bytes,
+            max_bytes=cache.max_bytes,
+            hits=self.__hits,
+            similar_hits=self.__similar_hits,
+            misses=self.__misses,
+            hit_rate=self.__hits / lookups if lookups else 0.0,
+            saved_seconds=self.__saved_seconds,
+        )
+
+    def __most_similar(self, entry: _DocumentAnswers, vector: Counter) -> str | None:
+        best = None
+        best_score = self.__threshold
+        for key, answer in entry.answers.items():
+            score = similarity(vector, answer.features)
+            if score >= best_score:
+                best, best_score = key, score
+        return best
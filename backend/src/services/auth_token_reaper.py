@@ -0,0 +1,55 @@
+from datetime import datetime
+import asyncio
+import logging
+
+import src.storage.auth_token_storage as token_storage
+from src.config.config import AuthSettings
+
+
+class AuthTokenReaper:
+    """
+    Periodically deletes expired session tokens in batches of
+    `reap_batch_size`, so auth_tokens (and the token index every request
+    probes) only holds live sessions.
+    """
+
+    def __init__(self, token_storage: token_storage.AuthTokenStorage, config: AuthSettings):
+        self.__token_storage = token_storage
+        self.__config = config
+        self.__task: asyncio.Task | None = None
+        self.__logger = logging.getLogger("rai").getChild("auth-token-reaper")
+
+    async def start(self) -> None:
+        self.__task = asyncio.create_task(self.__work())
+
+    async def stop(self) -> None:
+        if self.__task is None:
+            return
+        self.__task.cancel()
+        await asyncio.gather(self.__task, return_exceptions=True)
+        self.__task = None
+
+    async def reap(self) -> int:
+        """Deletes every token expired by now and returns how many were removed."""
+        now = datetime.utcnow()
+        deleted = 0
+        while True:
+            count = await self.__token_storage.delete_expired(
+                before=now, limit=self.__config.reap_batch_size
+            )
+            deleted += count
+            if count < self.__config.reap_batch_size:
+                return deleted
+            # Let other coroutines use the pool between batches.
+            await asyncio.sleep(0)
+
+    async def __work(self) -> None:
+        while True:
+            try:
+                deleted = await self.reap()
+                if deleted:
+                    self.__logger.info("deleted expired tokens: count = %d", deleted)
+            except Exception as e:
+                self.__logger.error("failed to delete expired tokens: %s", str(e))
+
+            await asyncio.sleep(self.__config.reap_interval.total_seconds())
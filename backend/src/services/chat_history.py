@@ -0,0 +1,195 @@
+from dataclasses import dataclass, field
+from typing import List, Set
+import asyncio
+import logging
+
+from pgpt_python.client import AsyncPrivateGPTApi
+
+import src.storage.chat_storage as chat_storage
+import src.storage.chat_storage_models as chat_storage_models
+import src.storage.message_storage as message_storage
+import src.storage.message_storage_models as message_storage_models
+from src.gears.strings import estimate_tokens
+from src.config.config import ChatSettings
+
+
+SUMMARY_MESSAGE = "Summary of the earlier conversation:\n{}"
+COMPACT_PROMPT = (
+    "Update the summary of a conversation about a document with the new "
+    "messages below. Keep facts, questions and conclusions; be concise.\n\n"
+    "Current summary:\n{}\n\nNew messages:\n{}"
+)
+
+
+@dataclass
+class Window:
+    chat_id: int | None
+    # Ready for chat_completion, ending with the new prompt.
+    messages: List[dict]
+    # Messages that no longer fit the window and are not summarized yet.
+    evicted: List[message_storage_models.GetResult] = field(default_factory=list)
+    summary: str | None = None
+
+
+class ErrInternal(Exception):
+    pass
+
+
+class ErrNotFound(Exception):
+    pass
+
+
+class ChatHistory:
+    """
+    Builds the message list sent with a chat turn: the latest messages of
+    the chat that fit in `history_max_tokens` (estimated), preceded by a
+    rolling summary of the older ones. Only the last `history_max_messages`
+    messages are ever loaded; when `rolling_summary` is on, messages that
+    fall out of the window are folded into the summary in the background.
+    """
+
+    def __init__(
+        self,
+        chat_storage: chat_storage.ChatStorage,
+        message_storage: message_storage.MessageStorage,
+        gpt_api: AsyncPrivateGPTApi,
+        config: ChatSettings,
+    ):
+        self.__chat_storage = chat_storage
+        self.__message_storage = message_storage
+        self.__api = gpt_api
+        self.__config = config
+        self.__tasks: Set[asyncio.Task] = set()
+        self.__compacting: Set[int] = set()
+        self.__logger = logging.getLogger("rai").getChild("chat-history")
+
+    async def window(self, file_id: int, chat_id: str | None, prompt: str) -> Window:
+        """
+        History of `chat_id` for a turn about `file_id`, which the caller
+        has checked belongs to the user; chats of other files are not found.
+        """
+        if not chat_id:
+            return Window(chat_id=None, messages=[self.__message("user", prompt)])
+
+        if not str(chat_id).isdecimal():
+            raise ErrNotFound(
+                "chat-history: window: not-found: chat_id = {}".format(chat_id)
+            )
+
+        try:
+            chat = await self.__chat_storage.get(int(chat_id))
+        except chat_storage.ErrNotFound as e:
+            raise ErrNotFound("chat-history: window: not-found: {}".format(str(e)))
+        except Exception as e:
+            raise ErrInternal("chat-history: window: internal: {}".format(str(e)))
+
+        if chat.file_id != file_id:
+            raise ErrNotFound(
+                "chat-history: window: not-found: chat_id = {}; file_id = {}".format(
+                    chat_id, file_id
+                )
+            )
+
+        try:
+            recent = await self.__message_storage.list_by_chat(
+                message_storage_models.ListBody(
+                    chat_id=chat.id, limit=self.__config.history_max_messages
+                )
+            )
+        except Exception as e:
+            raise ErrInternal("chat-history: window: internal: {}".format(str(e)))
+
+        # Newest first: keep messages until the budget runs out or the
+        # summary already covers them.
+        budget = self.__config.history_max_tokens - self.__tokens(prompt)
+        if chat.summary:
+            budget -= self.__tokens(chat.summary)
+
+        kept: List[message_storage_models.GetResult] = []
+        for message in recent:
+            if self.__summarized(chat, message):
+                break
+            cost = self.__tokens(message.content)
+            if cost > budget:
+                break
+            budget -= cost
+            kept.append(message)
+
+        # Do not open the window with an answer to a question that was cut.
+        if kept and kept[-1].role == "assistant":
+            kept.pop()
+
+        messages = []
+        if chat.summary:
+            messages.append(
+                self.__message("system", SUMMARY_MESSAGE.format(chat.summary))
+            )
+        messages.extend(
+            self.__message(message.role, message.content) for message in reversed(kept)
+        )
+        messages.append(self.__message("user", prompt))
+
+        evicted = [
+            message
+            for message in recent[len(kept) :]
+            if not self.__summarized(chat, message)
+        ]
+
+        return Window(
+            chat_id=chat.id,
+            messages=messages,
+            evicted=list(reversed(evicted)),
+            summary=chat.summary,
+        )
+
+    def compact_later(self, window: Window) -> None:
+        """Folds the evicted messages of `window` into the chat summary in the background."""
+        if not self.__config.rolling_summary or not window.evicted:
+            return
+        if window.chat_id in self.__compacting:
+            return
+
+        self.__compacting.add(window.chat_id)
+        task = asyncio.create_task(self.__compact(window))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def stop(self) -> None:
+        await asyncio.gather(*self.__tasks, return_exceptions=True)
+
+    async def __compact(self, window: Window) -> None:
+        transcript = "\n".join(
+            "{}: {}".format(message.role, message.content) for message in window.evicted
+        )
+        try:
+            response = await self.__api.contextual_completions.prompt_completion(
+                prompt=COMPACT_PROMPT.format(window.summary or "(none)", transcript)
+            )
+            message = response.choices[0].message
+            if message is None or not message.content:
+                return
+
+            await self.__chat_storage.update_summary(
+                chat_storage_models.UpdateSummaryBody(
+                    id=window.chat_id,
+                    summary=message.content,
+                    summary_until_id=window.evicted[-1].id,
+                )
+            )
+        except Exception as e:
+            self.__logger.error(
+                "failed to update chat summary: chat_id = %s: %s", window.chat_id, str(e)
+            )
+        finally:
+            self.__compacting.discard(window.chat_id)
+
+    def __summarized(
+        self, chat: chat_storage_models.GetResult, message: message_storage_models.GetResult
+    ) -> bool:
+        return chat.summary_until_id is not None and message.id <= chat.summary_until_id
+
+    def __tokens(self, text: str) -> int:
+        return estimate_tokens(text, self.__config.chars_per_token)
+
+    def __message(self, role: str, content: str) -> dict:
+        return {"role": role, "content": content}
@@ -0,0 +1,46 @@
+from src.services.documents import DocumentService
+from src.services import documents
+from src.services.jobs import ErrPermanent, ProgressReporter
+import src.storage.job_storage_models as job_storage_models
+
+
+SUMMARIZE = "summarize"
+INGEST = "ingest"
+
+# Document errors that fail the same way on every attempt, including files
+# that do not belong to the job's user, which are not found.
+PERMANENT_ERRORS = (documents.ErrNotFound, documents.ErrEmptyPDF)
+
+
+class DocumentJobs:
+    """Job handlers that run DocumentService work on the job queue."""
+
+    def __init__(self, document_service: DocumentService):
+        self.__document_service = document_service
+
+    async def summarize(
+        self, job: job_storage_models.GetResult, report_progress: ProgressReporter
+    ) -> dict:
+        try:
+            result = await self.__document_service.summarize(
+                user_id=job.user_id,
+                id=job.payload["file_id"],
+                on_progress=report_progress,
+            )
+        except PERMANENT_ERRORS as e:
+            raise ErrPermanent(str(e))
+        return {"summary_id": result.summary_id}
+
+    async def ingest(
+        self, job: job_storage_models.GetResult, report_progress: ProgressReporter
+    ) -> dict:
+        await report_progress(0, 1)
+        try:
+            result = await self.__document_service.save_ingest(
+                user_id=job.user_id,
+                id=job.payload["file_id"],
+            )
+        except PERMANENT_ERRORS as e:
+            raise ErrPermanent(str(e))
+        await report_progress(1, 1)
+        return {"ingested_id": result.id}
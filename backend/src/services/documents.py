@@ -1,5 +1,11 @@
 from dataclasses import dataclass
+from datetime import datetime
 from io import BytesIO
+from typing import AsyncIterator, Awaitable, Callable, List, Set
+import asyncio
+import hashlib
+import logging
+import time
 
 from pgpt_python.client import AsyncPrivateGPTApi
 
@@ -11,26 +17,49 @@ from src.storage import (
     file_mapping_storage,
     chat_storage,
     message_storage,
-    summary_storage,
     chat_storage_models,
+    summary_storage,
+    summary_cache_storage,
     message_storage_models,
     summary_storage_models,
+    summary_cache_storage_models,
 )
 from src.storage.file_storage import ArticleStorage
-from src.gears import pdf, strings
+from src.gears import pdf, strings, streams, cursors
+from src.gears.lru import LRUCache
+from src.services.summarizer import MapReduceSummarizer, PROMPT_VERSION
+from src.services.chat_history import ChatHistory, Window
+from src.services import chat_history
+from src.services.answer_cache import AnswerCache, CachedAnswer
+from src.config.config import ChunkerSettings, UploadSettings, ChatSettings
 
 
 @dataclass
-class UploadBody:
+class UploadStreamBody:
+    user_id: int
+    filename: str
+    read: streams.Read
+    content_type: str
+    doi: str | None = None
+
+
+@dataclass
+class CopyBody:
+    source_user_id: int
+    source_id: int
     user_id: int
     filename: str
-    contents: bytes
     content_type: str
+    content_hash: str
+    size: int
+    doi: str | None = None
 
 
 @dataclass
-class UploadResult:
+class UploadStreamResult:
     id: int
+    size: int
+    content_hash: str
 
 
 @dataclass
@@ -43,12 +72,60 @@ class DownloadResult:
     contents: bytes
 
 
+@dataclass
+class FileInfoResult:
+    size: int
+    etag: str
+    last_modified: datetime
+
+
+@dataclass
+class MultiChatResult:
+    response: str
+    sources: List[str]
+
+
+@dataclass
+class ChatDelta:
+    content: str
+
+
 @dataclass
 class ChatResult:
     response: str
     source: str
     chat_id: str
-    message_id: str
+    message_id: int
+
+
+@dataclass
+class MessageInfo:
+    id: int
+    role: str
+    content: str
+    created_at: datetime
+
+
+@dataclass
+class MessagePage:
+    # Oldest first; next_cursor pages further back in time.
+    messages: List[MessageInfo]
+    next_cursor: str | None
+
+
+@dataclass
+class ChatInfo:
+    id: int
+    title: str
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass
+class ChatPage:
+    # Newest first.
+    chats: List[ChatInfo]
+    next_cursor: str | None
 
 
 @dataclass
@@ -69,6 +146,22 @@ class ErrEmptyPDF(Exception):
     pass
 
 
+class ErrTooLarge(Exception):
+    pass
+
+
+class ErrInvalidContent(Exception):
+    pass
+
+
+class ErrInvalidCursor(Exception):
+    pass
+
+
+class ErrTooManyDocuments(Exception):
+    pass
+
+
 class DocumentService:
     def __init__(
         self,
@@ -78,6 +171,15 @@ class DocumentService:
         chat_storage: chat_storage.ChatStorage,
         message_storage: message_storage.MessageStorage,
         summary_storage: summary_storage.SummaryStorage,
+        summary_cache_storage: summary_cache_storage.SummaryCacheStorage,
+        summarizer: MapReduceSummarizer,
+        text_extractor: pdf.TextExtractor,
+        chunker_config: ChunkerSettings,
+        upload_config: UploadSettings,
+        text_cache: LRUCache,
+        chat_history: ChatHistory,
+        answer_cache: AnswerCache,
+        chat_config: ChatSettings,
     ):
         self.article_storage = article_storage
         self.mapping_storage = mapping_storage
@@ -85,28 +187,121 @@ class DocumentService:
         self.chat_storage = chat_storage
         self.message_storage = message_storage
         self.summary_storage = summary_storage
-
-    async def upload(self, body: UploadBody) -> UploadResult:
+        self.summary_cache_storage = summary_cache_storage
+        self.summarizer = summarizer
+        self.text_extractor = text_extractor
+        self.chunker_config = chunker_config
+        self.upload_config = upload_config
+        self.text_cache = text_cache
+        self.chat_history = chat_history
+        self.answer_cache = answer_cache
+        self.chat_config = chat_config
+        self.__logger = logging.getLogger("rai").getChild("documents")
+        self.__tasks: Set[asyncio.Task] = set()
+
+    async def upload_stream(self, body: UploadStreamBody) -> UploadStreamResult:
+        """
+        Streams the file into storage without holding it in memory; size and
+        content hash are computed on the fly.
+        """
         try:
             upload_map_result = await self.mapping_storage.create(
                 body=file_mapping_storage_models.CreateBody(
                     user_id=body.user_id,
                     filename=body.filename,
                     content_type=body.content_type,
+                    doi=body.doi,
+                )
+            )
+        except Exception as e:
+            raise ErrInternal(
+                "document-service: upload_stream: failed to create mapping: internal: {}".format(
+                    str(e)
                 )
             )
 
-            await self.article_storage.upload(
-                file_storage_models.UploadBody(
+        reader = streams.HashingReader(
+            read=body.read, max_size=self.upload_config.max_size
+        )
+        try:
+            await self.article_storage.upload_stream(
+                file_storage_models.UploadStreamBody(
                     user_id=body.user_id,
                     id=upload_map_result.id,
-                    contents=body.contents,
+                    stream=reader,
+                    content_type=body.content_type,
                 )
             )
+            await self.mapping_storage.set_content_hash(
+                id=upload_map_result.id, content_hash=reader.hexdigest()
+            )
         except Exception as e:
-            raise ErrInternal("document-service: upload: internal: {}".format(str(e)))
+            await self.__discard_mapping(upload_map_result.id)
+            if isinstance(e, streams.ErrTooLarge):
+                raise ErrTooLarge(
+                    "document-service: upload_stream: too-large: {}".format(str(e))
+                )
+            if isinstance(e, streams.ErrBadSignature):
+                raise ErrInvalidContent(
+                    "document-service: upload_stream: invalid-content: {}".format(str(e))
+                )
+            raise ErrInternal(
+                "document-service: upload_stream: internal: {}".format(str(e))
+            )
+
+        return UploadStreamResult(
+            id=upload_map_result.id,
+            size=reader.size,
+            content_hash=reader.hexdigest(),
+        )
+
+    async def copy(self, body: CopyBody) -> UploadStreamResult:
+        """
+        Adds a copy of another stored file (possibly another user's) to
+        the user's files, copying the object inside storage.
+        """
+        try:
+            mapping = await self.mapping_storage.create(
+                body=file_mapping_storage_models.CreateBody(
+                    user_id=body.user_id,
+                    filename=body.filename,
+                    content_type=body.content_type,
+                    content_hash=body.content_hash,
+                    doi=body.doi,
+                )
+            )
+        except Exception as e:
+            raise ErrInternal(
+                "document-service: copy: failed to create mapping: internal: {}".format(
+                    str(e)
+                )
+            )
+
+        try:
+            await self.article_storage.copy(
+                file_storage_models.CopyBody(
+                    source_user_id=body.source_user_id,
+                    source_id=body.source_id,
+                    user_id=body.user_id,
+                    id=mapping.id,
+                )
+            )
+        except Exception as e:
+            await self.__discard_mapping(mapping.id)
+            if isinstance(e, file_storage.ErrNotFound):
+                raise ErrNotFound("document-service: copy: not-found: {}".format(str(e)))
+            raise ErrInternal("document-service: copy: internal: {}".format(str(e)))
+
+        return UploadStreamResult(
+            id=mapping.id, size=body.size, content_hash=body.content_hash
+        )
 
-        return UploadResult(id=upload_map_result.id)
+    async def __discard_mapping(self, id: int) -> None:
+        try:
+            await self.mapping_storage.delete(id)
+        except Exception:
+            # The mapping only points at a missing object; nothing else to undo.
+            pass
 
     async def download(self, user_id: int, id: int) -> DownloadResult:
         try:
@@ -120,10 +315,34 @@ class DocumentService:
 
         return DownloadResult(contents=result.contents)
 
+    async def file_info(self, user_id: int, id: int) -> FileInfoResult:
+        try:
+            result = await self.article_storage.stat(user_id=user_id, id=id)
+        except file_storage.ErrNotFound as e:
+            raise ErrNotFound(
+                "document-service: file_info: not-found: {}".format(str(e))
+            )
+        except Exception as e:
+            raise ErrInternal("document-service: file_info: internal: {}".format(str(e)))
+
+        return FileInfoResult(
+            size=result.size,
+            etag=result.etag,
+            last_modified=result.last_modified,
+        )
+
+    def stream(
+        self, user_id: int, id: int, offset: int = 0, length: int = 0
+    ) -> AsyncIterator[bytes]:
+        """Streams a stored file; `length` of 0 means up to the end."""
+        return self.article_storage.stream(
+            user_id=user_id, id=id, offset=offset, length=length
+        )
+
     async def save_ingest(self, user_id: int, id: int) -> IngestResult:
         try:
             result = await self.article_storage.download_file(user_id=user_id, id=id)
-        except file_storage.ErrNotFound:
+        except file_storage.ErrNotFound as e:
             raise ErrNotFound(
                 "document-service: save_ingest: failed to download article: not-found: {}".format(
                     str(e)
@@ -139,7 +358,7 @@ class DocumentService:
         try:
             doc_id = await self.__ingest(result.contents)
         except Exception as e:
-            print("eheh")
+            self.__logger.error("failed to ingest article: id = %d: %s", id, str(e))
             raise ErrInternal(
                 "document-service: save_ingest: failed to ingest article: internal: {}".format(
                     str(e)
@@ -164,99 +383,483 @@ class DocumentService:
                 )
             )
 
+        # Answers generated from an earlier ingestion of this file are stale.
+        self.answer_cache.invalidate(id)
+
         return IngestResult(id=ingested_result.id)
 
-    async def chat(self, id: int, prompt: str, chat_id: str = None) -> ChatResult:
+    async def chat(
+        self, user_id: int, id: int, prompt: str, chat_id: str = None
+    ) -> ChatResult:
+        ingested = await self.__check_ingested_owner("chat", user_id, id)
+
+        window = await self.__chat_window("chat", id, chat_id, prompt)
+        cached = self.__cached_answer(window, ingested, prompt)
+
         try:
-            ingested = await self.mapping_storage.get_ingested(id)
+            if cached is not None:
+                response, source = cached.response, cached.source
+            else:
+                started = time.monotonic()
+                completion = await self.api.contextual_completions.chat_completion(
+                    messages=window.messages,
+                    use_context=True,
+                    context_filter={"docs_ids": [ingested.document_id]},
+                    include_sources=True,
+                )
+
+                result = completion.choices[0]
+                response = result.message.content
+                source = result.sources[0].document.doc_metadata["file_name"]
+                self.__cache_answer(
+                    window, ingested, prompt, response, source, time.monotonic() - started
+                )
+
+            chat_id, message_id = await self.__save_turn(
+                id=id,
+                chat_id=chat_id,
+                prompt=prompt,
+                response=response,
+            )
+        except Exception as e:
+            raise ErrInternal(f"document-service: chat: failed to process chat: internal: {str(e)}")
+
+        self.chat_history.compact_later(window)
+
+        return ChatResult(
+            response=response,
+            source=source,
+            chat_id=chat_id,
+            message_id=message_id
+        )
+
+    async def chat_stream(
+        self, user_id: int, id: int, prompt: str, chat_id: str = None
+    ) -> AsyncIterator[ChatDelta | ChatResult]:
+        """
+        Yields a ChatDelta per generated piece of the answer and, once the
+        completion is finished and persisted, a final ChatResult. When the
+        client goes away mid-stream, the prompt and the partial answer are
+        saved in the background.
+        """
+        ingested = await self.__check_ingested_owner("chat_stream", user_id, id)
+
+        window = await self.__chat_window("chat_stream", id, chat_id, prompt)
+        cached = self.__cached_answer(window, ingested, prompt)
+
+        parts = []
+        try:
+            if cached is not None:
+                source = cached.source
+                parts.append(cached.response)
+                yield ChatDelta(content=cached.response)
+            else:
+                source = ""
+                started = time.monotonic()
+                try:
+                    stream = self.api.contextual_completions.chat_completion_stream(
+                        messages=window.messages,
+                        use_context=True,
+                        context_filter={"docs_ids": [ingested.document_id]},
+                        include_sources=True,
+                    )
+                    async for chunk in stream:
+                        choice = chunk.choices[0]
+                        if not source and choice.sources:
+                            source = choice.sources[0].document.doc_metadata["file_name"]
+                        if choice.delta is not None and choice.delta.content:
+                            parts.append(choice.delta.content)
+                            yield ChatDelta(content=choice.delta.content)
+                except Exception as e:
+                    raise ErrInternal(f"document-service: chat_stream: failed to stream completion: internal: {str(e)}")
+        except (GeneratorExit, asyncio.CancelledError):
+            # The client went away; awaiting here could be cancelled again,
+            # so the turn is saved in the background.
+            self.__save_turn_later(id, chat_id, prompt, "".join(parts))
+            raise
+
+        response = "".join(parts)
+        if cached is None:
+            self.__cache_answer(
+                window, ingested, prompt, response, source, time.monotonic() - started
+            )
+
+        # Shielded so that a client leaving now does not abort the save.
+        save = self.__in_background(
+            self.__save_turn(id=id, chat_id=chat_id, prompt=prompt, response=response)
+        )
+        try:
+            chat_id, message_id = await asyncio.shield(save)
+        except Exception as e:
+            raise ErrInternal(f"document-service: chat_stream: failed to save chat: internal: {str(e)}")
+
+        self.chat_history.compact_later(window)
+
+        yield ChatResult(
+            response=response,
+            source=source,
+            chat_id=chat_id,
+            message_id=message_id,
+        )
+
+    async def chat_many(
+        self, user_id: int, ids: List[int] | None, prompt: str
+    ) -> MultiChatResult:
+        """
+        Answers `prompt` with one completion whose retrieval spans the given
+        ingested files of the user, or, when `ids` is None, their latest
+        `max_documents` files. A file ingested several times counts once.
+        The exchange is not saved, as chats belong to a single file.
+        """
+        try:
+            ingested = await self.mapping_storage.get_ingested_many(
+                user_id=user_id, ids=ids
+            )
         except Exception as e:
             raise ErrInternal(
-                f"document-service: chat: failed to get ingested doc with id = {id}: internal: {str(e)}"
+                "document-service: chat_many: failed to get ingested docs: internal: {}".format(
+                    str(e)
+                )
+            )
+
+        if ids is not None:
+            missing = set(ids) - {record.id for record in ingested}
+            if missing:
+                raise ErrNotFound(
+                    "document-service: chat_many: not-found: ids = {}".format(
+                        sorted(missing)
+                    )
+                )
+        # Newest first: keep the latest ingestion of each file and document.
+        seen_mappings, seen_documents = set(), set()
+        unique = []
+        for record in ingested:
+            if record.mapping_id in seen_mappings or record.document_id in seen_documents:
+                continue
+            seen_mappings.add(record.mapping_id)
+            seen_documents.add(record.document_id)
+            unique.append(record)
+        ingested = unique
+
+        if not ingested:
+            raise ErrNotFound("document-service: chat_many: not-found: no ingested files")
+        if ids is None:
+            ingested = ingested[: self.chat_config.max_documents]
+        elif len(ingested) > self.chat_config.max_documents:
+            raise ErrTooManyDocuments(
+                "document-service: chat_many: too many documents: {} > {}".format(
+                    len(ingested), self.chat_config.max_documents
+                )
             )
 
         try:
-            response = await self.api.contextual_completions.prompt_completion(
+            completion = await self.api.contextual_completions.prompt_completion(
                 prompt=prompt,
                 use_context=True,
-                context_filter={"docs_ids": [ingested.document_id]},
+                context_filter={"docs_ids": [record.document_id for record in ingested]},
                 include_sources=True,
             )
+        except Exception as e:
+            raise ErrInternal(
+                f"document-service: chat_many: failed to process chat: internal: {str(e)}"
+            )
 
-            result = response.choices[0]
+        result = completion.choices[0]
+        sources = []
+        for chunk in result.sources or []:
+            name = chunk.document.doc_metadata["file_name"]
+            if name not in sources:
+                sources.append(name)
 
-            # Create new chat if chat_id not provided
-            if not chat_id:
-                chat_result = await self.chat_storage.create(
-                    chat_storage_models.CreateBody(
-                        file_id=str(id),
-                        title=prompt[:50] + "..."  # Use first 50 chars of prompt as title
-                    )
-                )
-                chat_id = chat_result.id
+        return MultiChatResult(response=result.message.content, sources=sources)
 
-            # Save user message
-            await self.message_storage.create(
-                message_storage_models.CreateBody(
-                    chat_id=chat_id,
-                    content=prompt,
-                    role="user"
-                )
+    async def list_messages(
+        self, user_id: int, chat_id: int, limit: int, cursor: str | None = None
+    ) -> MessagePage:
+        """
+        Returns the latest `limit` messages of a chat, or the ones before
+        `cursor`, without loading the rest of the history.
+        """
+        before_created_at, before_id = self.__decode_cursor("list_messages", cursor)
+
+        try:
+            chat = await self.chat_storage.get(chat_id)
+        except chat_storage.ErrNotFound as e:
+            raise ErrNotFound(
+                "document-service: list_messages: not-found: {}".format(str(e))
+            )
+        except Exception as e:
+            raise ErrInternal(
+                "document-service: list_messages: internal: {}".format(str(e))
             )
+        await self.__check_ingested_owner("list_messages", user_id, chat.file_id)
 
-            # Save assistant message
-            message_result = await self.message_storage.create(
-                message_storage_models.CreateBody(
+        try:
+            messages = await self.message_storage.list_by_chat(
+                message_storage_models.ListBody(
                     chat_id=chat_id,
-                    content=result.message.content,
-                    role="assistant"
+                    limit=limit + 1,
+                    before_created_at=before_created_at,
+                    before_id=before_id,
                 )
             )
+        except Exception as e:
+            raise ErrInternal(
+                "document-service: list_messages: internal: {}".format(str(e))
+            )
 
+        next_cursor = None
+        if len(messages) > limit:
+            messages = messages[:limit]
+            next_cursor = cursors.encode(messages[-1].created_at, messages[-1].id)
+
+        return MessagePage(
+            messages=[
+                MessageInfo(
+                    id=message.id,
+                    role=message.role,
+                    content=message.content,
+                    created_at=message.created_at,
+                )
+                for message in reversed(messages)
+            ],
+            next_cursor=next_cursor,
+        )
+
+    async def list_chats(
+        self, user_id: int, id: int, limit: int, cursor: str | None = None
+    ) -> ChatPage:
+        """Returns the chats about ingested file `id`, newest first."""
+        before_created_at, before_id = self.__decode_cursor("list_chats", cursor)
+        await self.__check_ingested_owner("list_chats", user_id, id)
+
+        try:
+            chats = await self.chat_storage.list_by_file(
+                chat_storage_models.ListBody(
+                    file_id=id,
+                    limit=limit + 1,
+                    before_created_at=before_created_at,
+                    before_id=before_id,
+                )
+            )
         except Exception as e:
-            raise ErrInternal(f"document-service: chat: failed to process chat: internal: {str(e)}")
+            raise ErrInternal("document-service: list_chats: internal: {}".format(str(e)))
+
+        next_cursor = None
+        if len(chats) > limit:
+            chats = chats[:limit]
+            next_cursor = cursors.encode(chats[-1].created_at, chats[-1].id)
+
+        return ChatPage(
+            chats=[
+                ChatInfo(
+                    id=chat.id,
+                    title=chat.title,
+                    created_at=chat.created_at,
+                    updated_at=chat.updated_at,
+                )
+                for chat in chats
+            ],
+            next_cursor=next_cursor,
+        )
 
-        return ChatResult(
-            response=result.message.content,
-            source=result.sources[0].document.doc_metadata["file_name"],
-            chat_id=chat_id,
-            message_id=message_result.id
+    def __cached_answer(
+        self,
+        window: Window,
+        ingested: file_mapping_storage_models.GetIngestedResult,
+        prompt: str,
+    ) -> CachedAnswer | None:
+        # Answers only depend on the document for the first turn of a chat.
+        if window.chat_id is not None:
+            return None
+        return self.answer_cache.get(ingested.mapping_id, ingested.document_id, prompt)
+
+    def __cache_answer(
+        self,
+        window: Window,
+        ingested: file_mapping_storage_models.GetIngestedResult,
+        prompt: str,
+        response: str,
+        source: str,
+        generation_seconds: float,
+    ) -> None:
+        if window.chat_id is not None or not response:
+            return
+        self.answer_cache.put(
+            ingested.mapping_id,
+            ingested.document_id,
+            prompt,
+            CachedAnswer(
+                response=response,
+                source=source,
+                generation_seconds=generation_seconds,
+            ),
         )
 
-    async def summarize(self, id: int) -> SummarizeResult:
+    async def __chat_window(
+        self, op: str, id: int, chat_id: str | None, prompt: str
+    ) -> Window:
         try:
-            ingested = await self.mapping_storage.get_ingested(id)
+            return await self.chat_history.window(file_id=id, chat_id=chat_id, prompt=prompt)
+        except chat_history.ErrNotFound as e:
+            raise ErrNotFound("document-service: {}: not-found: {}".format(op, str(e)))
         except Exception as e:
             raise ErrInternal(
-                f"document-service: summarize: failed to get ingested doc with id = {id}: internal: {str(e)}"
+                "document-service: {}: failed to load chat history: internal: {}".format(
+                    op, str(e)
+                )
             )
 
-        downloaded = await self.article_storage.download_file(
-            user_id=ingested.user_id, id=ingested.id
+    def __decode_cursor(self, op: str, cursor: str | None) -> tuple:
+        if cursor is None:
+            return None, None
+        try:
+            return cursors.decode(cursor)
+        except cursors.ErrInvalidCursor as e:
+            raise ErrInvalidCursor("document-service: {}: {}".format(op, str(e)))
+
+    async def __check_ingested_owner(
+        self, op: str, user_id: int, id: int
+    ) -> file_mapping_storage_models.GetIngestedResult:
+        try:
+            ingested = await self.mapping_storage.get_ingested(id)
+        except file_mapping_storage.ErrNotFound as e:
+            raise ErrNotFound("document-service: {}: not-found: {}".format(op, str(e)))
+        except Exception as e:
+            raise ErrInternal("document-service: {}: internal: {}".format(op, str(e)))
+
+        if ingested.user_id != user_id:
+            raise ErrNotFound(
+                "document-service: {}: not-found: ingested id = {}".format(op, id)
+            )
+        return ingested
+
+    async def stop(self) -> None:
+        await asyncio.gather(*self.__tasks, return_exceptions=True)
+
+    def __in_background(self, coro: Awaitable) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+        return task
+
+    def __save_turn_later(
+        self, id: int, chat_id: str | None, prompt: str, response: str
+    ) -> None:
+        self.__in_background(
+            self.__save_interrupted_turn(id, chat_id, prompt, response)
         )
 
+    async def __save_interrupted_turn(
+        self, id: int, chat_id: str | None, prompt: str, response: str
+    ) -> None:
         try:
-            text = pdf.extract_text(pdf_contents=downloaded.contents)
-            if not text.strip():
-                raise ErrEmptyPDF("document-service: summarize: no contents in pdf")
+            await self.__save_turn(id=id, chat_id=chat_id, prompt=prompt, response=response)
+        except Exception as e:
+            self.__logger.error(
+                "failed to save interrupted chat turn: id = %d: %s", id, str(e)
+            )
 
-            chunks = strings.split_text_into_chunks(text=text)
+    async def __save_turn(
+        self, id: int, chat_id: str | None, prompt: str, response: str
+    ) -> tuple[str, int]:
+        result = await self.message_storage.create_turn(
+            message_storage_models.CreateTurnBody(
+                chat_id=chat_id,
+                file_id=id,
+                title=prompt[:50] + "...",  # Use first 50 chars of prompt as title
+                prompt=prompt,
+                response=response,
+            )
+        )
+
+        return str(result.chat_id), result.assistant_message_id
+
+    async def summarize(
+        self,
+        user_id: int,
+        id: int,
+        on_progress: Callable[[int, int], Awaitable[None]] | None = None,
+    ) -> SummarizeResult:
+        """
+        Summarizes the ingested file `id` of `user_id`; files of other users
+        are not found. `on_progress` is awaited with (chunks done, chunks
+        seen so far) as chunk summaries complete; it is not called when the
+        whole summary is cached.
+        """
+        try:
+            ingested = await self.mapping_storage.get_ingested(id)
+            mapping = await self.mapping_storage.get(ingested.mapping_id)
+        except file_mapping_storage.ErrNotFound as e:
+            raise ErrNotFound(
+                f"document-service: summarize: ingested doc with id = {id}: not-found: {str(e)}"
+            )
         except Exception as e:
             raise ErrInternal(
-                f"document-service: summarize: failed to extract text from pdf: internal: {str(e)}"
+                f"document-service: summarize: failed to get ingested doc with id = {id}: internal: {str(e)}"
             )
 
-        summaries = []
-        try:
-            for chunk in chunks:
-                response = await self.api.contextual_completions.prompt_completion(
-                    prompt=f"Summarize this document:\n{chunk}"
+        if ingested.user_id != user_id:
+            raise ErrNotFound(
+                f"document-service: summarize: ingested doc with id = {id}: not-found"
+            )
+
+        content_hash = mapping.content_hash
+        final_summary = None
+        if content_hash is not None:
+            final_summary = await self.__cached_summary(content_hash)
+
+        if final_summary is None:
+            try:
+                downloaded = await self.article_storage.download_file(
+                    user_id=ingested.user_id, id=ingested.mapping_id
+                )
+            except file_storage.ErrNotFound as e:
+                raise ErrNotFound(
+                    f"document-service: summarize: failed to download article: not-found: {str(e)}"
+                )
+            except Exception as e:
+                raise ErrInternal(
+                    f"document-service: summarize: failed to download article: internal: {str(e)}"
                 )
 
-                if response.choices[0].message is not None:
-                    summaries.append(response.choices[0].message.content)
+            if content_hash is None:
+                # Files uploaded before content hashing get theirs on first use.
+                content_hash = hashlib.sha256(downloaded.contents).hexdigest()
+                try:
+                    await self.mapping_storage.set_content_hash(
+                        id=ingested.mapping_id, content_hash=content_hash
+                    )
+                except Exception as e:
+                    raise ErrInternal(
+                        f"document-service: summarize: failed to save content hash: internal: {str(e)}"
+                    )
+                final_summary = await self.__cached_summary(content_hash)
 
-            final_summary = " ".join(summaries)
+        if final_summary is None:
+            try:
+                final_summary = await self.__summarize_pages(
+                    self.__iter_pages(content_hash, downloaded.contents), on_progress
+                )
+            except ErrEmptyPDF:
+                raise
+            except Exception as e:
+                raise ErrInternal(f"document-service: summarize: failed to process summary: internal: {str(e)}")
+
+            try:
+                await self.summary_cache_storage.create_many(
+                    [
+                        summary_cache_storage_models.CreateBody(
+                            key=self.__final_cache_key(content_hash),
+                            kind="final",
+                            content=final_summary,
+                        )
+                    ]
+                )
+            except Exception as e:
+                raise ErrInternal(f"document-service: summarize: failed to cache summary: internal: {str(e)}")
 
+        try:
             # Save the summary
             summary_result = await self.summary_storage.create(
                 summary_storage_models.CreateBody(
@@ -264,12 +867,125 @@ class DocumentService:
                     content=final_summary
                 )
             )
-
         except Exception as e:
-            raise ErrInternal(f"document-service: summarize: failed to process summary: internal: {str(e)}")
+            raise ErrInternal(f"document-service: summarize: failed to save summary: internal: {str(e)}")
 
         return SummarizeResult(summary=final_summary, summary_id=summary_result.id)
 
+    async def __summarize_pages(
+        self,
+        pages: AsyncIterator[pdf.Page],
+        on_progress: Callable[[int, int], Awaitable[None]] | None,
+    ) -> str:
+        # Chunks are summarized while later pages are still being extracted,
+        # so the total grows until extraction finishes.
+        total = 0
+        done = 0
+
+        async def chunks() -> AsyncIterator[str]:
+            nonlocal total
+            chunker = self.__new_chunker()
+            async for page in pages:
+                for chunk in chunker.feed(page.text, page_number=page.number):
+                    if chunk.text.strip():
+                        total += 1
+                        yield chunk.text
+            for chunk in chunker.flush():
+                if chunk.text.strip():
+                    total += 1
+                    yield chunk.text
+
+        async def report() -> None:
+            nonlocal done
+            done += 1
+            if on_progress is not None:
+                await on_progress(done, total)
+
+        async def lookup(chunk: str) -> str | None:
+            try:
+                entry = await self.summary_cache_storage.get(
+                    self.__chunk_cache_key(chunk)
+                )
+            except summary_cache_storage.ErrNotFound:
+                return None
+
+            await report()
+            return entry.content
+
+        async def on_summarized(chunk: str, summary: str) -> None:
+            if summary:
+                await self.summary_cache_storage.create_many(
+                    [
+                        summary_cache_storage_models.CreateBody(
+                            key=self.__chunk_cache_key(chunk),
+                            kind="chunk",
+                            content=summary,
+                        )
+                    ]
+                )
+            await report()
+
+        summaries = await self.summarizer.summarize_chunks(
+            chunks(), lookup=lookup, on_summarized=on_summarized
+        )
+        if not summaries:
+            raise ErrEmptyPDF("document-service: summarize: no contents in pdf")
+
+        return await self.summarizer.reduce(summaries)
+
+    async def __iter_pages(
+        self, content_hash: str, contents: bytes
+    ) -> AsyncIterator[pdf.Page]:
+        # Extracted text is cached by content hash, so identical uploads and
+        # re-summarization with new chunking or prompts skip extraction.
+        cached = self.text_cache.get(content_hash)
+        if cached is not None:
+            for page in cached:
+                yield page
+            return
+
+        pages = []
+        async for page in self.text_extractor.iter_pages(contents):
+            pages.append(page)
+            yield page
+
+        self.text_cache.put(
+            content_hash, pages, size=sum(len(page.text) for page in pages)
+        )
+
+    async def __cached_summary(self, content_hash: str) -> str | None:
+        try:
+            entry = await self.summary_cache_storage.get(
+                self.__final_cache_key(content_hash)
+            )
+        except summary_cache_storage.ErrNotFound:
+            return None
+        except Exception as e:
+            raise ErrInternal(
+                f"document-service: summarize: failed to read summary cache: internal: {str(e)}"
+            )
+
+        return entry.content
+
+    def __new_chunker(self) -> strings.TextChunker:
+        return strings.TextChunker(
+            max_tokens=self.chunker_config.max_tokens,
+            overlap_tokens=self.chunker_config.overlap_tokens,
+            chars_per_token=self.chunker_config.chars_per_token,
+        )
+
+    def __final_cache_key(self, content_hash: str) -> str:
+        return hashlib.sha256(
+            "final:{}:{}:{}".format(
+                self.__new_chunker().fingerprint, PROMPT_VERSION, content_hash
+            ).encode()
+        ).hexdigest()
+
+    def __chunk_cache_key(self, chunk: str) -> str:
+        return hashlib.sha256(
+            "chunk:{}:{}".format(PROMPT_VERSION, chunk).encode()
+        ).hexdigest()
+
     async def __ingest(self, data: bytes) -> str:
         doc_id = (
             await self.api.ingestion.ingest_file(file=BytesIO(data), timeout=500)
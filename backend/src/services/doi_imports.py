@@ -0,0 +1,311 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Sequence
+from urllib.parse import urljoin
+import asyncio
+import logging
+import re
+
+import src.storage.doi_resolution_storage as doi_resolution_storage
+import src.storage.doi_resolution_storage_models as doi_resolution_storage_models
+import src.storage.file_mapping_storage as file_mapping_storage
+from src.api.clients import scihub
+from src.api.clients.scihub import SciHubApi
+from src.config.config import DOIImportSettings
+from src.gears import landing_pages, pdf, streams
+from src.services import document_jobs, documents
+from src.services.documents import (
+    CopyBody,
+    DocumentService,
+    UploadStreamBody,
+    UploadStreamResult,
+)
+from src.services.jobs import ErrPermanent, JobService, ProgressReporter
+import src.storage.job_storage_models as job_storage_models
+
+
+IMPORT = "import_doi"
+
+
+# Statuses of a DOI in a batch import.
+EXISTING = "existing"
+QUEUED = "queued"
+INVALID = "invalid"
+
+_DOI_PREFIX = re.compile(r"^(https?://(dx\.)?doi\.org/|doi:)", re.IGNORECASE)
+_DOI = re.compile(r"^10\.\d{4,9}/\S+$")
+
+
+@dataclass
+class ImportItem:
+    doi: str
+    status: str
+    file_id: int | None = None
+    job_id: int | None = None
+    error: str | None = None
+
+
+class ErrInternal(Exception):
+    pass
+
+
+class ErrNotFound(Exception):
+    pass
+
+
+class ErrNotPDF(Exception):
+    pass
+
+
+class ErrTooLarge(Exception):
+    pass
+
+
+class ErrTooManyDOIs(Exception):
+    pass
+
+
+def normalize_doi(doi: str) -> str | None:
+    """Bare lowercase DOI, or None when `doi` does not look like one."""
+    doi = _DOI_PREFIX.sub("", doi.strip()).strip()
+    if not _DOI.match(doi):
+        return None
+    return doi.lower()
+
+
+class DOIImportService:
+    """
+    Downloads papers by DOI from Sci-Hub into a user's files. Batches are
+    deduplicated, skip DOIs the user already imported and are downloaded by
+    IMPORT jobs on the job queue, one per DOI, which then queue ingestion.
+    At most `max_concurrency` of those jobs resolve and download at a time,
+    across all batches.
+
+    Resolutions are remembered for `resolution_ttl`: a DOI imported before
+    (by any user) is copied from the stored PDF inside object storage, or
+    downloaded from its known PDF URL, without fetching the landing page.
+    DOIs without a PDF are remembered for `not_found_ttl`.
+    """
+
+    def __init__(
+        self,
+        scihub_api: SciHubApi,
+        document_service: DocumentService,
+        mapping_storage: file_mapping_storage.MappingStorage,
+        resolution_storage: doi_resolution_storage.DOIResolutionStorage,
+        job_service: JobService,
+        config: DOIImportSettings,
+        extractors: Sequence[landing_pages.Extractor] = landing_pages.EXTRACTORS,
+    ):
+        self.__api = scihub_api
+        self.__documents = document_service
+        self.__mapping_storage = mapping_storage
+        self.__resolution_storage = resolution_storage
+        self.__jobs = job_service
+        self.__config = config
+        self.__extractors = extractors
+        self.__logger = logging.getLogger("rai").getChild("doi-imports")
+        self.__semaphore = asyncio.Semaphore(max(1, config.max_concurrency))
+
+    async def download(self, user_id: int, doi: str) -> UploadStreamResult:
+        doi = normalize_doi(doi) or doi.strip()
+
+        resolution = await self.__cached_resolution(doi)
+        if resolution is not None:
+            if resolution.status == doi_resolution_storage_models.NOT_FOUND:
+                raise ErrNotFound(
+                    "doi-import: download: not-found (cached): {}".format(doi)
+                )
+
+            copied = await self.__copy(user_id, resolution)
+            if copied is not None:
+                return copied
+
+            if resolution.pdf_url:
+                try:
+                    return await self.__fetch(user_id, doi, resolution.pdf_url)
+                except ErrTooLarge:
+                    raise
+                except Exception as e:
+                    # The mirror may have moved the file; resolve it again.
+                    self.__logger.info("cached pdf url failed: %s: %s", doi, str(e))
+
+        pdf_url = await self.__resolve(doi)
+        return await self.__fetch(user_id, doi, pdf_url)
+
+    async def import_many(self, user_id: int, dois: List[str]) -> List[ImportItem]:
+        """
+        Queues an IMPORT job for every new DOI in `dois`. Results are in
+        request order, one per DOI as given; repeats share the first result.
+        """
+        if len(dois) > self.__config.max_batch:
+            raise ErrTooManyDOIs(
+                "doi-import: import_many: too-many: {} > {}".format(
+                    len(dois), self.__config.max_batch
+                )
+            )
+
+        normalized = [normalize_doi(doi) for doi in dois]
+        unique = list(dict.fromkeys(doi for doi in normalized if doi is not None))
+
+        try:
+            existing = await self.__mapping_storage.list_by_dois(user_id, unique)
+        except Exception as e:
+            raise ErrInternal("doi-import: import_many: internal: {}".format(str(e)))
+
+        results: Dict[str, ImportItem] = {}
+        for mapping in existing:
+            # Newest first, so a repeated import keeps the latest file.
+            if mapping.doi not in results:
+                results[mapping.doi] = ImportItem(
+                    doi=mapping.doi, status=EXISTING, file_id=mapping.id
+                )
+
+        new = [doi for doi in unique if doi not in results]
+        try:
+            jobs = await self.__jobs.enqueue_many(
+                user_id=user_id, kind=IMPORT, payloads=[{"doi": doi} for doi in new]
+            )
+        except Exception as e:
+            raise ErrInternal("doi-import: import_many: internal: {}".format(str(e)))
+
+        for doi, job in zip(new, jobs):
+            results[doi] = ImportItem(doi=doi, status=QUEUED, job_id=job.id)
+
+        return [
+            results[doi]
+            if doi is not None
+            else ImportItem(doi=given, status=INVALID, error="not a DOI")
+            for given, doi in zip(dois, normalized)
+        ]
+
+    async def run_import(
+        self, job: job_storage_models.GetResult, report_progress: ProgressReporter
+    ) -> dict:
+        """IMPORT job handler: downloads the paper and queues its ingestion."""
+        doi = job.payload["doi"]
+        await report_progress(0, 1)
+
+        # A retried job may have downloaded the paper already.
+        existing = await self.__mapping_storage.list_by_dois(job.user_id, [doi])
+        if existing:
+            file_id = existing[0].id
+        else:
+            try:
+                async with self.__semaphore:
+                    file_id = (await self.download(job.user_id, doi)).id
+            except (ErrNotFound, ErrNotPDF, ErrTooLarge) as e:
+                raise ErrPermanent(str(e))
+
+        ingest = await self.__jobs.enqueue(
+            user_id=job.user_id,
+            kind=document_jobs.INGEST,
+            payload={"file_id": file_id},
+        )
+        await report_progress(1, 1)
+        return {"file_id": file_id, "ingest_job_id": ingest.id}
+
+    async def __resolve(self, doi: str) -> str:
+        """The PDF URL on the landing page of `doi`; a missing one is remembered."""
+        _, html_content = await self.__api.get_page(doi)
+        if not html_content:
+            raise ErrNotFound("doi-import: resolve: empty page: {}".format(doi))
+
+        pdf_url = landing_pages.extract_pdf_url(html_content, self.__extractors)
+        if not pdf_url:
+            await self.__remember(
+                doi_resolution_storage_models.UpsertBody(
+                    doi=doi,
+                    status=doi_resolution_storage_models.NOT_FOUND,
+                    expires_at=datetime.utcnow() + self.__config.not_found_ttl,
+                )
+            )
+            raise ErrNotFound("doi-import: resolve: no pdf on page: {}".format(doi))
+
+        # Links are protocol-relative or relative to the mirror.
+        return urljoin(self.__api.page_url(doi), pdf_url)
+
+    async def __fetch(self, user_id: int, doi: str, pdf_url: str) -> UploadStreamResult:
+        pdf_filename = pdf_url.split("/")[-1].split("#")[0].split("?")[0]
+        try:
+            async with self.__api.open_pdf(
+                pdf_url, max_size=self.__documents.upload_config.max_size
+            ) as response:
+                # Stream the body straight into storage, checking it is a PDF.
+                result = await self.__documents.upload_stream(
+                    UploadStreamBody(
+                        user_id=user_id,
+                        filename=pdf_filename,
+                        read=streams.SignatureReader(
+                            response.content.read, pdf.SIGNATURE
+                        ).read,
+                        content_type="application/pdf",
+                        doi=doi,
+                    )
+                )
+        except (scihub.ErrNotPDF, documents.ErrInvalidContent) as e:
+            raise ErrNotPDF("doi-import: fetch: not-pdf: {}".format(str(e)))
+        except (streams.ErrTooLarge, documents.ErrTooLarge) as e:
+            raise ErrTooLarge("doi-import: fetch: too-large: {}".format(str(e)))
+
+        await self.__remember(
+            doi_resolution_storage_models.UpsertBody(
+                doi=doi,
+                status=doi_resolution_storage_models.FOUND,
+                expires_at=datetime.utcnow() + self.__config.resolution_ttl,
+                pdf_url=pdf_url,
+                user_id=user_id,
+                file_id=result.id,
+                filename=pdf_filename,
+                content_hash=result.content_hash,
+                size=result.size,
+            )
+        )
+        return result
+
+    async def __copy(
+        self, user_id: int, resolution: doi_resolution_storage_models.GetResult
+    ) -> UploadStreamResult | None:
+        """Copies the stored PDF of `resolution`, or None when it is gone."""
+        if resolution.file_id is None or resolution.content_hash is None:
+            return None
+
+        try:
+            return await self.__documents.copy(
+                CopyBody(
+                    source_user_id=resolution.user_id,
+                    source_id=resolution.file_id,
+                    user_id=user_id,
+                    filename=resolution.filename,
+                    content_type="application/pdf",
+                    content_hash=resolution.content_hash,
+                    size=resolution.size,
+                    doi=resolution.doi,
+                )
+            )
+        except documents.ErrNotFound:
+            return None
+        except Exception as e:
+            self.__logger.error("failed to copy pdf: %s: %s", resolution.doi, str(e))
+            return None
+
+    async def __cached_resolution(
+        self, doi: str
+    ) -> doi_resolution_storage_models.GetResult | None:
+        try:
+            resolution = await self.__resolution_storage.get(doi)
+        except doi_resolution_storage.ErrNotFound:
+            return None
+        except Exception as e:
+            self.__logger.error("failed to get doi resolution: %s: %s", doi, str(e))
+            return None
+
+        if resolution.expires_at <= datetime.utcnow():
+            return None
+        return resolution
+
+    async def __remember(self, body: doi_resolution_storage_models.UpsertBody) -> None:
+        try:
+            await self.__resolution_storage.upsert(body)
+        except Exception as e:
+            self.__logger.error("failed to save doi resolution: %s: %s", body.doi, str(e))
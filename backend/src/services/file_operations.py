@@ -21,9 +21,5 @@ async def download_pdf(pdf_url: str, filename: str) -> Path:
         raise HTTPException(status_code=500, detail=f"Error occurred: {str(e)}")
 
 def extract_text_from_pdf(file_path: Path) -> str:
-    text = ""
     with fitz.open(file_path) as pdf:
-        for page in pdf:
-            page_text = page.get_text()
-            text += page_text
-    return text
+        return "".join(page.get_text() for page in pdf)
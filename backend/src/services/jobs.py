@@ -0,0 +1,275 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List
+import asyncio
+import logging
+
+import src.storage.job_storage as job_storage
+import src.storage.job_storage_models as job_storage_models
+from src.config.config import JobsSettings
+
+
+ProgressReporter = Callable[[int, int], Awaitable[None]]
+Handler = Callable[[job_storage_models.GetResult, ProgressReporter], Awaitable[dict]]
+
+
+@dataclass
+class EnqueueResult:
+    id: int
+    status: str
+
+
+@dataclass
+class JobResult:
+    id: int
+    kind: str
+    status: str
+    attempts: int
+    progress_done: int
+    progress_total: int
+    result: dict | None
+    error: str | None
+
+
+class ErrInternal(Exception):
+    pass
+
+
+class ErrNotFound(Exception):
+    pass
+
+
+class ErrUnknownKind(Exception):
+    pass
+
+
+class ErrPermanent(Exception):
+    """Raised by handlers for failures that retrying cannot fix."""
+
+    pass
+
+
+class JobService:
+    """
+    Durable job queue on top of JobStorage. `workers` coroutines per process
+    claim jobs with a lease, renew it every `heartbeat_interval` while the
+    handler runs and retry failed jobs with exponential backoff until
+    `max_attempts`. Handlers raise ErrPermanent to fail a job without
+    retrying it.
+
+    A worker that loses its lease (e.g. it stalled past `lease` and the job
+    was claimed again) stops its handler, and its late updates are rejected
+    by the storage.
+    """
+
+    def __init__(self, job_storage: job_storage.JobStorage, config: JobsSettings):
+        self.__job_storage = job_storage
+        self.__config = config
+        self.__handlers: Dict[str, Handler] = {}
+        self.__workers: List[asyncio.Task] = []
+        self.__wakeup = asyncio.Event()
+        self.__logger = logging.getLogger("rai").getChild("jobs")
+
+    def register(self, kind: str, handler: Handler) -> None:
+        self.__handlers[kind] = handler
+
+    async def enqueue(self, user_id: int, kind: str, payload: dict) -> EnqueueResult:
+        if kind not in self.__handlers:
+            raise ErrUnknownKind("job-service: enqueue: unknown kind: {}".format(kind))
+
+        try:
+            result = await self.__job_storage.create(
+                job_storage_models.CreateBody(
+                    user_id=user_id,
+                    kind=kind,
+                    payload=payload,
+                    max_attempts=self.__config.max_attempts,
+                )
+            )
+        except Exception as e:
+            raise ErrInternal("job-service: enqueue: internal: {}".format(str(e)))
+
+        self.__wakeup.set()
+        return EnqueueResult(id=result.id, status=job_storage.STATUS_QUEUED)
+
+    async def enqueue_many(
+        self, user_id: int, kind: str, payloads: List[dict]
+    ) -> List[EnqueueResult]:
+        """Enqueues one job per payload in one transaction, in order."""
+        if kind not in self.__handlers:
+            raise ErrUnknownKind("job-service: enqueue_many: unknown kind: {}".format(kind))
+
+        try:
+            results = await self.__job_storage.create_many(
+                [
+                    job_storage_models.CreateBody(
+                        user_id=user_id,
+                        kind=kind,
+                        payload=payload,
+                        max_attempts=self.__config.max_attempts,
+                    )
+                    for payload in payloads
+                ]
+            )
+        except Exception as e:
+            raise ErrInternal("job-service: enqueue_many: internal: {}".format(str(e)))
+
+        self.__wakeup.set()
+        return [
+            EnqueueResult(id=result.id, status=job_storage.STATUS_QUEUED)
+            for result in results
+        ]
+
+    async def get(self, user_id: int, id: int) -> JobResult:
+        try:
+            job = await self.__job_storage.get(id)
+        except job_storage.ErrNotFound as e:
+            raise ErrNotFound("job-service: get: not-found: {}".format(str(e)))
+        except Exception as e:
+            raise ErrInternal("job-service: get: internal: {}".format(str(e)))
+
+        if job.user_id != user_id:
+            raise ErrNotFound("job-service: get: not-found: id = {}".format(id))
+
+        return JobResult(
+            id=job.id,
+            kind=job.kind,
+            status=job.status,
+            attempts=job.attempts,
+            progress_done=job.progress_done,
+            progress_total=job.progress_total,
+            result=job.result,
+            error=job.error,
+        )
+
+    async def start(self) -> None:
+        for _ in range(self.__config.workers):
+            self.__workers.append(asyncio.create_task(self.__work()))
+
+    async def stop(self) -> None:
+        for worker in self.__workers:
+            worker.cancel()
+        await asyncio.gather(*self.__workers, return_exceptions=True)
+        self.__workers.clear()
+
+    async def __work(self) -> None:
+        while True:
+            try:
+                job = await self.__job_storage.claim(
+                    locked_until=datetime.utcnow() + self.__config.lease
+                )
+            except Exception as e:
+                self.__logger.error("failed to claim job: %s", str(e))
+                job = None
+
+            if job is None:
+                await self.__idle()
+                continue
+
+            await self.__run(job)
+
+    async def __idle(self) -> None:
+        self.__wakeup.clear()
+        try:
+            await asyncio.wait_for(
+                self.__wakeup.wait(),
+                timeout=self.__config.poll_interval.total_seconds(),
+            )
+        except asyncio.TimeoutError:
+            pass
+
+    async def __run(self, job: job_storage_models.GetResult) -> None:
+        async def report_progress(done: int, total: int) -> None:
+            await self.__job_storage.update_progress(
+                job_storage_models.ProgressBody(
+                    id=job.id,
+                    attempt=job.attempts,
+                    done=done,
+                    total=total,
+                    locked_until=datetime.utcnow() + self.__config.lease,
+                )
+            )
+
+        try:
+            handler = self.__handlers.get(job.kind)
+            if handler is None:
+                raise ErrUnknownKind("unknown kind: {}".format(job.kind))
+            if job.attempts > job.max_attempts:
+                raise ErrInternal("lease expired on the last attempt")
+
+            task = asyncio.create_task(handler(job, report_progress))
+            heartbeat = asyncio.create_task(self.__heartbeat(job))
+            try:
+                await asyncio.wait(
+                    {task, heartbeat}, return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                heartbeat.cancel()
+                task.cancel()
+
+            if not task.done():
+                # The heartbeat only returns when the lease is lost.
+                await asyncio.gather(task, return_exceptions=True)
+                raise job_storage.ErrLeaseLost("lease lost while running")
+
+            await self.__job_storage.complete(
+                id=job.id, attempt=job.attempts, result=task.result()
+            )
+        except asyncio.CancelledError:
+            raise
+        except job_storage.ErrLeaseLost as e:
+            self.__logger.error(
+                "job lease lost: id = %d; kind = %s; attempt = %d: %s",
+                job.id,
+                job.kind,
+                job.attempts,
+                str(e),
+            )
+        except Exception as e:
+            self.__logger.error(
+                "job failed: id = %d; kind = %s; attempt = %d: %s",
+                job.id,
+                job.kind,
+                job.attempts,
+                str(e),
+            )
+            await self.__fail(job, str(e), permanent=isinstance(e, ErrPermanent))
+
+    async def __heartbeat(self, job: job_storage_models.GetResult) -> None:
+        """Renews the lease of `job` until cancelled; returns once it is lost."""
+        while True:
+            await asyncio.sleep(self.__config.heartbeat_interval.total_seconds())
+            try:
+                await self.__job_storage.renew(
+                    job_storage_models.RenewBody(
+                        id=job.id,
+                        attempt=job.attempts,
+                        locked_until=datetime.utcnow() + self.__config.lease,
+                    )
+                )
+            except job_storage.ErrLeaseLost:
+                return
+            except Exception as e:
+                # Keep running; the next beat may still renew in time.
+                self.__logger.error("failed to renew job lease: id = %d: %s", job.id, str(e))
+
+    async def __fail(
+        self, job: job_storage_models.GetResult, error: str, permanent: bool
+    ) -> None:
+        retry_at = None
+        if (
+            not permanent
+            and job.attempts < job.max_attempts
+            and job.kind in self.__handlers
+        ):
+            backoff = self.__config.retry_backoff * (2 ** (job.attempts - 1))
+            retry_at = datetime.utcnow() + backoff
+
+        try:
+            await self.__job_storage.fail(
+                job_storage_models.FailBody(
+                    id=job.id, attempt=job.attempts, error=error, retry_at=retry_at
+                )
+            )
+        except Exception as e:
+            self.__logger.error("failed to record job failure: id = %d: %s", job.id, str(e))
@@ -8,12 +8,8 @@ from src.consts import DOWNLOAD_FOLDER
 
 
 def extract_text_from_pdf(file_path: Path) -> str:
-    text = ""
     with fitz.open(file_path) as pdf:
-        for page in pdf:
-            page_text = page.get_text()
-            text += page_text
-    return text
+        return "".join(page.get_text() for page in pdf)
 
 
 async def download_pdf(pdf_url: str, filename: str):
@@ -0,0 +1,127 @@
+import asyncio
+from typing import AsyncIterable, Awaitable, Callable, List
+
+from pgpt_python.client import AsyncPrivateGPTApi
+
+from src.config.config import SummarizerSettings
+
+
+# Bump whenever a prompt changes so cached summaries are not reused.
+PROMPT_VERSION = "1"
+
+MAP_PROMPT = "Summarize this document:\n{}"
+REDUCE_PROMPT = (
+    "Combine the following partial summaries of one document "
+    "into a single coherent summary:\n{}"
+)
+
+
+class ErrInternal(Exception):
+    pass
+
+
+class MapReduceSummarizer:
+    """
+    Summarizes chunked text in two phases: every chunk is summarized
+    concurrently (map), then partial summaries are merged in groups of
+    `reduce_fan_in` until a single summary is left (reduce). The number of
+    completions in flight never exceeds `max_concurrency`, across all the
+    documents summarized by this instance at the same time.
+    """
+
+    def __init__(self, gpt_api: AsyncPrivateGPTApi, config: SummarizerSettings):
+        self.__api = gpt_api
+        # Shared by every call, so job workers summarizing different
+        # documents stay within one limit.
+        self.__semaphore = asyncio.Semaphore(max(1, config.max_concurrency))
+        self.__max_lookups = max(1, config.max_concurrency)
+        self.__fan_in = max(2, config.reduce_fan_in)
+
+    async def summarize(self, chunks: AsyncIterable[str]) -> str:
+        summaries = await self.summarize_chunks(chunks)
+        return await self.reduce(summaries)
+
+    async def summarize_chunks(
+        self,
+        chunks: AsyncIterable[str],
+        lookup: Callable[[str], Awaitable[str | None]] | None = None,
+        on_summarized: Callable[[str, str], Awaitable[None]] | None = None,
+    ) -> List[str]:
+        """
+        Returns one summary per chunk, in the order of `chunks`. Chunks are
+        summarized as soon as they arrive, so the producer may still be
+        extracting text while the first completions run.
+
+        `lookup` may return an already known summary for a chunk; lookups
+        do not take completion slots, so cached chunks never wait behind
+        generated ones. `on_summarized` is awaited with every newly
+        generated summary.
+        """
+        # Keeps a document with many chunks from taking every database
+        # connection with its cache lookups.
+        lookups = asyncio.Semaphore(self.__max_lookups)
+
+        async def summarize_chunk(chunk: str) -> str:
+            if lookup is not None:
+                async with lookups:
+                    summary = await lookup(chunk)
+                if summary is not None:
+                    return summary
+
+            async with self.__semaphore:
+                summary = await self.__complete(MAP_PROMPT.format(chunk))
+
+            if on_summarized is not None:
+                await on_summarized(chunk, summary)
+            return summary
+
+        tasks: List[asyncio.Task] = []
+        try:
+            async for chunk in chunks:
+                tasks.append(asyncio.create_task(summarize_chunk(chunk)))
+            return await asyncio.gather(*tasks)
+        except Exception as e:
+            for task in tasks:
+                task.cancel()
+            raise ErrInternal(
+                "summarizer: summarize_chunks: internal: {}".format(str(e))
+            )
+
+    async def reduce(self, summaries: List[str]) -> str:
+        summaries = [summary for summary in summaries if summary]
+
+        try:
+            return await self.__reduce(summaries)
+        except Exception as e:
+            raise ErrInternal("summarizer: reduce: internal: {}".format(str(e)))
+
+    async def __reduce(self, summaries: List[str]) -> str:
+        while len(summaries) > 1:
+            groups = [
+                summaries[i : i + self.__fan_in]
+                for i in range(0, len(summaries), self.__fan_in)
+            ]
+            merged = await asyncio.gather(
+                *[self.__merge(group) for group in groups]
+            )
+            summaries = [summary for summary in merged if summary]
+
+        return summaries[0] if summaries else ""
+
+    async def __merge(self, group: List[str]) -> str:
+        if len(group) == 1:
+            return group[0]
+
+        async with self.__semaphore:
+            merged = await self.__complete(REDUCE_PROMPT.format("\n\n".join(group)))
+        return merged or " ".join(group)
+
+    async def __complete(self, prompt: str) -> str:
+        response = await self.__api.contextual_completions.prompt_completion(
+            prompt=prompt
+        )
+
+        message = response.choices[0].message
+        if message is None:
+            return ""
+        return message.content
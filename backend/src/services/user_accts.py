@@ -1,8 +1,7 @@
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
-from uuid import UUID
-import bcrypt
+from uuid import UUID, uuid4
 import jwt
 
 import src.storage.auth_token_storage as token_storage
@@ -10,6 +9,8 @@ import src.storage.user_acct_storage as user_storage
 import src.storage.user_acct_models as user_storage_models
 import src.storage.auth_token_models as token_storage_models
 from src.config.config import AuthSettings
+from src.gears.lru import LRUCache
+from src.gears import passwords
 
 
 @dataclass
@@ -28,6 +29,12 @@ class ActivateResult:
     user_id: int
 
 
+@dataclass
+class AuthenticateResult:
+    user_id: int
+    username: str
+
+
 class ErrInternal(Exception):
     pass
 
@@ -56,16 +63,24 @@ class ErrNotFound(Exception):
     pass
 
 
+class ErrBusy(Exception):
+    pass
+
+
 class UserAcctService:
     def __init__(
         self,
         user_storage: user_storage.UserAcctStorage,
         token_storage: token_storage.AuthTokenStorage,
         config: AuthSettings,
+        token_cache: LRUCache,
+        password_hasher: passwords.PasswordHasher,
     ):
         self.__user_storage = user_storage
         self.__token_storage = token_storage
         self.__config = config
+        self.__token_cache = token_cache
+        self.__password_hasher = password_hasher
 
     async def register(
         self,
@@ -80,10 +95,11 @@ class UserAcctService:
             raise ErrEmailTaken
 
         try:
-            encrypted_hex_password = bcrypt.hashpw(
-                password.encode(), bcrypt.gensalt()
-            ).hex()
+            encrypted_hex_password = await self.__password_hasher.hash(password)
+        except passwords.ErrBusy as e:
+            raise ErrBusy("user-service: register: busy: {}".format(str(e)))
 
+        try:
             result = await self.__user_storage.create(
                 user_storage_models.CreateBody(
                     username=username,
@@ -113,34 +129,7 @@ class UserAcctService:
                 "user-service: login: user-storage: internal: {}".format(str(e))
             )
 
-        if not bcrypt.checkpw(password.encode(), bytes.fromhex(user.password)):
-            raise ErrInvalidCredentials("user-service: login: invalid credentials")
-
-        try:
-            token = ""
-            while token == "" or await self.__token_storage.token_exists(token):
-                expiry = datetime.now(timezone.utc) + self.__config.expiry
-                token = jwt.encode(
-                    payload={
-                        "username": user.username,
-                        "user_id": user.id,
-                        "exp": expiry,
-                    },
-                    key=self.__config.secret,
-                    algorithm="HS256",
-                )
-
-            result = await self.__token_storage.create(
-                token_storage_models.CreateBody(
-                    user_id=user.id,
-                    token=token,
-                )
-            )
-            return LoginResult(token_id=result.id, token=token)
-        except token_storage.ErrInternal as e:
-            raise ErrInternal("user-service: login: token-storage: {}".format(str(e)))
-        except Exception as e:
-            raise ErrInternal("user-service: login: internal: {}".format(str(e)))
+        return await self.__login("login", user, password)
 
     async def email_login(self, email: str, password: str) -> LoginResult:
         try:
@@ -150,39 +139,10 @@ class UserAcctService:
         except user_storage.ErrInternal as e:
             raise ErrInternal("user-service: email-login: internal: {}".format(str(e)))
 
-        if not bcrypt.checkpw(password.encode(), bytes.fromhex(user.password)):
-            raise ErrInvalidCredentials(
-                "user-service: email-login: invalid credentials"
-            )
-
-        try:
-            token = ""
-            while token == "" or await self.__token_storage.token_exists(token):
-                expiry = datetime.now(timezone.utc) + self.__config.expiry
-                token = jwt.encode(
-                    payload={
-                        "username": user.username,
-                        "user_id": user.id,
-                        "exp": expiry,
-                    },
-                    key=self.__config.secret,
-                    algorithm="HS256",
-                )
-
-            result = await self.__token_storage.create(
-                token_storage_models.CreateBody(
-                    user_id=user.id,
-                    token=token,
-                )
-            )
-
-            return LoginResult(token_id=result.id, token=token)
-        except token_storage.ErrInternal as e:
-            raise ErrInternal("user-service: login: token-storage: {}".format(str(e)))
-        except Exception as e:
-            raise ErrInternal("user-service: login: internal: {}".format(str(e)))
+        return await self.__login("email-login", user, password)
 
     async def logout(self, token: str) -> None:
+        self.__token_cache.invalidate(token)
         try:
             await self.__token_storage.delete_token(token=token)
         except token_storage.ErrNotFound as e:
@@ -192,18 +152,58 @@ class UserAcctService:
 
     async def verify(self, token: str) -> bool:
         try:
-            token_from_db = await self.__token_storage.get_by_token(token)
+            await self.authenticate(token)
+        except ErrSessionExpired:
+            return False
+
+        return True
+
+    async def authenticate(self, token: str) -> AuthenticateResult:
+        """
+        Resolves a session token to its user. Verified tokens are cached until
+        `token_cache_ttl` or their expiry, whichever comes first, so the common
+        case costs neither a database query nor a signature check. Sessions
+        deleted through another process stay valid here for at most
+        `token_cache_ttl`.
+        """
+        cached = self.__token_cache.get(token)
+        if cached is not None:
+            return cached
+
+        try:
+            claims = jwt.decode(token, self.__config.secret, algorithms=["HS256"])
+        except jwt.ExpiredSignatureError:
             try:
-                result = jwt.decode(token, self.__config.secret, algorithms=["HS256"])
-            except jwt.ExpiredSignatureError:
                 await self.logout(token=token)
-                return False
+            except ErrNotFound:
+                pass
+            raise ErrSessionExpired("user-service: authenticate: session-expired")
+        except jwt.InvalidTokenError as e:
+            raise ErrInvalidCredentials(
+                "user-service: authenticate: invalid token: {}".format(str(e))
+            )
+
+        try:
+            await self.__token_storage.get_by_token(token)
         except token_storage.ErrNotFound:
-            raise ErrNotFound("user-service: verify: not-found")
+            raise ErrNotFound("user-service: authenticate: not-found")
         except Exception as e:
-            raise ErrInternal("user-service: verify: internal: {}".format(str(e)))
+            raise ErrInternal(
+                "user-service: authenticate: internal: {}".format(str(e))
+            )
 
-        return True
+        result = AuthenticateResult(
+            user_id=claims["user_id"], username=claims["username"]
+        )
+        expires_in = claims["exp"] - datetime.now(timezone.utc).timestamp()
+        self.__token_cache.put(
+            token,
+            result,
+            size=len(token) + len(result.username),
+            ttl=min(self.__config.token_cache_ttl, timedelta(seconds=expires_in)),
+        )
+
+        return result
 
     async def activate(self, activation_id: UUID) -> ActivateResult:
         try:
@@ -221,3 +221,46 @@ class UserAcctService:
         except Exception as e:
             raise ErrInternal("user-service: activate: internal: {}".format(str(e)))
         return ActivateResult(user_id=result.user_id)
+
+    async def __check_password(self, op: str, password: str, hashed: str) -> bool:
+        try:
+            return await self.__password_hasher.check(password, hashed)
+        except passwords.ErrBusy as e:
+            raise ErrBusy("user-service: {}: busy: {}".format(op, str(e)))
+
+    async def __login(
+        self, op: str, user: user_storage_models.GetResult, password: str
+    ) -> LoginResult:
+        if not await self.__check_password(op, password, user.password):
+            raise ErrInvalidCredentials(
+                "user-service: {}: invalid credentials".format(op)
+            )
+
+        # The random jti makes every token unique, so the token is inserted
+        # right away and the unique index on auth_tokens.token backs it up.
+        expires_at = datetime.now(timezone.utc) + self.__config.expiry
+        token = jwt.encode(
+            payload={
+                "username": user.username,
+                "user_id": user.id,
+                "exp": expires_at,
+                "jti": uuid4().hex,
+            },
+            key=self.__config.secret,
+            algorithm="HS256",
+        )
+
+        try:
+            result = await self.__token_storage.create(
+                token_storage_models.CreateBody(
+                    user_id=user.id,
+                    token=token,
+                    expires_at=expires_at.replace(tzinfo=None),
+                )
+            )
+        except token_storage.ErrInternal as e:
+            raise ErrInternal("user-service: {}: token-storage: {}".format(op, str(e)))
+        except Exception as e:
+            raise ErrInternal("user-service: {}: internal: {}".format(op, str(e)))
+
+        return LoginResult(token_id=result.id, token=token)
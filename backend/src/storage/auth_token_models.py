@@ -1,10 +1,12 @@
 from dataclasses import dataclass
+from datetime import datetime
 
 
 @dataclass
 class CreateBody:
     user_id: int
     token: str
+    expires_at: datetime
 
 
 @dataclass
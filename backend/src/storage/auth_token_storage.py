@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Protocol
 
 from .auth_token_models import (
@@ -12,7 +13,7 @@ class AuthTokenStorage(Protocol):
     async def get_by_id(self, id: int) -> GetResult: ...
     async def get_by_token(self, token: str) -> GetResult: ...
     async def delete_token(self, token: str) -> None: ...
-    async def token_exists(self, token: str) -> bool: ...
+    async def delete_expired(self, before: datetime, limit: int) -> int: ...
 
 
 class ErrNotFound(Exception):
@@ -0,0 +1,112 @@
+from typing import AsyncIterator, Dict, Tuple
+import asyncio
+
+from src.gears.lru import LRUCache, CacheStats
+from ..file_storage import ArticleStorage
+from ..file_storage_models import (
+    CopyBody,
+    DownloadResult,
+    StatResult,
+    UploadBody,
+    UploadStreamBody,
+)
+
+
+STREAM_CHUNK_SIZE = 64 * 1024
+STAT_SIZE = 256
+
+
+class CachedArticleStorage:
+    """
+    ArticleStorage decorator that keeps recently used objects (and their
+    stat results) in a size-bounded LRU cache. Objects larger than
+    `max_object_size` are never cached. Concurrent misses for the same
+    object share a single download.
+    """
+
+    def __init__(self, storage: ArticleStorage, cache: LRUCache, max_object_size: int):
+        self.__storage = storage
+        self.__cache = cache
+        self.__max_object_size = max_object_size
+        self.__downloads: Dict[Tuple[int, int], asyncio.Future] = {}
+
+    async def download_file(self, user_id: int, id: int) -> DownloadResult:
+        contents = self.__cache.get(("object", user_id, id))
+        if contents is not None:
+            return DownloadResult(contents=contents)
+
+        key = (user_id, id)
+        download = self.__downloads.get(key)
+        if download is None:
+            download = asyncio.ensure_future(self.__download(user_id, id))
+            self.__downloads[key] = download
+            download.add_done_callback(lambda _: self.__downloads.pop(key, None))
+
+        return await asyncio.shield(download)
+
+    async def stat(self, user_id: int, id: int) -> StatResult:
+        result = self.__cache.get(("stat", user_id, id))
+        if result is not None:
+            return result
+
+        result = await self.__storage.stat(user_id=user_id, id=id)
+        self.__cache.put(("stat", user_id, id), result, size=STAT_SIZE)
+        return result
+
+    async def stream(
+        self, user_id: int, id: int, offset: int = 0, length: int = 0
+    ) -> AsyncIterator[bytes]:
+        contents = self.__cache.get(("object", user_id, id))
+        if contents is not None:
+            end = offset + length if length else len(contents)
+            for i in range(offset, end, STREAM_CHUNK_SIZE):
+                yield contents[i : min(i + STREAM_CHUNK_SIZE, end)]
+            return
+
+        # Whole-object reads fill the cache as a side effect, as long as the
+        # object turns out to be small enough.
+        collect = offset == 0 and length == 0
+        parts = []
+        size = 0
+        async for data in self.__storage.stream(
+            user_id=user_id, id=id, offset=offset, length=length
+        ):
+            if collect:
+                size += len(data)
+                collect = size <= self.__max_object_size
+                if collect:
+                    parts.append(data)
+                else:
+                    parts.clear()
+            yield data
+
+        if collect:
+            self.__put(user_id, id, b"".join(parts))
+
+    async def upload(self, body: UploadBody) -> None:
+        self.__invalidate(body.user_id, body.id)
+        await self.__storage.upload(body)
+
+    async def upload_stream(self, body: UploadStreamBody) -> None:
+        self.__invalidate(body.user_id, body.id)
+        await self.__storage.upload_stream(body)
+
+    async def copy(self, body: CopyBody) -> None:
+        self.__invalidate(body.user_id, body.id)
+        await self.__storage.copy(body)
+
+    def stats(self) -> CacheStats:
+        return self.__cache.stats()
+
+    async def __download(self, user_id: int, id: int) -> DownloadResult:
+        result = await self.__storage.download_file(user_id=user_id, id=id)
+        self.__put(user_id, id, result.contents)
+        return result
+
+    def __put(self, user_id: int, id: int, contents: bytes) -> None:
+        if len(contents) <= self.__max_object_size:
+            self.__cache.put(("object", user_id, id), contents, size=len(contents))
+
+    def __invalidate(self, user_id: int, id: int) -> None:
+        self.__cache.invalidate(("object", user_id, id))
+        self.__cache.invalidate(("stat", user_id, id))
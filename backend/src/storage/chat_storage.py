@@ -5,6 +5,8 @@ from .chat_storage_models import (
     CreateBody,
     CreateResult,
     UpdateBody,
+    ListBody,
+    UpdateSummaryBody,
 )
 
 
@@ -12,7 +14,9 @@ class ChatStorage(Protocol):
     async def create(self, body: CreateBody) -> CreateResult: ...
     async def get(self, id: str) -> GetResult: ...
     async def get_by_file(self, file_id: str) -> List[GetResult]: ...
+    async def list_by_file(self, body: ListBody) -> List[GetResult]: ...
     async def update(self, body: UpdateBody) -> Optional[GetResult]: ...
+    async def update_summary(self, body: UpdateSummaryBody) -> bool: ...
     async def delete(self, id: str) -> bool: ...
 
 
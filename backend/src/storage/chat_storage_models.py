@@ -9,6 +9,8 @@ class GetResult:
     title: str
     created_at: datetime
     updated_at: datetime
+    summary: str | None = None
+    summary_until_id: int | None = None
 
 
 @dataclass
@@ -25,4 +27,20 @@ class CreateResult:
 @dataclass
 class UpdateBody:
     id: str
-    title: str 
\ No newline at end of file
+    title: str
+
+
+@dataclass
+class ListBody:
+    file_id: int
+    limit: int
+    # Keyset cursor: only rows strictly older than (created_at, id) are listed.
+    before_created_at: datetime | None = None
+    before_id: int | None = None
+
+
+@dataclass
+class UpdateSummaryBody:
+    id: int
+    summary: str
+    summary_until_id: int
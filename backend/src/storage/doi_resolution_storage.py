@@ -0,0 +1,19 @@
+from typing import Protocol
+
+from .doi_resolution_storage_models import (
+    GetResult,
+    UpsertBody,
+)
+
+
+class DOIResolutionStorage(Protocol):
+    async def get(self, doi: str) -> GetResult: ...
+    async def upsert(self, body: UpsertBody) -> None: ...
+
+
+class ErrNotFound(Exception):
+    pass
+
+
+class ErrInternal(Exception):
+    pass
@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+# Statuses of a DOI resolution.
+FOUND = "found"
+NOT_FOUND = "not_found"
+
+
+@dataclass
+class GetResult:
+    doi: str
+    status: str
+    pdf_url: str | None
+    # The stored copy of the PDF: file `file_id` of user `user_id`.
+    user_id: int | None
+    file_id: int | None
+    filename: str | None
+    content_hash: str | None
+    size: int | None
+    resolved_at: datetime
+    expires_at: datetime
+
+
+@dataclass
+class UpsertBody:
+    doi: str
+    status: str
+    expires_at: datetime
+    pdf_url: str | None = None
+    user_id: int | None = None
+    file_id: int | None = None
+    filename: str | None = None
+    content_hash: str | None = None
+    size: int | None = None
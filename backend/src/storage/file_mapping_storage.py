@@ -29,10 +29,16 @@ class MappingStorage(Protocol):
     ) -> List[GetResult]: ...
     async def get(self, id: int) -> GetResult: ...
     async def create(self, body: CreateBody) -> CreateResult: ...
+    async def list_by_dois(self, user_id: int, dois: List[str]) -> List[GetResult]: ...
+    async def set_content_hash(self, id: int, content_hash: str) -> None: ...
+    async def delete(self, id: int) -> None: ...
     async def list_ingested(
         self, user_id: int, limit: int = 15, offset: int = 0
     ) -> List[GetIngestedResult]: ...
     async def get_ingested(self, id: int) -> GetIngestedResult: ...
+    async def get_ingested_many(
+        self, user_id: int, ids: List[int] | None = None
+    ) -> List[GetIngestedResult]: ...
     async def create_ingested(self, body: CreateIngestedBody) -> CreateIngestedResult: ...
     async def get_all_ingested(
         self,
@@ -7,6 +7,8 @@ class GetResult:
     user_id: int
     filename: str
     content_type: str
+    content_hash: str | None
+    doi: str | None = None
 
 
 @dataclass
@@ -22,6 +24,8 @@ class CreateBody:
     user_id: int
     filename: str
     content_type: str
+    content_hash: str | None = None
+    doi: str | None = None
 
 
 @dataclass
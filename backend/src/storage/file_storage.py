@@ -1,11 +1,23 @@
-from typing import Protocol
+from typing import AsyncIterator, Protocol
 
-from .file_storage_models import DownloadResult, UploadBody
+from .file_storage_models import (
+    CopyBody,
+    DownloadResult,
+    StatResult,
+    UploadBody,
+    UploadStreamBody,
+)
 
 
 class ArticleStorage(Protocol):
     async def download_file(self, user_id: int, id: int) -> DownloadResult: ...
+    async def stat(self, user_id: int, id: int) -> StatResult: ...
+    def stream(
+        self, user_id: int, id: int, offset: int = 0, length: int = 0
+    ) -> AsyncIterator[bytes]: ...
     async def upload(self, body: UploadBody) -> None: ...
+    async def upload_stream(self, body: UploadStreamBody) -> None: ...
+    async def copy(self, body: CopyBody) -> None: ...
 
 
 class ErrInternal(Exception):
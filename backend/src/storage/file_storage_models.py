@@ -1,14 +1,40 @@
 from dataclasses import dataclass
+from datetime import datetime
 from io import BytesIO
 
+from src.gears.streams import AsyncReader
+
 
 @dataclass
 class DownloadResult:
     contents: bytes
 
 
+@dataclass
+class StatResult:
+    size: int
+    etag: str
+    last_modified: datetime
+
+
 @dataclass
 class UploadBody:
     user_id: int
     id: int
     contents: bytes
+
+
+@dataclass
+class UploadStreamBody:
+    user_id: int
+    id: int
+    stream: AsyncReader
+    content_type: str
+
+
+@dataclass
+class CopyBody:
+    source_user_id: int
+    source_id: int
+    user_id: int
+    id: int
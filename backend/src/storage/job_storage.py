@@ -0,0 +1,40 @@
+from typing import List, Protocol, Optional
+from datetime import datetime
+
+from .job_storage_models import (
+    GetResult,
+    CreateBody,
+    CreateResult,
+    ProgressBody,
+    RenewBody,
+    FailBody,
+)
+
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+class JobStorage(Protocol):
+    async def create(self, body: CreateBody) -> CreateResult: ...
+    async def create_many(self, bodies: List[CreateBody]) -> List[CreateResult]: ...
+    async def get(self, id: int) -> GetResult: ...
+    async def claim(self, locked_until: datetime) -> Optional[GetResult]: ...
+    async def update_progress(self, body: ProgressBody) -> None: ...
+    async def renew(self, body: RenewBody) -> None: ...
+    async def complete(self, id: int, attempt: int, result: dict) -> None: ...
+    async def fail(self, body: FailBody) -> None: ...
+
+
+class ErrNotFound(Exception):
+    pass
+
+
+class ErrInternal(Exception):
+    pass
+
+
+class ErrLeaseLost(Exception):
+    pass
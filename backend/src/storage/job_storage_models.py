@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class GetResult:
+    id: int
+    user_id: int
+    kind: str
+    payload: dict
+    status: str
+    attempts: int
+    max_attempts: int
+    progress_done: int
+    progress_total: int
+    result: dict | None
+    error: str | None
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass
+class CreateBody:
+    user_id: int
+    kind: str
+    payload: dict
+    max_attempts: int
+
+
+@dataclass
+class CreateResult:
+    id: int
+
+
+@dataclass
+class ProgressBody:
+    id: int
+    # The attempt that claimed the job; updates from older claims are rejected.
+    attempt: int
+    done: int
+    total: int
+    locked_until: datetime
+
+
+@dataclass
+class RenewBody:
+    id: int
+    attempt: int
+    locked_until: datetime
+
+
+@dataclass
+class FailBody:
+    id: int
+    attempt: int
+    error: str
+    retry_at: datetime | None
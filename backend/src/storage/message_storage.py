@@ -5,13 +5,18 @@ from .message_storage_models import (
     CreateBody,
     CreateResult,
     UpdateBody,
+    CreateTurnBody,
+    CreateTurnResult,
+    ListBody,
 )
 
 
 class MessageStorage(Protocol):
     async def create(self, body: CreateBody) -> CreateResult: ...
+    async def create_turn(self, body: CreateTurnBody) -> CreateTurnResult: ...
     async def get(self, id: str) -> GetResult: ...
     async def get_by_chat(self, chat_id: str) -> List[GetResult]: ...
+    async def list_by_chat(self, body: ListBody) -> List[GetResult]: ...
     async def update(self, body: UpdateBody) -> Optional[GetResult]: ...
     async def delete(self, id: str) -> bool: ...
 
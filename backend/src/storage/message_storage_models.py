@@ -27,4 +27,30 @@ class CreateResult:
 @dataclass
 class UpdateBody:
     id: str
-    content: str 
\ No newline at end of file
+    content: str
+
+
+@dataclass
+class CreateTurnBody:
+    # A new chat about `file_id` is created when chat_id is None.
+    chat_id: str | None
+    file_id: int
+    title: str
+    prompt: str
+    response: str
+
+
+@dataclass
+class CreateTurnResult:
+    chat_id: int
+    user_message_id: int
+    assistant_message_id: int
+
+
+@dataclass
+class ListBody:
+    chat_id: int
+    limit: int
+    # Keyset cursor: only rows strictly older than (created_at, id) are listed.
+    before_created_at: datetime | None = None
+    before_id: int | None = None
@@ -1,16 +1,28 @@
 from io import BytesIO
+from typing import AsyncIterator
 
 from miniopy_async import Minio
+from miniopy_async.commonconfig import CopySource
 from miniopy_async.error import S3Error
 
 from src import consts
-from ..file_storage_models import DownloadResult, UploadBody
+from ..file_storage_models import (
+    CopyBody,
+    DownloadResult,
+    StatResult,
+    UploadBody,
+    UploadStreamBody,
+)
 from ..file_storage import ErrInternal, ErrNotFound
 
 
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
 class ArticleStorage:
-    def __init__(self, client: Minio):
+    def __init__(self, client: Minio, part_size: int):
         self.client = client
+        self.part_size = part_size
 
     async def download_file(self, user_id: int, id: int) -> DownloadResult:
         try:
@@ -33,6 +45,52 @@ class ArticleStorage:
 
         return DownloadResult(contents=contents)
 
+    async def stat(self, user_id: int, id: int) -> StatResult:
+        try:
+            result = await self.client.stat_object(
+                bucket_name=consts.S3_BUCKET,
+                object_name=self.__key(user_id=user_id, id=id),
+            )
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject"):
+                raise ErrNotFound("article-storage: stat: not-found: {}".format(str(e)))
+            raise ErrInternal("article-storage: stat: {}".format(str(e)))
+        except Exception as e:
+            raise ErrInternal("article-storage: stat: {}".format(str(e)))
+
+        return StatResult(
+            size=result.size,
+            etag=result.etag,
+            last_modified=result.last_modified,
+        )
+
+    async def stream(
+        self, user_id: int, id: int, offset: int = 0, length: int = 0
+    ) -> AsyncIterator[bytes]:
+        """
+        Yields the object (or `length` bytes of it from `offset`; 0 means
+        up to the end) in chunks, without reading it into memory.
+        """
+        try:
+            response = await self.client.get_object(
+                bucket_name=consts.S3_BUCKET,
+                object_name=self.__key(user_id=user_id, id=id),
+                offset=offset,
+                length=length,
+            )
+        except S3Error as e:
+            if e.code == "NoSuchKey":
+                raise ErrNotFound("article-storage: stream: not-found: {}".format(str(e)))
+            raise ErrInternal("article-storage: stream: {}".format(str(e)))
+        except Exception as e:
+            raise ErrInternal("article-storage: stream: {}".format(str(e)))
+
+        try:
+            async for data in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                yield data
+        finally:
+            response.close()
+
     async def upload(self, body: UploadBody) -> None:
         response = await self.client.put_object(
             object_name=self.__key(user_id=body.user_id, id=body.id),
@@ -42,5 +100,42 @@ class ArticleStorage:
             content_type="text",
         )
 
+    async def upload_stream(self, body: UploadStreamBody) -> None:
+        """
+        Uploads data of unknown length as a multipart upload, holding at
+        most one part in memory at a time. Errors raised by the stream
+        itself are propagated as is.
+        """
+        try:
+            await self.client.put_object(
+                object_name=self.__key(user_id=body.user_id, id=body.id),
+                bucket_name=consts.S3_BUCKET,
+                data=body.stream,
+                length=-1,
+                part_size=self.part_size,
+                num_parallel_uploads=1,
+                content_type=body.content_type,
+            )
+        except S3Error as e:
+            raise ErrInternal("article-storage: upload_stream: {}".format(str(e)))
+
+    async def copy(self, body: CopyBody) -> None:
+        """Copies an object server-side, without downloading it."""
+        try:
+            await self.client.copy_object(
+                bucket_name=consts.S3_BUCKET,
+                object_name=self.__key(user_id=body.user_id, id=body.id),
+                source=CopySource(
+                    consts.S3_BUCKET,
+                    self.__key(user_id=body.source_user_id, id=body.source_id),
+                ),
+            )
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject"):
+                raise ErrNotFound("article-storage: copy: not-found: {}".format(str(e)))
+            raise ErrInternal("article-storage: copy: {}".format(str(e)))
+        except Exception as e:
+            raise ErrInternal("article-storage: copy: {}".format(str(e)))
+
     def __key(self, user_id: int, id: int) -> str:
         return "{}/{}".format(user_id, id)
@@ -1,4 +1,5 @@
-from sqlalchemy import select, delete
+from datetime import datetime
+from sqlalchemy import select, delete, insert
 from sqlalchemy.exc import IntegrityError
 
 from src.gears.db import DB
@@ -21,12 +22,19 @@ class AuthTokenStorage:
 
     async def create(self, body: CreateBody) -> CreateResult:
         async with self.__db.session_maker() as session:
-            new_token = AuthToken(token=body.token, user_id=body.user_id)
-            session.add(new_token)
+            stmt = (
+                insert(AuthToken)
+                .values(
+                    token=body.token,
+                    user_id=body.user_id,
+                    expires_at=body.expires_at,
+                )
+                .returning(AuthToken.id)
+            )
             try:
+                result = await session.execute(stmt)
                 await session.commit()
-                await session.refresh(new_token)
-                return CreateResult(int(new_token.id))
+                return CreateResult(int(result.scalar_one()))
             except IntegrityError as e:
                 raise ErrInternal(
                     "auth-token-storage: create: internal: integrity-error: {}".format(
@@ -82,7 +90,7 @@ class AuthTokenStorage:
                 stmt = delete(AuthToken).where(AuthToken.token == token)
 
                 result = await session.execute(stmt)
-                session.commit()
+                await session.commit()
             except Exception as e:
                 raise ErrInternal(
                     "auth-token-storage: delete: internal: {}".format(str(e))
@@ -93,14 +101,23 @@ class AuthTokenStorage:
                     "auth-token-storage: delete: not-found: token = {}".format(token)
                 )
 
-    async def token_exists(self, token: str) -> bool:
-        try:
-            await self.get_by_token(token)
-        except ErrNotFound:
-            return False
-        except Exception as e:
-            raise ErrInternal(
-                "auth-token-storage: token_exists: internal: {}".format(str(e))
-            )
+    async def delete_expired(self, before: datetime, limit: int) -> int:
+        """Deletes up to `limit` tokens that expired before `before`."""
+        async with self.__db.session_maker() as session:
+            try:
+                expired = (
+                    select(AuthToken.id)
+                    .where(AuthToken.expires_at < before)
+                    .limit(limit)
+                    .scalar_subquery()
+                )
+                stmt = delete(AuthToken).where(AuthToken.id.in_(expired))
+
+                result = await session.execute(stmt)
+                await session.commit()
+            except Exception as e:
+                raise ErrInternal(
+                    "auth-token-storage: delete_expired: internal: {}".format(str(e))
+                )
 
-        return True
+            return result.rowcount
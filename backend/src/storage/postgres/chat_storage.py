@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import select
+from sqlalchemy import select, update, or_, tuple_
 from uuid import uuid4
 
 from src.gears.db import DB
@@ -8,6 +8,8 @@ from ..chat_storage_models import (
     CreateBody,
     CreateResult,
     UpdateBody,
+    ListBody,
+    UpdateSummaryBody,
 )
 from ..chat_storage import ErrInternal, ErrNotFound
 from .models.chat import Chat
@@ -52,6 +54,8 @@ class ChatStorage:
                     title=chat.title,
                     created_at=chat.created_at,
                     updated_at=chat.updated_at,
+                    summary=chat.summary,
+                    summary_until_id=chat.summary_until_id,
                 )
         except ErrNotFound:
             raise
@@ -78,6 +82,36 @@ class ChatStorage:
         except Exception as e:
             raise ErrInternal(f"chat-storage: get_by_file: internal: {str(e)}")
 
+    async def list_by_file(self, body: ListBody) -> list[GetResult]:
+        """Newest chats first, served by the (file_id, created_at, id) index."""
+        try:
+            async with self.db.session_maker() as session:
+                stmt = select(Chat).where(Chat.file_id == body.file_id)
+                if body.before_created_at is not None:
+                    stmt = stmt.where(
+                        tuple_(Chat.created_at, Chat.id)
+                        < (body.before_created_at, body.before_id)
+                    )
+                stmt = stmt.order_by(Chat.created_at.desc(), Chat.id.desc()).limit(
+                    body.limit
+                )
+
+                result = await session.execute(stmt)
+                chats = result.scalars().all()
+
+                return [
+                    GetResult(
+                        id=chat.id,
+                        file_id=chat.file_id,
+                        title=chat.title,
+                        created_at=chat.created_at,
+                        updated_at=chat.updated_at,
+                    )
+                    for chat in chats
+                ]
+        except Exception as e:
+            raise ErrInternal(f"chat-storage: list_by_file: internal: {str(e)}")
+
     async def update(self, body: UpdateBody) -> GetResult:
         try:
             async with self.db.session_maker() as session:
@@ -105,6 +139,34 @@ class ChatStorage:
         except Exception as e:
             raise ErrInternal(f"chat-storage: update: internal: {str(e)}")
 
+    async def update_summary(self, body: UpdateSummaryBody) -> bool:
+        """
+        Stores a rolling summary unless a summary covering more messages was
+        saved meanwhile. Returns whether the summary was stored.
+        """
+        try:
+            async with self.db.session_maker() as session:
+                stmt = (
+                    update(Chat)
+                    .where(
+                        Chat.id == body.id,
+                        or_(
+                            Chat.summary_until_id.is_(None),
+                            Chat.summary_until_id < body.summary_until_id,
+                        ),
+                    )
+                    .values(
+                        summary=body.summary,
+                        summary_until_id=body.summary_until_id,
+                    )
+                )
+                result = await session.execute(stmt)
+                await session.commit()
+
+                return result.rowcount > 0
+        except Exception as e:
+            raise ErrInternal(f"chat-storage: update_summary: internal: {str(e)}")
+
     async def delete(self, id: str) -> bool:
         try:
             async with self.db.session_maker() as session:
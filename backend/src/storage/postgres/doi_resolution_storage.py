@@ -0,0 +1,66 @@
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.gears.db import DB
+from ..doi_resolution_storage_models import (
+    GetResult,
+    UpsertBody,
+)
+from ..doi_resolution_storage import ErrInternal, ErrNotFound
+from .models.doi_resolution import DOIResolution
+
+
+class DOIResolutionStorage:
+    def __init__(self, db: DB):
+        self.db = db
+
+    async def get(self, doi: str) -> GetResult:
+        try:
+            async with self.db.session_maker() as session:
+                stmt = select(DOIResolution).where(DOIResolution.doi == doi)
+                result = await session.execute(stmt)
+                record = result.scalar_one_or_none()
+        except Exception as e:
+            raise ErrInternal(f"doi-resolution-storage: get: internal: {str(e)}")
+
+        if record is None:
+            raise ErrNotFound(f"doi-resolution-storage: get: not-found: doi = {doi}")
+
+        return GetResult(
+            doi=record.doi,
+            status=record.status,
+            pdf_url=record.pdf_url,
+            user_id=record.user_id,
+            file_id=record.file_id,
+            filename=record.filename,
+            content_hash=record.content_hash,
+            size=record.size,
+            resolved_at=record.resolved_at,
+            expires_at=record.expires_at,
+        )
+
+    async def upsert(self, body: UpsertBody) -> None:
+        values = {
+            "status": body.status,
+            "pdf_url": body.pdf_url,
+            "user_id": body.user_id,
+            "file_id": body.file_id,
+            "filename": body.filename,
+            "content_hash": body.content_hash,
+            "size": body.size,
+            "resolved_at": datetime.utcnow(),
+            "expires_at": body.expires_at,
+        }
+        try:
+            async with self.db.session_maker() as session:
+                stmt = (
+                    insert(DOIResolution)
+                    .values(doi=body.doi, **values)
+                    .on_conflict_do_update(index_elements=[DOIResolution.doi], set_=values)
+                )
+                await session.execute(stmt)
+                await session.commit()
+        except Exception as e:
+            raise ErrInternal(f"doi-resolution-storage: upsert: internal: {str(e)}")
+
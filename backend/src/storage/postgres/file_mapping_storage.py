@@ -1,5 +1,5 @@
 from typing import List
-from sqlalchemy import select
+from sqlalchemy import select, update, delete
 
 from src.gears.db import DB
 from ..file_mapping_storage_models import (
@@ -39,6 +39,8 @@ class MappingStorage:
                         user_id=record.user_id,
                         filename=record.filename,
                         content_type=record.content_type,
+                        content_hash=record.content_hash,
+                        doi=record.doi,
                     )
                     for record in records
                 ]
@@ -67,6 +69,8 @@ class MappingStorage:
             user_id=mapping.user_id,
             filename=mapping.filename,
             content_type=mapping.content_type,
+            content_hash=mapping.content_hash,
+            doi=mapping.doi,
         )
 
     async def create(self, body: CreateBody) -> CreateResult:
@@ -75,6 +79,8 @@ class MappingStorage:
                 user_id=body.user_id,
                 filename=body.filename,
                 content_type=body.content_type,
+                content_hash=body.content_hash,
+                doi=body.doi,
             )
 
             async with self.db.session_maker() as session:
@@ -88,6 +94,71 @@ class MappingStorage:
                 "file-mapping-storage: create: internal: {}".format(str(e))
             )
 
+    async def list_by_dois(self, user_id: int, dois: List[str]) -> List[GetResult]:
+        """A user's files imported from any of `dois`, newest first."""
+        try:
+            async with self.db.session_maker() as session:
+                stmt = (
+                    select(FileMapping)
+                    .where(FileMapping.user_id == user_id, FileMapping.doi.in_(dois))
+                    .order_by(FileMapping.id.desc())
+                )
+
+                result = await session.execute(stmt)
+                records = result.scalars().all()
+        except Exception as e:
+            raise ErrInternal(
+                "file-mapping-storage: list_by_dois: internal: {}".format(str(e))
+            )
+
+        return [
+            GetResult(
+                id=record.id,
+                user_id=record.user_id,
+                filename=record.filename,
+                content_type=record.content_type,
+                content_hash=record.content_hash,
+                doi=record.doi,
+            )
+            for record in records
+        ]
+
+    async def set_content_hash(self, id: int, content_hash: str) -> None:
+        try:
+            async with self.db.session_maker() as session:
+                stmt = (
+                    update(FileMapping)
+                    .where(FileMapping.id == id)
+                    .values(content_hash=content_hash)
+                )
+
+                result = await session.execute(stmt)
+                await session.commit()
+        except Exception as e:
+            raise ErrInternal(
+                "file-mapping-storage: set_content_hash: internal: {}".format(str(e))
+            )
+
+        if result.rowcount == 0:
+            raise ErrNotFound(
+                "file-mapping-storage: set_content_hash: not-found: id = {}".format(id)
+            )
+
+    async def delete(self, id: int) -> None:
+        try:
+            async with self.db.session_maker() as session:
+                stmt = delete(FileMapping).where(FileMapping.id == id)
+
+                result = await session.execute(stmt)
+                await session.commit()
+        except Exception as e:
+            raise ErrInternal("file-mapping-storage: delete: internal: {}".format(str(e)))
+
+        if result.rowcount == 0:
+            raise ErrNotFound(
+                "file-mapping-storage: delete: not-found: id = {}".format(id)
+            )
+
     async def list_ingested(
         self, user_id: int, limit: int = 15, offset: int = 0
     ) -> List[GetIngestedResult]:
@@ -142,6 +213,40 @@ class MappingStorage:
             document_id=mapping.document_id,
         )
 
+    async def get_ingested_many(
+        self, user_id: int, ids: List[int] | None = None
+    ) -> List[GetIngestedResult]:
+        """
+        Ingested files of a user among `ids`, or all of them when ids is
+        None, newest first.
+        """
+        try:
+            async with self.db.session_maker() as session:
+                stmt = (
+                    select(IngestedFileMapping)
+                    .where(IngestedFileMapping.user_id == user_id)
+                    .order_by(IngestedFileMapping.id.desc())
+                )
+                if ids is not None:
+                    stmt = stmt.where(IngestedFileMapping.id.in_(ids))
+
+                result = await session.execute(stmt)
+                records = result.scalars().all()
+        except Exception as e:
+            raise ErrInternal(
+                "file-mapping-storage: get_ingested_many: internal: {}".format(str(e))
+            )
+
+        return [
+            GetIngestedResult(
+                id=record.id,
+                user_id=record.user_id,
+                mapping_id=record.file_mapping_id,
+                document_id=record.document_id,
+            )
+            for record in records
+        ]
+
     async def create_ingested(self, body: CreateIngestedBody) -> CreateIngestedResult:
         try:
             new_mapping = IngestedFileMapping(
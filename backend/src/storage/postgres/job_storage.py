@@ -0,0 +1,228 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import insert, select, update, or_, and_
+
+from src.gears.db import DB
+from ..job_storage_models import (
+    GetResult,
+    CreateBody,
+    CreateResult,
+    ProgressBody,
+    RenewBody,
+    FailBody,
+)
+from ..job_storage import (
+    ErrInternal,
+    ErrLeaseLost,
+    ErrNotFound,
+    STATUS_QUEUED,
+    STATUS_RUNNING,
+    STATUS_DONE,
+    STATUS_FAILED,
+)
+from .models.job import Job
+
+
+class JobStorage:
+    def __init__(self, db: DB):
+        self.db = db
+
+    async def create(self, body: CreateBody) -> CreateResult:
+        try:
+            new_job = Job(
+                user_id=body.user_id,
+                kind=body.kind,
+                payload=body.payload,
+                status=STATUS_QUEUED,
+                attempts=0,
+                max_attempts=body.max_attempts,
+                progress_done=0,
+                progress_total=0,
+                run_after=datetime.utcnow(),
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow(),
+            )
+
+            async with self.db.session_maker() as session:
+                session.add(new_job)
+                await session.commit()
+                await session.refresh(new_job)
+
+                return CreateResult(id=new_job.id)
+        except Exception as e:
+            raise ErrInternal(f"job-storage: create: internal: {str(e)}")
+
+    async def create_many(self, bodies: List[CreateBody]) -> List[CreateResult]:
+        """Creates all jobs in one transaction; results are in the order of `bodies`."""
+        if not bodies:
+            return []
+
+        now = datetime.utcnow()
+        try:
+            async with self.db.session_maker() as session:
+                result = await session.execute(
+                    insert(Job).returning(Job.id, sort_by_parameter_order=True),
+                    [
+                        {
+                            "user_id": body.user_id,
+                            "kind": body.kind,
+                            "payload": body.payload,
+                            "status": STATUS_QUEUED,
+                            "attempts": 0,
+                            "max_attempts": body.max_attempts,
+                            "progress_done": 0,
+                            "progress_total": 0,
+                            "run_after": now,
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for body in bodies
+                    ],
+                )
+                ids = result.scalars().all()
+                await session.commit()
+        except Exception as e:
+            raise ErrInternal(f"job-storage: create_many: internal: {str(e)}")
+
+        return [CreateResult(id=id) for id in ids]
+
+    async def get(self, id: int) -> GetResult:
+        try:
+            async with self.db.session_maker() as session:
+                stmt = select(Job).where(Job.id == id)
+                result = await session.execute(stmt)
+                job = result.scalar_one_or_none()
+        except Exception as e:
+            raise ErrInternal(f"job-storage: get: internal: {str(e)}")
+
+        if job is None:
+            raise ErrNotFound(f"job-storage: get: not-found: id = {id}")
+
+        return self.__to_result(job)
+
+    async def claim(self, locked_until: datetime) -> Optional[GetResult]:
+        """
+        Locks the next runnable job for the calling worker. Running jobs whose
+        lock expired (their worker died) are picked up again.
+        """
+        now = datetime.utcnow()
+        try:
+            async with self.db.session_maker() as session:
+                stmt = (
+                    select(Job)
+                    .where(
+                        or_(
+                            and_(Job.status == STATUS_QUEUED, Job.run_after <= now),
+                            and_(Job.status == STATUS_RUNNING, Job.locked_until < now),
+                        )
+                    )
+                    .order_by(Job.run_after, Job.id)
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                )
+                result = await session.execute(stmt)
+                job = result.scalar_one_or_none()
+                if job is None:
+                    return None
+
+                job.status = STATUS_RUNNING
+                job.attempts += 1
+                job.locked_until = locked_until
+                job.updated_at = now
+                await session.commit()
+
+                return self.__to_result(job)
+        except Exception as e:
+            raise ErrInternal(f"job-storage: claim: internal: {str(e)}")
+
+    async def update_progress(self, body: ProgressBody) -> None:
+        await self.__update(
+            "update_progress",
+            body.id,
+            body.attempt,
+            progress_done=body.done,
+            progress_total=body.total,
+            locked_until=body.locked_until,
+        )
+
+    async def renew(self, body: RenewBody) -> None:
+        await self.__update(
+            "renew", body.id, body.attempt, locked_until=body.locked_until
+        )
+
+    async def complete(self, id: int, attempt: int, result: dict) -> None:
+        await self.__update(
+            "complete",
+            id,
+            attempt,
+            status=STATUS_DONE,
+            result=result,
+            error=None,
+            locked_until=None,
+        )
+
+    async def fail(self, body: FailBody) -> None:
+        if body.retry_at is None:
+            await self.__update(
+                "fail",
+                body.id,
+                body.attempt,
+                status=STATUS_FAILED,
+                error=body.error,
+                locked_until=None,
+            )
+            return
+
+        await self.__update(
+            "fail",
+            body.id,
+            body.attempt,
+            status=STATUS_QUEUED,
+            error=body.error,
+            run_after=body.retry_at,
+            locked_until=None,
+        )
+
+    async def __update(self, op: str, id: int, attempt: int, **values) -> None:
+        """
+        Updates a running job only while `attempt` still holds its claim, so
+        a worker whose lease expired cannot overwrite the job after another
+        worker claimed it again.
+        """
+        try:
+            async with self.db.session_maker() as session:
+                stmt = (
+                    update(Job)
+                    .where(
+                        Job.id == id,
+                        Job.attempts == attempt,
+                        Job.status == STATUS_RUNNING,
+                    )
+                    .values(updated_at=datetime.utcnow(), **values)
+                )
+                result = await session.execute(stmt)
+                await session.commit()
+        except Exception as e:
+            raise ErrInternal(f"job-storage: {op}: internal: {str(e)}")
+
+        if result.rowcount == 0:
+            raise ErrLeaseLost(
+                f"job-storage: {op}: lease-lost: id = {id}; attempt = {attempt}"
+            )
+
+    def __to_result(self, job: Job) -> GetResult:
+        return GetResult(
+            id=job.id,
+            user_id=job.user_id,
+            kind=job.kind,
+            payload=job.payload,
+            status=job.status,
+            attempts=job.attempts,
+            max_attempts=job.max_attempts,
+            progress_done=job.progress_done,
+            progress_total=job.progress_total,
+            result=job.result,
+            error=job.error,
+            created_at=job.created_at,
+            updated_at=job.updated_at,
+        )
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, tuple_
 from uuid import uuid4
 
 from src.gears.db import DB
@@ -8,9 +8,13 @@ from ..message_storage_models import (
     CreateBody,
     CreateResult,
     UpdateBody,
+    CreateTurnBody,
+    CreateTurnResult,
+    ListBody,
 )
 from ..message_storage import ErrInternal, ErrNotFound
 from .models.message import Message
+from .models.chat import Chat
 
 
 class MessageStorage:
@@ -37,6 +41,74 @@ class MessageStorage:
         except Exception as e:
             raise ErrInternal(f"message-storage: create: internal: {str(e)}")
 
+    async def create_turn(self, body: CreateTurnBody) -> CreateTurnResult:
+        """
+        Saves a prompt and its response, creating the chat first if needed,
+        in a single transaction. Ids are assigned by the database and
+        returned by the inserts themselves.
+        """
+        now = datetime.utcnow()
+        try:
+            async with self.db.session_maker() as session:
+                async with session.begin():
+                    if body.chat_id is None:
+                        result = await session.execute(
+                            insert(Chat)
+                            .values(
+                                file_id=body.file_id,
+                                title=body.title,
+                                created_at=now,
+                                updated_at=now,
+                            )
+                            .returning(Chat.id)
+                        )
+                        chat_id = result.scalar_one()
+                    else:
+                        chat_id = int(body.chat_id)
+                        result = await session.execute(
+                            update(Chat)
+                            .where(Chat.id == chat_id)
+                            .values(updated_at=now)
+                        )
+                        if result.rowcount == 0:
+                            raise ErrNotFound(
+                                f"message-storage: create_turn: not-found: chat_id = {chat_id}"
+                            )
+
+                    result = await session.execute(
+                        insert(Message)
+                        .values(
+                            [
+                                dict(
+                                    chat_id=chat_id,
+                                    content=body.prompt,
+                                    role="user",
+                                    created_at=now,
+                                    updated_at=now,
+                                ),
+                                dict(
+                                    chat_id=chat_id,
+                                    content=body.response,
+                                    role="assistant",
+                                    created_at=now,
+                                    updated_at=now,
+                                ),
+                            ]
+                        )
+                        .returning(Message.id, Message.role)
+                    )
+                    ids = {role: id for id, role in result.all()}
+
+            return CreateTurnResult(
+                chat_id=chat_id,
+                user_message_id=ids["user"],
+                assistant_message_id=ids["assistant"],
+            )
+        except ErrNotFound:
+            raise
+        except Exception as e:
+            raise ErrInternal(f"message-storage: create_turn: internal: {str(e)}")
+
     async def get(self, id: str) -> GetResult:
         try:
             async with self.db.session_maker() as session:
@@ -81,6 +153,37 @@ class MessageStorage:
         except Exception as e:
             raise ErrInternal(f"message-storage: get_by_chat: internal: {str(e)}")
 
+    async def list_by_chat(self, body: ListBody) -> list[GetResult]:
+        """Newest messages first, served by the (chat_id, created_at, id) index."""
+        try:
+            async with self.db.session_maker() as session:
+                stmt = select(Message).where(Message.chat_id == body.chat_id)
+                if body.before_created_at is not None:
+                    stmt = stmt.where(
+                        tuple_(Message.created_at, Message.id)
+                        < (body.before_created_at, body.before_id)
+                    )
+                stmt = stmt.order_by(
+                    Message.created_at.desc(), Message.id.desc()
+                ).limit(body.limit)
+
+                result = await session.execute(stmt)
+                messages = result.scalars().all()
+
+                return [
+                    GetResult(
+                        id=message.id,
+                        chat_id=message.chat_id,
+                        content=message.content,
+                        role=message.role,
+                        created_at=message.created_at,
+                        updated_at=message.updated_at,
+                    )
+                    for message in messages
+                ]
+        except Exception as e:
+            raise ErrInternal(f"message-storage: list_by_chat: internal: {str(e)}")
+
     async def update(self, body: UpdateBody) -> GetResult:
         try:
             async with self.db.session_maker() as session:
@@ -6,6 +6,9 @@ from .user_acct import UserAcct
 from .summary import Summary
 from .chat import Chat
 from .message import Message
+from .summary_cache import SummaryCacheEntry
+from .job import Job
+from .doi_resolution import DOIResolution
 
 __all__ = [
     "Base",
@@ -16,4 +19,7 @@ __all__ = [
     "Summary",
     "Chat",
     "Message",
+    "SummaryCacheEntry",
+    "Job",
+    "DOIResolution",
 ]
@@ -1,3 +1,4 @@
+from datetime import datetime
 from sqlalchemy import String, Integer, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,7 +11,10 @@ class AuthToken(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("user_accounts.id"))
-    token: Mapped[str] = mapped_column(String(), nullable=False, index=True)
+    token: Mapped[str] = mapped_column(
+        String(), nullable=False, index=True, unique=True
+    )
+    expires_at: Mapped[datetime] = mapped_column(nullable=False, index=True)
 
     # Relationships
     user: Mapped["UserAcct"] = relationship(back_populates="auth_tokens")
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import List
-from sqlalchemy import Integer, String, ForeignKey
+from sqlalchemy import Integer, String, Text, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -13,6 +13,9 @@ class Chat(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     file_id: Mapped[int] = mapped_column(Integer, ForeignKey("ingested_file_mappings.id"), nullable=False)
     title: Mapped[str] = mapped_column(String, nullable=False)
+    # Rolling summary of the messages up to and including summary_until_id.
+    summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+    summary_until_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         default=datetime.utcnow,
@@ -20,6 +23,10 @@ class Chat(Base):
         nullable=False
     )
 
+    __table_args__ = (
+        Index("ix_chats_file_id_created_at_id", "file_id", "created_at", "id"),
+    )
+
     # Relationships
     file: Mapped["IngestedFileMapping"] = relationship(back_populates="chats")
     messages: Mapped[List["Message"]] = relationship(back_populates="chat", cascade="all, delete-orphan") 
\ No newline at end of file
@@ -0,0 +1,22 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class DOIResolution(Base):
+    __tablename__ = "doi_resolutions"
+
+    doi: Mapped[str] = mapped_column(String, primary_key=True)
+    status: Mapped[str] = mapped_column(String, nullable=False)  # 'found' or 'not_found'
+    pdf_url: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Not foreign keys: the stored copy may be deleted, readers fall back
+    # to downloading it again.
+    user_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    file_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    filename: Mapped[str | None] = mapped_column(String, nullable=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    size: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    resolved_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(nullable=False)
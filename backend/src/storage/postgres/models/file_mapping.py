@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import String, Integer, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship, backref
 
 from .base import Base
@@ -16,6 +16,15 @@ class FileMapping(Base):
         nullable=False,
         default="binary/octet-stream",
     )
+    content_hash: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+        index=True,
+    )
+    # Set for files imported by DOI, to find earlier imports of the same paper.
+    doi: Mapped[str | None] = mapped_column(String(), nullable=True)
+
+    __table_args__ = (Index("ix_file_mappings_user_id_doi", "user_id", "doi"),)
 
     # Relationships
     user: Mapped["UserAcct"] = relationship(back_populates="file_mappings")
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Integer, String, Text, ForeignKey
+from sqlalchemy import Integer, String, Text, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -19,5 +19,9 @@ class Message(Base):
         nullable=False
     )
 
+    __table_args__ = (
+        Index("ix_messages_chat_id_created_at_id", "chat_id", "created_at", "id"),
+    )
+
     # Relationships
     chat: Mapped["Chat"] = relationship(back_populates="messages") 
\ No newline at end of file
@@ -0,0 +1,62 @@
+from datetime import datetime
+from typing import List
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.gears.db import DB
+from ..summary_cache_storage_models import (
+    GetResult,
+    CreateBody,
+)
+from ..summary_cache_storage import ErrInternal, ErrNotFound
+from .models.summary_cache import SummaryCacheEntry
+
+
+class SummaryCacheStorage:
+    def __init__(self, db: DB):
+        self.db = db
+
+    async def get(self, key: str) -> GetResult:
+        try:
+            async with self.db.session_maker() as session:
+                stmt = select(SummaryCacheEntry).where(SummaryCacheEntry.key == key)
+                result = await session.execute(stmt)
+                entry = result.scalar_one_or_none()
+        except Exception as e:
+            raise ErrInternal(f"summary-cache-storage: get: internal: {str(e)}")
+
+        if entry is None:
+            raise ErrNotFound(f"summary-cache-storage: get: not-found: key = {key}")
+
+        return GetResult(
+            key=entry.key,
+            kind=entry.kind,
+            content=entry.content,
+            created_at=entry.created_at,
+        )
+
+    async def create_many(self, bodies: List[CreateBody]) -> None:
+        if not bodies:
+            return
+
+        try:
+            async with self.db.session_maker() as session:
+                stmt = (
+                    insert(SummaryCacheEntry)
+                    .values(
+                        [
+                            {
+                                "key": body.key,
+                                "kind": body.kind,
+                                "content": body.content,
+                                "created_at": datetime.utcnow(),
+                            }
+                            for body in bodies
+                        ]
+                    )
+                    .on_conflict_do_nothing(index_elements=[SummaryCacheEntry.key])
+                )
+                await session.execute(stmt)
+                await session.commit()
+        except Exception as e:
+            raise ErrInternal(f"summary-cache-storage: create_many: internal: {str(e)}")
@@ -0,0 +1,19 @@
+from typing import Protocol, List
+
+from .summary_cache_storage_models import (
+    GetResult,
+    CreateBody,
+)
+
+
+class SummaryCacheStorage(Protocol):
+    async def get(self, key: str) -> GetResult: ...
+    async def create_many(self, bodies: List[CreateBody]) -> None: ...
+
+
+class ErrNotFound(Exception):
+    pass
+
+
+class ErrInternal(Exception):
+    pass
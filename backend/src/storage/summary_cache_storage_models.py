@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class GetResult:
+    key: str
+    kind: str
+    content: str
+    created_at: datetime
+
+
+@dataclass
+class CreateBody:
+    key: str
+    kind: str
+    content: str
@@ -0,0 +1,167 @@
+from datetime import timedelta
+
+import pytest
+
+from src.services.answer_cache import (
+    AnswerCache,
+    CachedAnswer,
+    features,
+    normalize_prompt,
+    similarity,
+)
+
+
+def answer(text: str, seconds: float = 1.0) -> CachedAnswer:
+    return CachedAnswer(response=text, source="source", generation_seconds=seconds)
+
+
+def new_cache(max_answers: int = 8, threshold: float = 1.0) -> AnswerCache:
+    return AnswerCache(
+        max_bytes=1024 * 1024,
+        ttl=timedelta(minutes=10),
+        max_answers=max_answers,
+        similarity_threshold=threshold,
+    )
+
+
+@pytest.mark.parametrize(
+    "prompt, expected",
+    [
+        ("What is this paper about?", "what is this paper about"),
+        ("  What   is THIS paper, about?! ", "what is this paper about"),
+        ("", ""),
+    ],
+)
+def test_normalize_prompt(prompt, expected):
+    assert normalize_prompt(prompt) == expected
+
+
+def test_similarity():
+    a = features("what is the main result")
+
+    assert similarity(a, a) == pytest.approx(1.0)
+    assert similarity(a, features("unrelated words")) == 0.0
+    assert 0 < similarity(a, features("what is the result")) < 1
+
+
+def test_similarity_is_order_aware():
+    a = features("is method a better than method b")
+    b = features("is method b better than method a")
+
+    assert similarity(a, b) < 0.8
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        "what is not the main contribution",
+        "what is the main contribution without the appendix",
+        "why isn t the main contribution new",
+    ],
+)
+def test_negation_changes_the_question(other):
+    assert similarity(features("what is the main contribution"), features(other)) == 0.0
+
+
+def test_hit_after_normalization():
+    cache = new_cache()
+    cache.put(1, "doc", "What is this paper about?", answer("about cats", seconds=2))
+
+    found = cache.get(1, "doc", "what is this paper about")
+
+    assert found is not None and found.response == "about cats"
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.saved_seconds) == (1, 0, 2)
+
+
+def test_miss_on_other_document_or_file():
+    cache = new_cache()
+    cache.put(1, "doc", "question", answer("a"))
+
+    assert cache.get(1, "reingested-doc", "question") is None
+    assert cache.get(2, "doc", "question") is None
+    assert cache.stats().hit_rate == 0.0
+
+
+def test_new_document_replaces_old_answers():
+    cache = new_cache()
+    cache.put(1, "old", "question", answer("old"))
+    cache.put(1, "new", "other question", answer("new"))
+
+    assert cache.get(1, "new", "question") is None
+    assert cache.get(1, "new", "other question").response == "new"
+
+
+def test_similar_questions_share_answers_below_threshold():
+    cache = new_cache(threshold=0.8)
+    cache.put(1, "doc", "what is the main result of the paper", answer("r"))
+
+    assert cache.get(1, "doc", "so what is the main result of the paper").response == "r"
+    assert cache.get(1, "doc", "who wrote it") is None
+    assert cache.stats().similar_hits == 1
+
+
+@pytest.mark.parametrize(
+    "prompt",
+    [
+        "Is method B better than method A?",
+        "What is not the main contribution?",
+    ],
+)
+@pytest.mark.parametrize("threshold", [0.8, 0.9, 1.0])
+def test_swapped_or_negated_questions_miss(prompt, threshold):
+    cache = new_cache(threshold=threshold)
+    cache.put(1, "doc", "Is method A better than method B?", answer("A"))
+    cache.put(1, "doc", "What is the main contribution?", answer("C"))
+
+    assert cache.get(1, "doc", prompt) is None
+
+
+def test_exact_threshold_disables_similarity():
+    cache = new_cache(threshold=1.0)
+    cache.put(1, "doc", "what is the main result of the paper", answer("r"))
+
+    assert cache.get(1, "doc", "so what is the main result of the paper") is None
+
+
+def test_oldest_answer_is_evicted_per_document():
+    cache = new_cache(max_answers=2)
+    cache.put(1, "doc", "first", answer("1"))
+    cache.put(1, "doc", "second", answer("2"))
+    cache.put(1, "doc", "third", answer("3"))
+
+    assert cache.get(1, "doc", "first") is None
+    assert cache.get(1, "doc", "second").response == "2"
+    assert cache.get(1, "doc", "third").response == "3"
+
+
+def test_answers_asked_again_are_evicted_last():
+    cache = new_cache(max_answers=2)
+    cache.put(1, "doc", "first", answer("1"))
+    cache.put(1, "doc", "second", answer("2"))
+    cache.get(1, "doc", "first")
+    cache.put(1, "doc", "third", answer("3"))
+
+    assert cache.get(1, "doc", "second") is None
+    assert cache.get(1, "doc", "first").response == "1"
+    assert cache.get(1, "doc", "third").response == "3"
+
+
+def test_similar_hits_also_refresh_answers():
+    cache = new_cache(max_answers=2, threshold=0.8)
+    cache.put(1, "doc", "what is the main result of the paper", answer("r"))
+    cache.put(1, "doc", "second", answer("2"))
+    cache.get(1, "doc", "so what is the main result of the paper")
+    cache.put(1, "doc", "third", answer("3"))
+
+    assert cache.get(1, "doc", "second") is None
+    assert cache.get(1, "doc", "what is the main result of the paper").response == "r"
+
+
+def test_invalidate():
+    cache = new_cache()
+    cache.put(1, "doc", "question", answer("a"))
+    cache.invalidate(1)
+
+    assert cache.get(1, "doc", "question") is None
+    assert cache.stats().entries == 0
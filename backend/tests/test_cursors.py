@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.gears import cursors
+
+
+@pytest.mark.parametrize(
+    "created_at, id",
+    [
+        (datetime(2024, 1, 2, 3, 4, 5), 1),
+        (datetime(2024, 1, 2, 3, 4, 5, 123456), 2**40),
+        (datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc), 7),
+    ],
+)
+def test_round_trip(created_at, id):
+    cursor = cursors.encode(created_at, id)
+
+    assert "=" not in cursor
+    assert cursors.decode(cursor) == (created_at, id)
+
+
+@pytest.mark.parametrize(
+    "cursor", ["", "!!!", "bm90IGEgY3Vyc29y", cursors.encode(datetime(2024, 1, 1), 1)[:-3]]
+)
+def test_decode_rejects_invalid(cursor):
+    with pytest.raises(cursors.ErrInvalidCursor):
+        cursors.decode(cursor)
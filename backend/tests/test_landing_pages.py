@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("bs4")
+
+from src.gears import landing_pages
+
+
+SAMPLES = Path(__file__).parent.parent / "scripts" / "samples" / "landing_pages"
+PDF = "//zero.sci-hub.ru/1503/2c38b2b4b7e1d36b5dbfa2b0b1b2d0f6/liu2019.pdf"
+
+
+@pytest.mark.parametrize(
+    "sample, expected",
+    [
+        ("embed.html", PDF + "#navpanes=0&view=FitH"),
+        ("iframe.html", PDF + "#view=FitH"),
+        ("button.html", PDF + "?download=true"),
+        ("captcha.html", None),
+        ("not_found.html", None),
+    ],
+)
+def test_targeted_on_samples(sample, expected):
+    html = (SAMPLES / sample).read_text(encoding="utf-8")
+
+    assert landing_pages.targeted(html) == expected
+
+
+def test_targeted_agrees_with_soup_on_embed():
+    html = (SAMPLES / "embed.html").read_text(encoding="utf-8")
+
+    assert landing_pages.targeted(html) == landing_pages.soup(html)
+
+
+@pytest.mark.parametrize(
+    "html, expected",
+    [
+        ('<embed src="/a.pdf">', "/a.pdf"),
+        ("<embed src='/a.pdf'/>", "/a.pdf"),
+        ('<EMBED SRC="/a.pdf">', "/a.pdf"),
+        ('<embed type="application/pdf"><embed src="/b.pdf">', "/b.pdf"),
+        ('<iframe src="/i.pdf"></iframe><embed src="/e.pdf">', "/e.pdf"),
+        ('<a href="/paper.PDF">download</a>', "/paper.PDF"),
+        ('<a href="/about">about</a>', None),
+        ('<a href="/get?download=1">download</a>', "/get?download=1"),
+        ('<a href="/pdfs/index.html">papers</a>', None),
+        ('<a href="/view?file=a.pdf">view</a>', None),
+        ("<button onclick=\"location.href='/a.pdf#page=1'\">", "/a.pdf#page=1"),
+        ("<button onclick=\"location.href='/captcha?next=/a'\">", None),
+        (
+            "<div onclick=\"location.href='/captcha'\"></div>"
+            "<button onclick=\"location.href='/a.pdf?download=true'\">",
+            "/a.pdf?download=true",
+        ),
+        ("<p>no link", None),
+        ("", None),
+    ],
+)
+def test_targeted(html, expected):
+    assert landing_pages.targeted(html) == expected
+
+
+def test_extract_pdf_url_tries_extractors_in_order():
+    calls = []
+
+    def first(html):
+        calls.append("first")
+        return None
+
+    def second(html):
+        calls.append("second")
+        return "/found.pdf"
+
+    assert landing_pages.extract_pdf_url("", [first, second]) == "/found.pdf"
+    assert calls == ["first", "second"]
+    assert landing_pages.extract_pdf_url("", []) is None
@@ -0,0 +1,122 @@
+from datetime import timedelta
+
+import pytest
+
+from src.gears import lru
+from src.gears.lru import LRUCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(lru.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_get_and_put():
+    cache = LRUCache(max_bytes=100, ttl=timedelta(minutes=1))
+    cache.put("a", 1, size=10)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+    stats = cache.stats()
+    assert (stats.entries, stats.bytes, stats.hits, stats.misses) == (1, 10, 1, 1)
+
+
+def test_evicts_least_recently_used_by_size():
+    cache = LRUCache(max_bytes=30, ttl=timedelta(minutes=1))
+    cache.put("a", 1, size=10)
+    cache.put("b", 2, size=10)
+    cache.put("c", 3, size=10)
+    cache.get("a")
+    cache.put("d", 4, size=10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.get("d") == 4
+    assert cache.stats().evictions == 1
+    assert cache.stats().bytes == 30
+
+
+def test_large_value_evicts_several():
+    cache = LRUCache(max_bytes=30, ttl=timedelta(minutes=1))
+    cache.put("a", 1, size=10)
+    cache.put("b", 2, size=10)
+    cache.put("c", 3, size=25)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.stats().bytes == 25
+
+
+def test_value_larger_than_cache_is_not_stored():
+    cache = LRUCache(max_bytes=30, ttl=timedelta(minutes=1))
+    cache.put("a", 1, size=10)
+    cache.put("big", 2, size=31)
+
+    assert cache.get("big") is None
+    assert cache.get("a") == 1
+
+
+def test_replacing_a_key_keeps_byte_count():
+    cache = LRUCache(max_bytes=100, ttl=timedelta(minutes=1))
+    cache.put("a", 1, size=10)
+    cache.put("a", 2, size=40)
+
+    assert cache.get("a") == 2
+    assert cache.stats().bytes == 40
+    assert cache.stats().entries == 1
+
+
+def test_replacing_with_too_large_value_drops_the_old_one():
+    cache = LRUCache(max_bytes=30, ttl=timedelta(minutes=1))
+    cache.put("a", 1, size=10)
+    cache.put("a", 2, size=31)
+
+    assert cache.get("a") is None
+    assert cache.stats().bytes == 0
+
+
+def test_invalidate():
+    cache = LRUCache(max_bytes=100, ttl=timedelta(minutes=1))
+    cache.put("a", 1, size=10)
+    cache.invalidate("a")
+    cache.invalidate("missing")
+
+    assert cache.get("a") is None
+    assert cache.stats().bytes == 0
+
+
+def test_entries_expire(clock):
+    cache = LRUCache(max_bytes=100, ttl=timedelta(seconds=10))
+    cache.put("a", 1, size=10)
+
+    clock[0] += 9.9
+    assert cache.get("a") == 1
+    clock[0] += 0.1
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert (stats.expirations, stats.bytes, stats.entries) == (1, 0, 0)
+
+
+def test_put_ttl_is_capped_by_cache_ttl(clock):
+    cache = LRUCache(max_bytes=100, ttl=timedelta(seconds=10))
+    cache.put("short", 1, size=1, ttl=timedelta(seconds=2))
+    cache.put("long", 2, size=1, ttl=timedelta(hours=1))
+
+    clock[0] += 2
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    clock[0] += 8
+    assert cache.get("long") is None
+
+
+def test_non_positive_ttl_is_not_stored():
+    cache = LRUCache(max_bytes=100, ttl=timedelta(seconds=10))
+    cache.put("a", 1, size=1, ttl=timedelta(0))
+    cache.put("b", 1, size=1, ttl=timedelta(seconds=-1))
+
+    assert cache.stats().entries == 0
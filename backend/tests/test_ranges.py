@@ -0,0 +1,103 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.gears import ranges
+
+
+LAST_MODIFIED = datetime(2024, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc)
+LAST_MODIFIED_HTTP = "Tue, 02 Jan 2024 03:04:05 GMT"
+ETAG = '"abc"'
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-5000", (0, 999)),
+        ("bytes=990-5000", (990, 999)),
+        (" bytes=0-0 ", (0, 0)),
+    ],
+)
+def test_parse_range(header, expected):
+    assert ranges.parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize(
+    "header", ["bytes=-", "items=0-1", "bytes=0-1,5-6", "bytes=a-b", "0-1"]
+)
+def test_parse_range_ignores_unsupported(header):
+    assert ranges.parse_range(header, 1000) is None
+
+
+@pytest.mark.parametrize(
+    "header, size",
+    [
+        ("bytes=1000-", 1000),
+        ("bytes=5-4", 1000),
+        ("bytes=-0", 1000),
+        ("bytes=-1", 0),
+        ("bytes=0-", 0),
+    ],
+)
+def test_parse_range_unsatisfiable(header, size):
+    with pytest.raises(ranges.ErrUnsatisfiable):
+        ranges.parse_range(header, size)
+
+
+def test_not_modified_without_conditions():
+    assert not ranges.not_modified(ETAG, LAST_MODIFIED, None, None)
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"x", "abc"', True),
+        ("*", True),
+        ('"x"', False),
+    ],
+)
+def test_not_modified_if_none_match(if_none_match, expected):
+    assert ranges.not_modified(ETAG, LAST_MODIFIED, if_none_match, None) is expected
+
+
+def test_not_modified_if_none_match_takes_precedence():
+    assert not ranges.not_modified(ETAG, LAST_MODIFIED, '"x"', LAST_MODIFIED_HTTP)
+
+
+@pytest.mark.parametrize(
+    "if_modified_since, expected",
+    [
+        (LAST_MODIFIED_HTTP, True),
+        ("Tue, 02 Jan 2024 03:04:05 -0000", True),
+        ("Wed, 03 Jan 2024 00:00:00 GMT", True),
+        ("Tue, 02 Jan 2024 03:04:04 GMT", False),
+        ("yesterday", False),
+    ],
+)
+def test_not_modified_if_modified_since(if_modified_since, expected):
+    assert (
+        ranges.not_modified(ETAG, LAST_MODIFIED, None, if_modified_since) is expected
+    )
+
+
+@pytest.mark.parametrize(
+    "if_range, expected",
+    [
+        (None, True),
+        ('"abc"', True),
+        ('"other"', False),
+        ('W/"abc"', False),
+        (LAST_MODIFIED_HTTP, True),
+        ("Tue, 02 Jan 2024 03:04:05 -0000", True),
+        ("Tue, 02 Jan 2024 03:04:04 GMT", False),
+        ("Wed, 03 Jan 2024 00:00:00 GMT", False),
+        ("garbage", False),
+    ],
+)
+def test_if_range_matches(if_range, expected):
+    assert ranges.if_range_matches(if_range, ETAG, LAST_MODIFIED) is expected
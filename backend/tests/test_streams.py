@@ -0,0 +1,79 @@
+import asyncio
+import hashlib
+
+import pytest
+
+from src.gears import streams
+
+
+def source(*parts: bytes):
+    """A `read` callable returning `parts` one per call, whatever the size asked."""
+    queue = list(parts)
+
+    async def read(size: int = -1) -> bytes:
+        return queue.pop(0) if queue else b""
+
+    return read
+
+
+async def read_all(reader, size: int = -1) -> bytes:
+    data = b""
+    while True:
+        part = await reader.read(size)
+        if not part:
+            return data
+        data += part
+
+
+def test_hashing_reader_counts_and_hashes():
+    reader = streams.HashingReader(source(b"hello ", b"world"))
+
+    assert asyncio.run(read_all(reader)) == b"hello world"
+    assert reader.size == 11
+    assert reader.hexdigest() == hashlib.sha256(b"hello world").hexdigest()
+
+
+def test_hashing_reader_allows_exactly_max_size():
+    reader = streams.HashingReader(source(b"12345", b"67890"), max_size=10)
+
+    assert asyncio.run(read_all(reader)) == b"1234567890"
+
+
+def test_hashing_reader_rejects_more_than_max_size():
+    reader = streams.HashingReader(source(b"12345", b"678901"), max_size=10)
+
+    with pytest.raises(streams.ErrTooLarge):
+        asyncio.run(read_all(reader))
+
+
+@pytest.mark.parametrize("size", [-1, 1, 3, 64])
+def test_signature_reader_passes_data_through(size):
+    reader = streams.SignatureReader(source(b"%PDF-1.7\n", b"body"), b"%PDF-")
+
+    assert asyncio.run(read_all(reader, size)) == b"%PDF-1.7\nbody"
+
+
+def test_signature_reader_joins_short_first_reads():
+    reader = streams.SignatureReader(source(b"%P", b"D", b"F-1", b".7"), b"%PDF-")
+
+    assert asyncio.run(read_all(reader, 2)) == b"%PDF-1.7"
+
+
+@pytest.mark.parametrize(
+    "parts", [(b"<html>",), (b"%PD", b"X-"), (b"%PD",), ()]
+)
+def test_signature_reader_rejects_other_content(parts):
+    reader = streams.SignatureReader(source(*parts), b"%PDF-")
+
+    with pytest.raises(streams.ErrBadSignature):
+        asyncio.run(reader.read(1024))
+
+
+def test_signature_and_size_limits_compose():
+    reader = streams.HashingReader(
+        streams.SignatureReader(source(b"%PDF-", b"x" * 10), b"%PDF-").read,
+        max_size=10,
+    )
+
+    with pytest.raises(streams.ErrTooLarge):
+        asyncio.run(read_all(reader))
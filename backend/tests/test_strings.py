@@ -0,0 +1,129 @@
+import pytest
+
+from src.gears import strings
+
+
+def words(count: int) -> str:
+    return " ".join("word{}".format(i) for i in range(count))
+
+
+def test_estimate_tokens():
+    assert strings.estimate_tokens("") == 0
+    assert strings.estimate_tokens("abcd") == 1
+    assert strings.estimate_tokens("abcde") == 2
+    assert strings.estimate_tokens("abcdef", chars_per_token=2) == 3
+
+
+def test_short_text_is_one_chunk():
+    chunks = strings.split_text_into_chunks("Hello world.", max_tokens=100)
+
+    assert len(chunks) == 1
+    assert chunks[0].text == "Hello world."
+    assert (chunks[0].start_offset, chunks[0].end_offset) == (0, 12)
+
+
+def test_blank_text_has_no_chunks():
+    assert strings.split_text_into_chunks("  \n\n ", max_tokens=100) == []
+
+
+def test_chunks_respect_budget_and_offsets():
+    text = words(500)
+    chunks = strings.split_text_into_chunks(
+        text, max_tokens=50, overlap_tokens=5, chars_per_token=4
+    )
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert len(chunk.text) <= 200
+        assert text[chunk.start_offset : chunk.end_offset] == chunk.text
+    assert chunks[0].start_offset == 0
+    assert chunks[-1].end_offset == len(text)
+
+
+def test_chunks_overlap_at_word_boundaries():
+    text = words(500)
+    chunks = strings.split_text_into_chunks(
+        text, max_tokens=50, overlap_tokens=5, chars_per_token=4
+    )
+
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert previous.start_offset < chunk.start_offset < previous.end_offset
+        assert previous.end_offset - chunk.start_offset <= 20
+        assert text[chunk.start_offset - 1] == " "
+
+
+def test_chunks_without_overlap_are_contiguous():
+    text = words(500)
+    chunks = strings.split_text_into_chunks(
+        text, max_tokens=50, overlap_tokens=0, chars_per_token=4
+    )
+
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.start_offset == previous.end_offset
+    assert "".join(chunk.text for chunk in chunks) == text
+
+
+def test_prefers_paragraph_breaks():
+    first = "A" * 120 + "."
+    text = first + "\n\n" + words(50)
+    chunks = strings.split_text_into_chunks(
+        text, max_tokens=50, overlap_tokens=0, chars_per_token=4
+    )
+
+    assert chunks[0].text == first + "\n\n"
+
+
+def test_prefers_sentence_ends_over_spaces():
+    # The sentence must end in the second half of the 200 character budget.
+    text = words(22) + ". " + words(40)
+    chunks = strings.split_text_into_chunks(
+        text, max_tokens=50, overlap_tokens=0, chars_per_token=4
+    )
+
+    assert chunks[0].text.endswith(". ")
+
+
+def test_unbroken_text_is_cut_at_budget():
+    chunks = strings.split_text_into_chunks(
+        "x" * 450, max_tokens=50, overlap_tokens=0, chars_per_token=4
+    )
+
+    assert [len(chunk.text) for chunk in chunks] == [200, 200, 50]
+
+
+def test_pages_are_tracked():
+    pages = [(1, words(30) + "\n"), (2, words(30) + "\n"), (3, words(30))]
+    chunks = list(
+        strings.split_pages_into_chunks(
+            pages, max_tokens=50, overlap_tokens=0, chars_per_token=4
+        )
+    )
+    page_one_end = len(pages[0][1])
+
+    assert chunks[0].start_page == 1
+    assert chunks[-1].end_page == 3
+    for chunk in chunks:
+        assert chunk.start_page <= chunk.end_page
+        if chunk.end_offset <= page_one_end:
+            assert chunk.end_page == 1
+
+
+def test_feeding_pages_matches_joined_text():
+    pages = [(1, words(40)), (2, " " + words(40)), (3, " " + words(40))]
+    joined = "".join(text for _, text in pages)
+
+    from_pages = list(
+        strings.split_pages_into_chunks(pages, max_tokens=30, overlap_tokens=4)
+    )
+    from_text = strings.split_text_into_chunks(joined, max_tokens=30, overlap_tokens=4)
+
+    assert [chunk.text for chunk in from_pages] == [chunk.text for chunk in from_text]
+
+
+@pytest.mark.parametrize("max_tokens, overlap_tokens", [(10, 0), (10, 3), (10, 100)])
+def test_fingerprint_changes_with_parameters(max_tokens, overlap_tokens):
+    chunker = strings.TextChunker(max_tokens=max_tokens, overlap_tokens=overlap_tokens)
+    other = strings.TextChunker(max_tokens=max_tokens + 1, overlap_tokens=overlap_tokens)
+
+    assert strings.CHUNKER_VERSION in chunker.fingerprint
+    assert chunker.fingerprint != other.fingerprint